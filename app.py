@@ -1,5 +1,6 @@
+import importlib
+
 import streamlit as st
-from halaman import home, pelatihan_pengujian, hasil, informasi, panduan, tentang
 
 # ---------------------- KONFIGURASI DASAR ----------------------
 st.set_page_config(
@@ -12,6 +13,33 @@ st.set_page_config(
 if "page" not in st.session_state:
     st.session_state.page = "🏠 Halaman Utama"
 
+# ---------------------- MODUL HALAMAN (LAZY) ----------------------
+# Modul halaman (dan library berat seperti scikit-learn, geopandas, matplotlib) baru diimpor saat
+# halamannya pertama kali dibuka, supaya halaman utama yang berisi teks tampil secepat mungkin
+PAGE_MODULES = {
+    "🏠 Halaman Utama": "halaman.home",
+    "📊 Pelatihan & Pengujian": "halaman.pelatihan_pengujian",
+    "📊 Hasil": "halaman.hasil",
+    "ℹ️ Informasi": "halaman.informasi",
+    "📘 Panduan": "halaman.panduan",
+    "👨‍💻 Tentang Pengembang": "halaman.tentang",
+}
+
+
+def load_page(name):
+    # importlib menyimpan modul di sys.modules, jadi impor hanya mahal pada kunjungan pertama
+    return importlib.import_module(PAGE_MODULES[name])
+
+
+def preload_model():
+    # Bundle default (models/default atau JAKAIR_DEFAULT_MODEL) langsung siap untuk prediksi;
+    # dimuat saat halaman pengujian dibuka, bukan saat aplikasi start
+    if "trained_t2" not in st.session_state:
+        pelatihan_pengujian = load_page("📊 Pelatihan & Pengujian")
+        default_bundle = pelatihan_pengujian.preload_default_bundle()
+        if default_bundle is not None:
+            pelatihan_pengujian.use_model_bundle(default_bundle)
+
 def set_page(name):
     st.session_state.page = name
     st.rerun()
@@ -88,15 +116,7 @@ for key, label in pages.items():
             set_page(key)
 
 # ---------------------- PEMANGGIL HALAMAN ----------------------
-if st.session_state.page == "🏠 Halaman Utama":
-    home.show()
-elif st.session_state.page == "📊 Pelatihan & Pengujian":
-    pelatihan_pengujian.show()
-elif st.session_state.page == "📊 Hasil":
-    hasil.show()
-elif st.session_state.page == "ℹ️ Informasi":
-    informasi.show()
-elif st.session_state.page == "📘 Panduan":
-    panduan.show()
-elif st.session_state.page == "👨‍💻 Tentang Pengembang":
-    tentang.show()
\ No newline at end of file
+if st.session_state.page in ("📊 Pelatihan & Pengujian", "📊 Hasil"):
+    preload_model()
+if st.session_state.page in PAGE_MODULES:
+    load_page(st.session_state.page).show()
\ No newline at end of file
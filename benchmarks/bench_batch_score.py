@@ -0,0 +1,75 @@
+# Benchmark batch scoring file besar: jalur prediksi massal halaman (baca seluruh file ke memori
+# lalu prediction.write_scored_csv) vs src_model.batch_score dengan 1..N proses worker.
+# Jalankan dari root repo:  python -m benchmarks.bench_batch_score [--rows 2000000] [--workers 1,2,4]
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_hotelling import make_data
+from src_model import batch_score, model_store, prediction, training
+from src_model.schema import FEATURE_COLS
+
+
+def make_bundle(root, kernel, train_rows):
+    data = pd.DataFrame(make_data(train_rows, seed=1), columns=FEATURE_COLS)
+    bundle = training.fit(data, training.TrainingConfig(C=1.0, gamma=0.1))
+    model = training.ensure_final_model(bundle.models, kernel)
+    path = model_store.save_bundle(
+        model, bundle.scaler, bundle.t2, bundle.feature_cols, {"kernel": kernel}, name=kernel, root=root
+    )
+    return model_store.load_bundle(path)
+
+
+def legacy(bundle, input_path, output_path):
+    X = prediction.to_feature_array(pd.read_csv(input_path), bundle.feature_cols)
+    with open(output_path, "w", newline="") as fh:
+        return prediction.write_scored_csv(X, bundle.model, bundle.scaler, bundle.t2, fh, bundle.feature_cols)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--train-rows", type=int, default=5_000)
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({1, 2, os.cpu_count() or 1})))
+    parser.add_argument("--kernels", default="linear,rbf")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_csv = os.path.join(tmp, "input.csv")
+        input_parquet = os.path.join(tmp, "input.parquet")
+        df = pd.DataFrame(make_data(args.rows), columns=FEATURE_COLS)
+        df.to_csv(input_csv, index=False)
+        df.to_parquet(input_parquet, index=False)
+        del df
+        print(f"{args.rows:,} baris, {os.cpu_count()} core")
+
+        for kernel in args.kernels.split(","):
+            bundle = make_bundle(os.path.join(tmp, "models"), kernel, args.train_rows)
+            n_sv = len(getattr(bundle.model, "support_", []))
+            print(f"  kernel {kernel}" + (f" ({n_sv:,} support vector)" if n_sv else ""))
+
+            reference = os.path.join(tmp, "legacy.csv")
+            start = time.perf_counter()
+            legacy(bundle, input_csv, reference)
+            print(f"    halaman (baca penuh + write_scored_csv): {args.rows / (time.perf_counter() - start):>10,.0f} baris/s")
+
+            for source in (input_csv, input_parquet):
+                for workers in (int(w) for w in args.workers.split(",")):
+                    output = os.path.join(tmp, "out.csv")
+                    summary = batch_score.score_file(bundle, source, output, workers=workers)
+                    same = np.array_equal(
+                        pd.read_csv(output)[prediction.PRED_COL].to_numpy(),
+                        pd.read_csv(reference)[prediction.PRED_COL].to_numpy(),
+                    )
+                    print(
+                        f"    batch_score {os.path.splitext(source)[1][1:]:>7}, {workers} worker: "
+                        f"{summary['rows_per_s']:>10,.0f} baris/s (prediksi sama: {same})"
+                    )
+
+
+if __name__ == "__main__":
+    main()
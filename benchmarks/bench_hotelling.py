@@ -0,0 +1,69 @@
+# Benchmark skoring Hotelling's T²: loop per baris (implementasi lama) vs HotellingT2.
+# Jalankan dari root repo:  python -m benchmarks.bench_hotelling [--rows 10000 1000000 10000000]
+import argparse
+import time
+
+import numpy as np
+
+from src_model.hotelling import HotellingT2
+
+LOOP_MAX_ROWS = 200_000
+
+
+def make_data(n, seed=42):
+    rng = np.random.default_rng(seed)
+    mean = np.array([1.5e-4, 3.2e-2, 1.2e-1, 1.1e-4])
+    scale = np.array([6e-5, 3e-3, 5e-3, 4e-5])
+    corr = np.array([
+        [1.0, 0.3, 0.1, 0.5],
+        [0.3, 1.0, 0.2, 0.6],
+        [0.1, 0.2, 1.0, 0.1],
+        [0.5, 0.6, 0.1, 1.0],
+    ])
+    return rng.multivariate_normal(mean, corr * np.outer(scale, scale), size=n)
+
+
+def legacy_t2(X):
+    cov_inv = np.linalg.inv(np.cov(X, rowvar=False))
+    mean_vec = np.mean(X, axis=0)
+    return np.array([float((x - mean_vec) @ cov_inv @ (x - mean_vec).T) for x in X])
+
+
+def bench(n):
+    X = make_data(n)
+
+    start = time.perf_counter()
+    model = HotellingT2().fit(X)
+    t_fit = time.perf_counter() - start
+
+    start = time.perf_counter()
+    t2 = model.score(X)
+    t_score = time.perf_counter() - start
+
+    row = {"rows": n, "fit_s": t_fit, "score_s": t_score, "rows_per_s": n / t_score}
+
+    # Loop lama hanya dijalankan pada ukuran kecil karena terlalu lambat
+    if n <= LOOP_MAX_ROWS:
+        start = time.perf_counter()
+        t2_legacy = legacy_t2(X)
+        t_legacy = time.perf_counter() - start
+        row["legacy_rows_per_s"] = n / t_legacy
+        row["max_abs_diff"] = float(np.max(np.abs(t2 - t2_legacy)))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'fit (s)':>10} {'score (s)':>10} {'rows/s':>14} {'legacy rows/s':>14} {'max |diff|':>12}")
+    for n in args.rows:
+        r = bench(n)
+        legacy = f"{r['legacy_rows_per_s']:14,.0f}" if "legacy_rows_per_s" in r else f"{'-':>14}"
+        diff = f"{r['max_abs_diff']:12.2e}" if "max_abs_diff" in r else f"{'-':>12}"
+        print(f"{r['rows']:>12,} {r['fit_s']:10.4f} {r['score_s']:10.4f} {r['rows_per_s']:14,.0f} {legacy} {diff}")
+
+
+if __name__ == "__main__":
+    main()
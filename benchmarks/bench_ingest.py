@@ -0,0 +1,107 @@
+# Benchmark parsing upload: pembacaan lama (pd.read_csv / pd.read_excel) vs src_model.ingest
+# per format (CSV, Parquet, Arrow IPC, XLSX), termasuk kolom tambahan yang tidak dipakai.
+# Jalankan dari root repo:  python -m benchmarks.bench_ingest [--rows 1000000] [--xlsx-rows 50000]
+import argparse
+import io
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_hotelling import make_data
+from src_model import ingest
+from src_model.schema import FEATURE_COLS
+
+EXTRA_COLS = 12
+
+
+def make_frame(n):
+    df = pd.DataFrame(make_data(n), columns=FEATURE_COLS)
+    rng = np.random.default_rng(7)
+    for i in range(EXTRA_COLS):
+        df[f"extra_{i}"] = rng.random(n)
+    df["tanggal"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+    df["kategori_multivariat"] = None
+    return df
+
+
+def encode(df, fmt):
+    buf = io.BytesIO()
+    if fmt == "csv":
+        df.to_csv(buf, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(buf, index=False)
+    elif fmt == "arrow":
+        df.to_feather(buf)
+    elif fmt == "xlsx":
+        df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+def legacy_read(data, fmt):
+    buf = io.BytesIO(data)
+    if fmt == "xlsx":
+        return pd.read_excel(buf)
+    if fmt == "parquet":
+        return pd.read_parquet(buf)
+    if fmt == "arrow":
+        return pd.read_feather(buf)
+    return pd.read_csv(buf)
+
+
+def _child(path, fmt, mode, queue):
+    # Diukur di proses baru supaya puncak RSS tidak terpengaruh alokasi pengukuran sebelumnya;
+    # library parser di-import dulu agar tidak ikut terhitung
+    import openpyxl  # noqa: F401
+    import pyarrow.csv  # noqa: F401
+    import pyarrow.parquet  # noqa: F401
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    start = time.perf_counter()
+    with ingest.PeakRSS() as mem:
+        if mode == "legacy":
+            legacy_read(data, fmt)
+        else:
+            ingest.read_upload(io.BytesIO(data), f"data.{fmt}", ingest.TRAINING_COLS)
+    queue.put((time.perf_counter() - start, max(mem.peak_bytes, 0)))
+
+
+def measure(path, fmt, mode):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(path, fmt, mode, queue))
+    proc.start()
+    seconds, peak = queue.get()
+    proc.join()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--xlsx-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'format':>8} {'rows':>10} {'size MB':>8} | {'legacy s':>9} {'peak MB':>8} | {'ingest s':>9} {'peak MB':>8}")
+    for fmt in ["csv", "parquet", "arrow", "xlsx"]:
+        n = args.xlsx_rows if fmt == "xlsx" else args.rows
+        data = encode(make_frame(n), fmt)
+        with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False) as fh:
+            fh.write(data)
+        try:
+            t_old, m_old = measure(fh.name, fmt, "legacy")
+            t_new, m_new = measure(fh.name, fmt, "ingest")
+        finally:
+            os.remove(fh.name)
+        print(
+            f"{fmt:>8} {n:>10,} {len(data) / 1024 ** 2:8.1f} | {t_old:9.3f} {m_old / 1024 ** 2:8.1f} | "
+            f"{t_new:9.3f} {m_new / 1024 ** 2:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
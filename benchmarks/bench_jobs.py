@@ -0,0 +1,79 @@
+# Benchmark job runner training: (1) berapa lama thread script Streamlit terblokir saat training
+# sinkron vs submit job, (2) waktu tunggu sesi yang datang belakangan saat satu sesi mengantrikan
+# beberapa job: antrian round-robin per sesi (jobs.JobRunner) vs satu antrian FIFO global.
+# Jalankan dari root repo:  python -m benchmarks.bench_jobs [--rows 20000] [--job-seconds 0.5]
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.bench_hotelling import make_data
+from src_model import jobs, training, validation
+from src_model.schema import FEATURE_COLS
+
+
+class FifoRunner(jobs.JobRunner):
+    # Pembanding: job dilayani sesuai urutan submit tanpa memperhatikan sesi
+    def _next_job(self):
+        if not self._queues:
+            return None
+        job = min((q[0] for q in self._queues.values()), key=lambda j: j.submitted_at)
+        queue = self._queues[job.session_id]
+        queue.popleft()
+        if not queue:
+            del self._queues[job.session_id]
+        return job
+
+
+def sleeper(job, seconds, steps=10):
+    for i in range(steps):
+        job.report(f"langkah {i + 1}", i / steps)
+        time.sleep(seconds / steps)
+
+
+def wait_all(runner, job_list):
+    while not all(j.finished for j in job_list):
+        time.sleep(0.01)
+
+
+def fairness(runner_cls, job_seconds, workers, heavy_jobs):
+    runner = runner_cls(workers=workers, max_pending=heavy_jobs + 1)
+    # Sesi A mengantrikan beberapa job, sesi B menyusul dengan satu job
+    heavy = [runner.submit("sesi-A", sleeper, job_seconds) for _ in range(heavy_jobs)]
+    time.sleep(0.01)
+    light = runner.submit("sesi-B", sleeper, job_seconds)
+    wait_all(runner, heavy + [light])
+    return light.waited, max(j.finished_at for j in heavy + [light]) - heavy[0].submitted_at
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--job-seconds", type=float, default=0.5)
+    parser.add_argument("--heavy-jobs", type=int, default=3)
+    args = parser.parse_args()
+
+    X = make_data(args.rows)
+    data = validation.ensure_validated(pd.DataFrame(X, columns=FEATURE_COLS))
+    config = training.TrainingConfig(C=1.0, gamma=0.1)
+
+    start = time.perf_counter()
+    training.fit(data, config)
+    sync = time.perf_counter() - start
+
+    runner = jobs.JobRunner(workers=1)
+    start = time.perf_counter()
+    job = runner.submit("sesi", lambda job, d, c: training.fit(d, c, progress=job.report), data, config)
+    submit = time.perf_counter() - start
+    wait_all(runner, [job])
+    print(f"{args.rows:,} baris: thread script terblokir {sync:.2f} s (sinkron) vs {submit * 1000:.2f} ms (submit job)")
+    print(f"  tahap job: {', '.join(f'{stage} @{t:.2f}s' for stage, t in job.log)}")
+
+    for workers in (1, 2):
+        for name, cls in [("FIFO global", FifoRunner), ("round-robin per sesi", jobs.JobRunner)]:
+            waited, total = fairness(cls, args.job_seconds, workers, args.heavy_jobs)
+            print(f"  {workers} worker, {name:>20}: sesi B menunggu {waited:.2f} s, semua selesai {total:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Laporan paritas kernel linear: SVC(kernel='linear') (libsvm) vs LinearSVC (liblinear).
+# Jalankan dari root repo:  python -m benchmarks.bench_linear_parity [--rows ...] [--libsvm-max-rows 50000]
+import argparse
+import time
+
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from benchmarks.bench_hotelling import make_data
+from src_model import svm_backend
+from src_model.hotelling import HotellingT2
+
+
+def labeled_split(n):
+    X = make_data(n)
+    y = HotellingT2().fit(X).predict(X)
+    X_scaled = StandardScaler().fit_transform(X)
+    return train_test_split(X_scaled, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def evaluate(model, X_train, X_test, y_train, y_test):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    t_fit = time.perf_counter() - start
+    y_pred = model.predict(X_test)
+    return t_fit, accuracy_score(y_test, y_pred), f1_score(y_test, y_pred, average="weighted")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 5_000, 20_000, 50_000, 200_000, 1_000_000])
+    parser.add_argument("--libsvm-max-rows", type=int, default=50_000)
+    parser.add_argument("--C", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'libsvm fit':>10} {'acc':>7} {'f1':>7} | {'liblinear fit':>13} {'acc':>7} {'f1':>7} | {'Δacc':>7} {'Δf1':>7}")
+    for n in args.rows:
+        split = labeled_split(n)
+        lin = evaluate(svm_backend.make_linear_model(args.C, n, max_rows=0), *split)
+        if n <= args.libsvm_max_rows:
+            svc = evaluate(svm_backend.make_linear_model(args.C, n, max_rows=n), *split)
+            svc_cols = f"{svc[0]:10.3f} {svc[1]:7.4f} {svc[2]:7.4f}"
+            diff_cols = f"{lin[1] - svc[1]:+7.4f} {lin[2] - svc[2]:+7.4f}"
+        else:
+            svc_cols = f"{'-':>10} {'-':>7} {'-':>7}"
+            diff_cols = f"{'-':>7} {'-':>7}"
+        print(f"{n:>10,} | {svc_cols} | {lin[0]:13.3f} {lin[1]:7.4f} {lin[2]:7.4f} | {diff_cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Benchmark peta halaman Hasil: alur lama (baca shapefile + gambar ulang dengan pyplot tiap rerun,
+# figure tidak ditutup) vs choropleth.render_map_png (geometri & PNG per kategori di-cache).
+# Jalankan dari root repo:  python -m benchmarks.bench_map [--reruns 50]
+import argparse
+import time
+from io import BytesIO
+
+import geopandas as gpd
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from src_model import choropleth
+from src_model.ingest import PeakRSS
+
+
+def legacy(category):
+    jakarta = gpd.read_file(choropleth.BOUNDARY_PATH)
+    fig, ax = plt.subplots(figsize=(3.5, 3.5))
+    jakarta.plot(ax=ax, color=choropleth.CATEGORY_COLORS.get(category, choropleth.DEFAULT_COLOR),
+                 edgecolor="black", linewidth=1)
+    ax.set_title(f"Peta Kualitas Udara DKI Jakarta — {category.upper()}", fontsize=11, fontweight="bold")
+    ax.axis("off")
+    # Setara st.pyplot: figure disimpan ke PNG tetapi tetap terdaftar di pyplot
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=choropleth.MAP_DPI, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def run(fn, reruns):
+    categories = list(choropleth.CATEGORY_COLORS) + ["lainnya"]
+    start = time.perf_counter()
+    with PeakRSS() as mem:
+        for i in range(reruns):
+            fn(categories[i % len(categories)])
+    return (time.perf_counter() - start) / reruns, mem.peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+
+    seconds, peak = run(legacy, args.reruns)
+    print(f"   lama: {seconds * 1000:7.1f} ms/rerun, puncak +{peak / 1024 ** 2:6.1f} MB, "
+          f"{len(plt.get_fignums())} figure terbuka")
+    plt.close("all")
+
+    start = time.perf_counter()
+    choropleth.render_map_png("baik")
+    print(f"  cache: render pertama {(time.perf_counter() - start) * 1000:.1f} ms")
+    seconds, peak = run(choropleth.render_map_png, args.reruns)
+    print(f"  cache: {seconds * 1000:7.3f} ms/rerun, puncak +{peak / 1024 ** 2:6.1f} MB, "
+          f"{len(plt.get_fignums())} figure terbuka")
+
+
+if __name__ == "__main__":
+    main()
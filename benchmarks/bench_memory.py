@@ -0,0 +1,100 @@
+# Benchmark puncak RSS training: mode standar (float64) vs mode hemat memori (float32, top-k parsial,
+# buffer float64 bersama untuk SVM). Tahap "persiapan" = validasi, labeling T², scaling dan 10 data
+# ekstrem; tahap "training" = training.fit lengkap (RBF aproksimasi agar layak untuk data besar).
+# Jalankan dari root repo:  python -m benchmarks.bench_memory [--rows 1000000] [--components 50]
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from benchmarks.bench_hotelling import make_data
+from src_model import training
+from src_model.ingest import PeakRSS
+from src_model.schema import FEATURE_COLS, LABEL_COL, T2_COL
+
+
+def make_upload(n):
+    # Bentuk frame seperti hasil parse upload: 4 kolom float64 + kolom kategori kosong
+    df = pd.DataFrame(make_data(n), columns=FEATURE_COLS)
+    df.iloc[::1000, 0] = 0.0
+    df[LABEL_COL] = None
+    return df
+
+
+def legacy_prepare(df):
+    # Alur persiapan sebelum mode hemat memori: salinan frame, df_clean, X, X_scaled, dua sort penuh
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    df_clean = df[(df[FEATURE_COLS] != 0).all(axis=1)].reset_index(drop=True)
+    X = df_clean[FEATURE_COLS].astype(float).values
+    mean = X.mean(axis=0)
+    inv = np.linalg.inv(np.cov(X, rowvar=False))
+    diff = X - mean
+    df_clean[T2_COL] = np.einsum("ij,jk,ik->i", diff, inv, diff)
+    df_clean[LABEL_COL] = np.where(df_clean[T2_COL] > 13.28, "kurang baik", "baik")
+    X_scaled = StandardScaler().fit_transform(df_clean[FEATURE_COLS])
+    df_sorted_asc = df_clean.sort_values(by=T2_COL, ascending=True)
+    df_sorted_desc = df_clean.sort_values(by=T2_COL, ascending=False)
+    return X_scaled, df_sorted_asc.head(10), df_sorted_desc.head(10)
+
+
+def prepare(df, low_memory):
+    dtype = np.float32 if low_memory else np.float64
+    data = training.validation.ensure_validated(df, FEATURE_COLS, dtype)
+    del df
+    df_clean = data.to_frame()
+    training.label_dataframe(df_clean, 0.01, FEATURE_COLS, low_memory)
+    X_scaled = StandardScaler().fit_transform(df_clean[FEATURE_COLS])
+    bundle = training.TrainingBundle(None, FEATURE_COLS, len(df_clean), df_clean, None, None, {}, {})
+    return X_scaled, bundle.extremes(10)
+
+
+def _child(n, stage, mode, components, queue):
+    df = make_upload(n)
+    start = time.perf_counter()
+    with PeakRSS() as mem:
+        if stage == "persiapan":
+            if mode == "lama":
+                legacy_prepare(df)
+            else:
+                prepare(df, mode == "hemat")
+        else:
+            config = training.TrainingConfig(
+                C=1.0, gamma=0.1, rbf_components=components, defer_refit=True, low_memory=mode == "hemat"
+            )
+            training.fit(df, config)
+    queue.put((time.perf_counter() - start, mem.peak_bytes))
+
+
+def measure(n, stage, mode, components):
+    # Proses baru per pengukuran supaya puncak RSS tidak terpengaruh alokasi sebelumnya
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(n, stage, mode, components, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--components", type=int, default=50)
+    parser.add_argument("--skip-training", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} baris; kenaikan puncak RSS di atas frame upload ({args.rows * 40 / 1024 ** 2:.0f} MB)")
+    runs = [("persiapan", "lama"), ("persiapan", "standar"), ("persiapan", "hemat")]
+    if not args.skip_training:
+        runs += [("training", "standar"), ("training", "hemat")]
+    for stage, mode in runs:
+        seconds, peak = measure(args.rows, stage, mode, args.components)
+        print(f"{stage:>9} {mode:>8}: {seconds:7.2f} s, puncak +{peak / 1024 ** 2:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmark metrik evaluasi: empat fungsi sklearn terpisah vs satu confusion matrix (metrics.compute_metrics),
+# dan bootstrap CI: loop resample indeks + sklearn vs tarikan multinomial tervektorisasi.
+# Jalankan dari root repo:  python -m benchmarks.bench_metrics [--rows 200000] [--boot 5000]
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+
+from src_model import metrics
+
+
+def sklearn_metrics(y_test, y_pred):
+    return {
+        "Accuracy": accuracy_score(y_test, y_pred),
+        "Precision": precision_score(y_test, y_pred, average="weighted", zero_division=0),
+        "Recall": recall_score(y_test, y_pred, average="weighted", zero_division=0),
+        "F1 Score": f1_score(y_test, y_pred, average="weighted"),
+        "Confusion Matrix": confusion_matrix(y_test, y_pred),
+    }
+
+
+def make_predictions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.where(rng.random(n) < 0.1, "kurang baik", "baik")
+    flip = {"baik": "kurang baik", "kurang baik": "baik"}
+    preds = {}
+    for name, acc in [("Linear", 0.95), ("RBF", 0.97)]:
+        wrong = rng.random(n) > acc
+        preds[name] = np.where(wrong, np.vectorize(flip.get)(y), y)
+    return y, preds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000, help="jumlah baris data uji")
+    parser.add_argument("--boot", type=int, default=5000)
+    parser.add_argument("--loop-boot", type=int, default=5, help="resample untuk loop sklearn (diekstrapolasi)")
+    args = parser.parse_args()
+
+    y, preds = make_predictions(args.rows)
+    print(f"{args.rows:,} baris uji, 2 model")
+
+    start = time.perf_counter()
+    ref = sklearn_metrics(y, preds["Linear"])
+    legacy = time.perf_counter() - start
+    start = time.perf_counter()
+    fused = metrics.compute_metrics(y, preds["Linear"])
+    single = time.perf_counter() - start
+    diff = max(abs(ref[m] - fused[m]) for m in metrics.METRIC_NAMES)
+    print(f"  metrik 1 model: sklearn {legacy * 1000:.1f} ms, satu confusion matrix {single * 1000:.1f} ms "
+          f"(selisih maks {diff:.1e})")
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(args.loop_boot):
+        idx = rng.integers(0, args.rows, args.rows)
+        for name in preds:
+            sklearn_metrics(y[idx], preds[name][idx])
+    per_boot = (time.perf_counter() - start) / args.loop_boot
+    print(f"  bootstrap loop sklearn: {per_boot * 1000:.1f} ms/resample -> {per_boot * args.boot:.1f} s "
+          f"untuk {args.boot:,} resample (ekstrapolasi)")
+
+    start = time.perf_counter()
+    intervals = metrics.bootstrap_intervals(y, preds, n_boot=args.boot)
+    print(f"  bootstrap multinomial: {time.perf_counter() - start:.3f} s untuk {args.boot:,} resample")
+    for name in ["Linear", "RBF", "RBF - Linear"]:
+        lo, hi = intervals[name]["F1 Score"]
+        print(f"    F1 {name:>12}: [{lo:.4f}, {hi:.4f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Benchmark RBF eksak (libsvm) vs RBF aproksimasi (Nystroem + liblinear).
+# Jalankan dari root repo:  python -m benchmarks.bench_rbf_approx [--rows ...] [--components 300]
+import argparse
+import time
+
+from sklearn.metrics import accuracy_score
+
+from benchmarks.bench_linear_parity import labeled_split
+from src_model import svm_backend
+
+
+def evaluate(model, X_train, X_test, y_train, y_test):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    t_fit = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    t_pred = time.perf_counter() - start
+    return t_fit, t_pred / len(y_test) * 1e6, accuracy_score(y_test, y_pred)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000, 20_000, 100_000, 1_000_000])
+    parser.add_argument("--exact-max-rows", type=int, default=100_000)
+    parser.add_argument("--components", type=int, default=300)
+    parser.add_argument("--C", type=float, default=1.0)
+    parser.add_argument("--gamma", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'exact fit':>9} {'µs/row':>7} {'acc':>7} | {'approx fit':>10} {'µs/row':>7} {'acc':>7} | {'Δacc':>7}")
+    for n in args.rows:
+        split = labeled_split(n)
+        approx = evaluate(svm_backend.make_approx_rbf_model(args.C, args.gamma, args.components), *split)
+        if n <= args.exact_max_rows:
+            exact = evaluate(svm_backend.make_rbf_model(args.C, args.gamma), *split)
+            exact_cols = f"{exact[0]:9.3f} {exact[1]:7.2f} {exact[2]:7.4f}"
+            gap = f"{approx[2] - exact[2]:+7.4f}"
+        else:
+            exact_cols = f"{'-':>9} {'-':>7} {'-':>7}"
+            gap = f"{'-':>7}"
+        print(f"{n:>10,} | {exact_cols} | {approx[0]:10.3f} {approx[1]:7.2f} {approx[2]:7.4f} | {gap}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Benchmark T² jendela geser: update/downdate rank-one faktor Cholesky (rolling.rolling_t2) vs fit ulang
+# mean/kovarians/Cholesky dari data jendela di setiap hari.
+# Jalankan dari root repo:  python -m benchmarks.bench_rolling [--days 3650] [--windows 30,365]
+import argparse
+import time
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from benchmarks.bench_hotelling import make_data
+from src_model import rolling
+
+
+def refit(days, X, window_days, min_periods):
+    day_num = days.astype(np.int64)
+    t2 = np.full(len(X), np.nan)
+    lo = 0
+    for i in range(len(X)):
+        while day_num[lo] < day_num[i] - window_days:
+            lo += 1
+        W = X[lo:i]
+        if len(W) < min_periods:
+            continue
+        mean = W.mean(axis=0)
+        d = X[i] - mean
+        t2[i] = d @ cho_solve(cho_factor(np.cov(W, rowvar=False)), d)
+    return t2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--windows", default="30,365")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = make_data(args.days)
+    # Sebagian hari tanpa data (awan / orbit) supaya ukuran jendela bervariasi
+    days = np.datetime64("2015-01-01") + np.flatnonzero(rng.random(args.days * 2) > 0.1)[:args.days]
+    min_periods = max(rolling.validation.MIN_ROWS, X.shape[1] + 1)
+    print(f"{args.days:,} hari")
+    for window_days in (int(w) for w in args.windows.split(",")):
+        start = time.perf_counter()
+        t2, _, _, refactors = rolling.rolling_t2(days, X, window_days)
+        incremental = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = refit(days, X, window_days, min_periods)
+        full = time.perf_counter() - start
+        scored = ~np.isnan(reference)
+        err = np.max(np.abs(t2[scored] - reference[scored]) / reference[scored])
+        print(f"  jendela {window_days:>3} hari: rank-one {incremental:.3f} s ({refactors} faktorisasi penuh), "
+              f"fit ulang {full:.3f} s, selisih relatif maks {err:.1e}")
+
+
+if __name__ == "__main__":
+    main()
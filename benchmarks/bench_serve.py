@@ -0,0 +1,159 @@
+# Load generator untuk src_model.serve: request satu baris dengan laju tetap (open-loop) lewat
+# beberapa koneksi keep-alive. Latensi diukur dari jadwal kirim, jadi antrian di sisi klien
+# ikut terhitung (tanpa coordinated omission). Membandingkan tanpa micro-batching (--max-batch 1)
+# dengan micro-batching pada beberapa laju request.
+# Jalankan dari root repo:  python -m benchmarks.bench_serve [--rates 200,500,1000] [--seconds 10]
+# Server yang sudah berjalan:  python -m benchmarks.bench_serve --url http://127.0.0.1:8765
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from benchmarks.bench_hotelling import make_data
+from src_model.schema import FEATURE_COLS
+
+
+async def request(reader, writer, host, method, path, body=b""):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode().partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await request(reader, writer, host, "GET", path))[1]
+    finally:
+        writer.close()
+
+
+async def connection(host, port, schedule, bodies, latencies, errors):
+    # Satu koneksi keep-alive mengirim request sesuai jadwalnya sendiri
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    try:
+        for due, body in zip(schedule, bodies):
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            status, _ = await request(reader, writer, host, "POST", "/predict", body)
+            latencies.append(loop.time() - due)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, rate, seconds, connections, seed=0):
+    rows = make_data(int(rate * seconds), seed=seed)
+    bodies = [json.dumps(dict(zip(FEATURE_COLS, row.tolist()))).encode() for row in rows]
+    before = await get_json(host, port, "/stats")
+    loop = asyncio.get_running_loop()
+    start = loop.time() + 0.2
+    due = start + np.arange(len(bodies)) / rate
+    latencies, errors = [], []
+    await asyncio.gather(*(
+        connection(host, port, due[i::connections], bodies[i::connections], latencies, errors)
+        for i in range(connections)
+    ))
+    elapsed = loop.time() - start
+    after = await get_json(host, port, "/stats")
+    batches = after["batches"] - before["batches"]
+    ms = np.array(latencies) * 1000
+    return {
+        "rps": len(ms) / elapsed,
+        "p50": np.percentile(ms, 50),
+        "p95": np.percentile(ms, 95),
+        "p99": np.percentile(ms, 99),
+        "max": ms.max(),
+        "errors": len(errors),
+        "mean_batch": (after["rows"] - before["rows"]) / batches if batches else 0.0,
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(bundle_path, port, max_batch, max_wait_ms):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src_model.serve", bundle_path, "--port", str(port),
+         "--max-batch", str(max_batch), "--max-wait-ms", str(max_wait_ms)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    while "Melayani" not in proc.stdout.readline():
+        if proc.poll() is not None:
+            raise RuntimeError("Server gagal dijalankan.")
+    return proc
+
+
+def report(label, result):
+    print(
+        f"  {label:<34} {result['rps']:>6.0f} req/s  p50 {result['p50']:6.2f}  p95 {result['p95']:6.2f}  "
+        f"p99 {result['p99']:7.2f}  maks {result['max']:7.2f} ms  batch rata-rata {result['mean_batch']:5.1f}"
+        + (f"  error {result['errors']}" if result["errors"] else "")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="Uji server yang sudah berjalan, tanpa membandingkan konfigurasi")
+    parser.add_argument("--rates", default="200,500,1000")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--train-rows", type=int, default=5_000)
+    parser.add_argument("--kernel", default="rbf")
+    args = parser.parse_args()
+    rates = [float(r) for r in args.rates.split(",")]
+
+    if args.url:
+        url = urlparse(args.url)
+        for rate in rates:
+            report(f"{rate:.0f} req/s", asyncio.run(run_load(url.hostname, url.port, rate, args.seconds, args.connections)))
+        return
+
+    from benchmarks.bench_batch_score import make_bundle
+
+    configs = [("tanpa micro-batching", 1, 0.0), ("micro-batching (tunggu 0 ms)", 256, 0.0),
+               ("micro-batching (tunggu 1 ms)", 256, 1.0), ("micro-batching (tunggu 5 ms)", 256, 5.0)]
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = make_bundle(os.path.join(tmp, "models"), args.kernel, args.train_rows)
+        print(f"kernel {args.kernel}, {args.connections} koneksi, {args.seconds:.0f} detik per laju, {os.cpu_count()} core")
+        for rate in rates:
+            print(f"laju target {rate:.0f} req/s")
+            for label, max_batch, max_wait_ms in configs:
+                port = free_port()
+                proc = start_server(bundle.path, port, max_batch, max_wait_ms)
+                try:
+                    report(label, asyncio.run(run_load("127.0.0.1", port, rate, args.seconds, args.connections)))
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                time.sleep(0.2)
+
+
+if __name__ == "__main__":
+    main()
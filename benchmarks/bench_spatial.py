@@ -0,0 +1,70 @@
+# Benchmark join spasial titik -> wilayah: geopandas.sjoin (objek Point per titik + STRtree)
+# vs spatial.DistrictIndex (grid bantu dari STRtree, uji point-in-polygon hanya di sel perbatasan).
+# Wilayah sintetis: batas DKI Jakarta dipotong grid (nx x ny) menyerupai kecamatan.
+# Jalankan dari root repo:  python -m benchmarks.bench_spatial [--points 5000000] [--grid 7x6]
+import argparse
+import time
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from src_model import choropleth, spatial
+
+
+def make_districts(nx, ny):
+    boundary = shapely.make_valid(gpd.read_file(choropleth.BOUNDARY_PATH).geometry.iloc[0])
+    xmin, ymin, xmax, ymax = boundary.bounds
+    xs = np.linspace(xmin, xmax, nx + 1)
+    ys = np.linspace(ymin, ymax, ny + 1)
+    cells = [shapely.box(xs[i], ys[j], xs[i + 1], ys[j + 1]).intersection(boundary)
+             for i in range(nx) for j in range(ny)]
+    return [c for c in cells if not c.is_empty], boundary.bounds
+
+
+def sjoin_codes(lon, lat, districts):
+    points = gpd.GeoDataFrame(geometry=gpd.points_from_xy(lon, lat), crs=4326)
+    polygons = gpd.GeoDataFrame(geometry=districts, crs=4326)
+    joined = gpd.sjoin(points, polygons, how="left", predicate="within")
+    joined = joined[~joined.index.duplicated()]
+    return joined["index_right"].fillna(-1).to_numpy(dtype=np.int32)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=5_000_000)
+    parser.add_argument("--grid", default="7x6")
+    parser.add_argument("--skip-sjoin", action="store_true")
+    args = parser.parse_args()
+
+    nx, ny = (int(v) for v in args.grid.split("x"))
+    districts, (xmin, ymin, xmax, ymax) = make_districts(nx, ny)
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(xmin - 0.01, xmax + 0.01, args.points)
+    lat = rng.uniform(ymin - 0.01, ymax + 0.01, args.points)
+    print(f"{args.points:,} titik, {len(districts)} wilayah")
+
+    start = time.perf_counter()
+    index = spatial.DistrictIndex([f"W{i}" for i in range(len(districts))], districts)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    codes = index.assign(lon, lat)
+    seconds = time.perf_counter() - start
+    print(f"  DistrictIndex: bangun {build:.2f} s, join {seconds:.2f} s ({args.points / seconds:,.0f} titik/detik), "
+          f"{(codes >= 0).mean():.1%} di dalam wilayah")
+
+    if not args.skip_sjoin:
+        start = time.perf_counter()
+        reference = sjoin_codes(lon, lat, districts)
+        seconds = time.perf_counter() - start
+        print(f"  geopandas.sjoin: {seconds:.2f} s ({args.points / seconds:,.0f} titik/detik), "
+              f"kecocokan {(reference == codes).mean():.4%}")
+
+    X = rng.lognormal(size=(args.points, 4))
+    start = time.perf_counter()
+    spatial.aggregate(codes, X, len(index))
+    print(f"  agregasi bincount: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Benchmark cold start: waktu sampai render pertama halaman utama (proses baru, termasuk impor
+# streamlit) dengan halaman lazy vs semua halaman diimpor di depan seperti app.py sebelumnya.
+# Keluar dengan status 1 jika mode lazy melewati target.
+# Jalankan dari root repo:  python -m benchmarks.bench_startup [--repeat 3] [--target-ms 1500]
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+from benchmarks.profile_imports import HEAVY, PAGES
+
+TARGET_MS = 1500
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _child(eager, queue):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    if eager:
+        for module in PAGES:
+            __import__(module)
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    elapsed = time.perf_counter() - start
+    loaded = [h for h in HEAVY if h in sys.modules]
+    queue.put((elapsed, loaded, len(at.exception)))
+
+
+def measure(eager):
+    # Proses baru per pengukuran: impor yang sudah ada di sys.modules tidak boleh ikut terhitung
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(eager, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target-ms", type=float, default=TARGET_MS)
+    args = parser.parse_args()
+
+    best = {}
+    for mode in ["eager", "lazy"]:
+        runs = [measure(mode == "eager") for _ in range(args.repeat)]
+        seconds, loaded, errors = min(runs)
+        best[mode] = seconds
+        print(f"{mode:>6}: render pertama {seconds * 1000:7.0f} ms (terbaik dari {args.repeat}), "
+              f"library berat: {', '.join(loaded) or '-'}, exception: {errors}")
+
+    ok = best["lazy"] * 1000 <= args.target_ms
+    print(f"target {args.target_ms:.0f} ms: {'OK' if ok else 'GAGAL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
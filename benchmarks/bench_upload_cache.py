@@ -0,0 +1,62 @@
+# Benchmark rerun halaman training: parse ulang upload tiap rerun vs cache upload (hash isi + memmap .npy).
+# Jalankan dari root repo:  python -m benchmarks.bench_upload_cache [--rows 200000] [--format xlsx]
+import argparse
+import io
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_ingest import encode, make_frame
+from src_model import ingest, upload_cache, validation
+
+
+def rerun(data, fmt, cache):
+    # Satu rerun Streamlit: hash isi upload, lalu parse hanya jika belum ada di cache
+    file = io.BytesIO(data)
+    key = upload_cache.content_key(file)
+    X, info = cache.get(key)
+    if X is None:
+        df, info = ingest.read_upload_profiled(file, f"data.{fmt}", ingest.TRAINING_COLS)
+        validated = validation.validate_and_clean(df)
+        info["validasi"] = validated.report.to_dict()
+        X, info = cache.put(key, validated.X, info)
+    return X
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--format", default="xlsx", choices=["csv", "xlsx", "parquet", "arrow"])
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    data = encode(make_frame(args.rows), args.format)
+    print(f"{args.format}: {args.rows:,} baris, {len(data) / 1024 ** 2:.1f} MB")
+
+    start = time.perf_counter()
+    ingest.read_upload(io.BytesIO(data), f"data.{args.format}", ingest.TRAINING_COLS)
+    print(f"tanpa cache (parse per rerun): {time.perf_counter() - start:8.3f} s")
+
+    directory = tempfile.mkdtemp()
+    try:
+        cache = upload_cache.UploadCache(directory)
+        start = time.perf_counter()
+        rerun(data, args.format, cache)
+        print(f"rerun pertama (parse + simpan): {time.perf_counter() - start:7.3f} s")
+
+        # Cache memori dikosongkan supaya yang diukur adalah jalur disk (memmap)
+        cache._memory.clear()
+        start = time.perf_counter()
+        rerun(data, args.format, cache)
+        print(f"rerun dari disk (memmap):      {time.perf_counter() - start:8.3f} s")
+
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            rerun(data, args.format, cache)
+        print(f"rerun dari memori (rata-rata): {(time.perf_counter() - start) / args.reruns:8.3f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Benchmark validasi + cleansing: rangkaian pemeriksaan lama (halaman + clean_dataframe + astype)
+# vs validation.validate_and_clean (satu lintasan, satu salinan).
+# Jalankan dari root repo:  python -m benchmarks.bench_validation [--rows 2000000]
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_hotelling import make_data
+from src_model import validation
+from src_model.ingest import PeakRSS
+from src_model.schema import FEATURE_COLS, LABEL_COL
+
+
+def make_frame(n):
+    df = pd.DataFrame(make_data(n), columns=FEATURE_COLS)
+    df.iloc[::500, 1] = 0.0
+    df[LABEL_COL] = None
+    return df
+
+
+def legacy(df):
+    # Urutan langkah sebelum validation.py: validasi di halaman, lalu clean_dataframe dan labeling
+    required_cols = set(FEATURE_COLS)
+    assert required_cols.issubset(df.columns)
+    assert not df[list(required_cols)].isnull().any().any()
+    assert not (df[LABEL_COL].notnull().any() and df[LABEL_COL].astype(str).str.strip().ne("").any())
+    assert all(np.issubdtype(df[c].dtype, np.number) for c in required_cols)
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    mask_nonzero = (df[FEATURE_COLS] != 0).all(axis=1)
+    df_clean = df[mask_nonzero].reset_index(drop=True)
+    return df_clean[FEATURE_COLS].astype(float).values
+
+
+def fused(df):
+    return validation.validate_and_clean(df).X
+
+
+def _child(n, mode, queue):
+    df = make_frame(n)
+    fn = legacy if mode == "legacy" else fused
+    start = time.perf_counter()
+    with PeakRSS() as mem:
+        X = fn(df)
+    queue.put((time.perf_counter() - start, mem.peak_bytes, len(X)))
+
+
+def measure(n, mode):
+    # Proses baru per pengukuran supaya puncak RSS tidak terpengaruh alokasi sebelumnya
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(n, mode, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    data_mb = args.rows * len(FEATURE_COLS) * 8 / 1024 ** 2
+    print(f"{args.rows:,} baris, matriks fitur {data_mb:.1f} MB")
+    for mode in ["legacy", "fused"]:
+        seconds, peak, n_clean = measure(args.rows, mode)
+        print(f"{mode:>7}: {seconds:7.3f} s, puncak +{peak / 1024 ** 2:7.1f} MB, {n_clean:,} baris bersih")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Profil waktu impor per halaman (python -X importtime), dihitung di atas impor streamlit.
+# Hasilnya disimpan di benchmarks/import_profile.txt sebagai acuan; jalankan ulang setelah
+# menambah dependensi di halaman:  python -m benchmarks.profile_imports [--write] [--top 8]
+import argparse
+import os
+import subprocess
+import sys
+
+PAGES = [
+    "halaman.home",
+    "halaman.informasi",
+    "halaman.panduan",
+    "halaman.tentang",
+    "halaman.pelatihan_pengujian",
+    "halaman.hasil",
+]
+HEAVY = ["numpy", "pandas", "pyarrow", "sklearn", "scipy", "geopandas", "matplotlib", "seaborn"]
+PROFILE_PATH = os.path.join(os.path.dirname(__file__), "import_profile.txt")
+
+
+def importtime(module):
+    # Baris importtime: "import time: self [us] | cumulative | imported package", nama diindentasi
+    # 2 spasi per tingkat. Tingkat 0 = modul halaman (total), tingkat 1 = impor langsung halaman
+    code = f"import streamlit, sys; print('---', file=sys.stderr, flush=True); import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    total, rows = 0, []
+    after_streamlit = False
+    for line in proc.stderr.splitlines():
+        if line == "---":
+            after_streamlit = True
+            continue
+        if not after_streamlit or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total += int(cumulative)
+        elif depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return total, rows
+
+
+def profile(top):
+    lines = []
+    for module in PAGES:
+        total, rows = importtime(module)
+        heavy = [h for h in HEAVY if h in loaded_packages(module)]
+        lines.append(f"{module:<30} {total / 1000:8.1f} ms  berat: {', '.join(heavy) or '-'}")
+        for us, name in sorted(rows, reverse=True)[:top]:
+            lines.append(f"    {us / 1000:8.1f} ms  {name}")
+    return lines
+
+
+def loaded_packages(module):
+    # Paket tingkat atas yang dimuat halaman (termasuk impor bertingkat) di atas streamlit
+    code = f"import streamlit, sys; before = set(sys.modules); import {module}; print(*(set(sys.modules) - before))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return {name.split(".")[0] for name in proc.stdout.split()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--write", action="store_true", help="simpan ke benchmarks/import_profile.txt")
+    args = parser.parse_args()
+
+    lines = [f"# python {sys.version.split()[0]}, waktu impor kumulatif di atas `import streamlit`"]
+    lines += profile(args.top)
+    print("\n".join(lines))
+    if args.write:
+        with open(PROFILE_PATH, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
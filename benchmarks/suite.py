@@ -0,0 +1,353 @@
+# Suite benchmark regresi: setiap tahap pipeline diukur pada data sintetis Sentinel-5P (benchmarks.synthetic)
+# untuk beberapa jumlah baris, hasil disimpan sebagai JSON di benchmarks/results/, lalu dibandingkan
+# dengan baseline (baseline.json, atau run sebelumnya jika belum ada baseline).
+# Jalankan dari root repo:
+#   python -m benchmarks.suite [--rows 2000,20000] [--only fit,predict] [--repeat 5]
+#   python -m benchmarks.suite --update-baseline     # simpan run ini sebagai baseline
+#   python -m benchmarks.suite --check               # status keluar 1 jika ada regresi
+import argparse
+import functools
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from src_model.schema import FEATURE_COLS, LABEL_COL
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_FILE = "baseline.json"
+DEFAULT_ROWS = "2000,20000"
+# Regresi: lebih lambat dari baseline lebih dari TOLERANCE (relatif) dan NOISE_FLOOR_MS (absolut)
+TOLERANCE = 0.25
+NOISE_FLOOR_MS = 0.25
+# Kasus yang terlihat regresi diukur ulang sekali lagi (repeat dikali ini) sebelum dilaporkan,
+# supaya gangguan sesaat di mesin (proses lain, frekuensi CPU) tidak menjadi regresi palsu
+CONFIRM_FACTOR = 2
+# Fit SVM eksak tumbuh ~kuadratik; ukuran di atas ini dilewati untuk kasus fit
+FIT_MAX_ROWS = 50_000
+MIN_SAMPLE_S = 0.05
+MAX_LOOPS = 1000
+
+CASES = {}
+
+
+def case(name, sized=True):
+    # sized=False: kasus tidak bergantung jumlah baris (mis. render peta), dijalankan sekali
+    def register(fn):
+        CASES[name] = (fn, sized)
+        return fn
+    return register
+
+
+class Context:
+    """Data dan artefak per jumlah baris, dibuat sekali lalu dipakai bersama oleh semua kasus."""
+
+    def __init__(self, n, seed=0):
+        self.n = n
+        self.seed = seed
+
+    @functools.cached_property
+    def frame(self):
+        return synthetic.make_frame(self.n, self.seed)
+
+    @functools.cached_property
+    def csv_bytes(self):
+        return self.frame.to_csv(index=False).encode()
+
+    @functools.cached_property
+    def parquet_bytes(self):
+        buf = io.BytesIO()
+        self.frame.to_parquet(buf, index=False)
+        return buf.getvalue()
+
+    @functools.cached_property
+    def validated(self):
+        from src_model import validation
+
+        return validation.validate_and_clean(self.frame)
+
+    @functools.cached_property
+    def bundle(self):
+        from src_model import training
+
+        return training.fit(self.validated, training.TrainingConfig(C=1.0, gamma=0.1))
+
+    @functools.cached_property
+    def split(self):
+        from sklearn.model_selection import train_test_split
+
+        bundle = self.bundle
+        X_scaled = bundle.scaler.transform(bundle.labeled[bundle.feature_cols])
+        y = bundle.labeled[LABEL_COL].to_numpy()
+        X_train, _, y_train, _ = train_test_split(X_scaled, y, test_size=0.2, random_state=42, stratify=y)
+        return X_scaled, y, X_train, y_train
+
+
+@case("upload_csv")
+def upload_csv(ctx):
+    from src_model import ingest
+
+    return lambda: ingest.read_upload(ctx.csv_bytes, "data.csv", columns=ingest.TRAINING_COLS)
+
+
+@case("upload_parquet")
+def upload_parquet(ctx):
+    from src_model import ingest
+
+    return lambda: ingest.read_upload(ctx.parquet_bytes, "data.parquet", columns=ingest.TRAINING_COLS)
+
+
+@case("cleansing")
+def cleansing(ctx):
+    from src_model import validation
+
+    return lambda: validation.validate_and_clean(ctx.frame)
+
+
+@case("labeling_t2")
+def labeling_t2(ctx):
+    from src_model import training
+
+    X = ctx.validated.X
+    return lambda: training.label_dataframe(pd.DataFrame(X, columns=FEATURE_COLS))
+
+
+def _fit_case(kernel, full):
+    def make(ctx):
+        from src_model import svm_backend
+
+        if ctx.n > FIT_MAX_ROWS:
+            return None
+        X_scaled, y, X_train, y_train = ctx.split
+        X, y = (X_scaled, y) if full else (X_train, y_train)
+        if kernel == "linear":
+            model = svm_backend.make_linear_model(1.0, len(y))
+        else:
+            model = svm_backend.make_rbf_model(1.0, 0.1)
+        return lambda: model.fit(X, y)
+    return make
+
+
+for _kernel in ("linear", "rbf"):
+    case(f"fit_{_kernel}")(_fit_case(_kernel, full=False))
+    case(f"fit_{_kernel}_final")(_fit_case(_kernel, full=True))
+
+
+@case("predict_single")
+def predict_single(ctx):
+    # Jalur form input manual: DataFrame satu baris -> scaler -> SVM, dan T² satu baris
+    from src_model import training
+
+    bundle = ctx.bundle
+    model = training.ensure_final_model(bundle.models, "rbf")
+    row = ctx.validated.X[0].tolist()
+
+    def run():
+        X = pd.DataFrame([row], columns=bundle.feature_cols)
+        model.predict(bundle.scaler.transform(X))
+        bundle.t2.score(row)
+    return run
+
+
+@case("predict_bulk")
+def predict_bulk(ctx):
+    from src_model import prediction, training
+
+    bundle = ctx.bundle
+    model = training.ensure_final_model(bundle.models, "rbf")
+    X = ctx.validated.X
+    return lambda: prediction.write_scored_csv(X, model, bundle.scaler, bundle.t2, io.StringIO(), bundle.feature_cols)
+
+
+@case("map_render", sized=False)
+def map_render(ctx):
+    # Render pertama peta Hasil (baca + sederhanakan batas wilayah + PNG), cache dikosongkan tiap ulangan
+    from src_model import choropleth
+
+    def run():
+        choropleth.load_boundary.cache_clear()
+        choropleth.render_map_png.cache_clear()
+        choropleth.render_map_png("baik")
+    return run
+
+
+@case("map_render_cached", sized=False)
+def map_render_cached(ctx):
+    from src_model import choropleth
+
+    choropleth.render_map_png("baik")
+    return lambda: choropleth.render_map_png("baik")
+
+
+@case("map_districts", sized=False)
+def map_districts(ctx):
+    from src_model import choropleth, spatial
+
+    index = spatial.load_districts()
+    categories = ["baik" if i % 2 else "kurang baik" for i in range(len(index))]
+    return lambda: choropleth.render_districts_png(index, categories)
+
+
+def time_case(fn, repeat, warmup_s):
+    # Seperti timeit: kasus cepat diulang `loops` kali per sampel (sampel >= MIN_SAMPLE_S) supaya
+    # resolusi timer dan noise tidak mendominasi; minimum dipakai untuk perbandingan
+    loops = min(MAX_LOOPS, max(1, int(np.ceil(MIN_SAMPLE_S / max(warmup_s, 1e-9)))))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        times.append((time.perf_counter() - start) / loops)
+    return {"min_ms": min(times) * 1000, "median_ms": float(np.median(times)) * 1000, "repeat": repeat, "loops": loops}
+
+
+def environment():
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def run_suite(rows, only=None, repeat=3):
+    results, targets = {}, {}
+    selected = [name for name in CASES if not only or any(name.startswith(p) for p in only)]
+    contexts = {n: Context(n) for n in rows}
+    for name in selected:
+        fn, sized = CASES[name]
+        for n in (rows if sized else [None]):
+            key = f"{name}[{n}]" if sized else name
+            target = fn(contexts[n] if sized else None)
+            if target is None:
+                print(f"  {key:<28} dilewati")
+                continue
+            start = time.perf_counter()
+            target()  # Pemanasan: impor modul, cache, alokasi pertama
+            results[key] = time_case(target, repeat, time.perf_counter() - start)
+            targets[key] = target
+            print(f"  {key:<28} {results[key]['min_ms']:>10.3f} ms (median {results[key]['median_ms']:.3f})")
+    return results, targets
+
+
+def confirm(keys, results, targets, repeat):
+    # Ukur ulang kasus yang dicurigai; minimum dari kedua pengukuran yang disimpan
+    for key in keys:
+        before = results[key]
+        again = time_case(targets[key], repeat * CONFIRM_FACTOR, before["min_ms"] / 1000)
+        results[key] = {**again, "min_ms": min(before["min_ms"], again["min_ms"]),
+                        "repeat": before["repeat"] + again["repeat"]}
+        print(f"  {key:<28} {before['min_ms']:>10.3f} -> {results[key]['min_ms']:.3f} ms (diukur ulang)")
+
+
+def load_reference(directory=RESULTS_DIR):
+    # baseline.json jika ada, jika tidak run tersimpan terakhir
+    path = os.path.join(directory, BASELINE_FILE)
+    if not os.path.exists(path):
+        runs = sorted(glob.glob(os.path.join(directory, "run-*.json")))
+        if not runs:
+            return None, None
+        path = runs[-1]
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh), path
+
+
+def compare(current, reference, tolerance=TOLERANCE, noise_floor_ms=NOISE_FLOOR_MS):
+    rows = []
+    for key, now in current.items():
+        before = reference.get(key)
+        if before is None:
+            continue
+        ratio = now["min_ms"] / before["min_ms"] if before["min_ms"] > 0 else float("inf")
+        delta = now["min_ms"] - before["min_ms"]
+        if ratio > 1 + tolerance and delta > noise_floor_ms:
+            status = "REGRESI"
+        elif ratio < 1 / (1 + tolerance) and -delta > noise_floor_ms:
+            status = "lebih cepat"
+        else:
+            status = "ok"
+        rows.append({"kasus": key, "baseline_ms": before["min_ms"], "sekarang_ms": now["min_ms"],
+                     "rasio": ratio, "status": status})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark regresi Jak Air.")
+    parser.add_argument("--rows", default=DEFAULT_ROWS, help="Jumlah baris, dipisah koma")
+    parser.add_argument("--only", default="", help="Prefiks nama kasus, dipisah koma (mis. fit,predict)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Status keluar 1 jika ada regresi")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar kasus")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, sized) in CASES.items():
+            print(name if sized else f"{name} (tanpa ukuran)")
+        return
+
+    rows = [int(r) for r in args.rows.split(",")]
+    only = [p.strip() for p in args.only.split(",") if p.strip()]
+    env = environment()
+    print(f"Commit {env['commit'] or '-'}, Python {env['python']}, {env['cpu_count']} core, baris {rows}")
+    results, targets = run_suite(rows, only, args.repeat)
+
+    reference, ref_path = load_reference(args.results_dir)
+    regressions = 0
+    if reference is None:
+        print("Belum ada baseline untuk dibandingkan.")
+    else:
+        ref_env = {k: v for k, v in reference["environment"].items() if k != "commit"}
+        if ref_env != {k: v for k, v in env.items() if k != "commit"}:
+            print("⚠️  Lingkungan berbeda dari baseline; perbandingan bisa tidak sebanding.")
+        table = compare(results, reference["results"], args.tolerance)
+        suspects = table["kasus"][table["status"] == "REGRESI"].tolist() if len(table) else []
+        if suspects:
+            confirm(suspects, results, targets, args.repeat)
+            table = compare(results, reference["results"], args.tolerance)
+        if len(table):
+            print(f"Dibandingkan dengan {os.path.basename(ref_path)} (commit {reference['environment'].get('commit') or '-'}):")
+            print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+            regressions = int((table["status"] == "REGRESI").sum())
+            print(f"{regressions} regresi (toleransi {args.tolerance:.0%}, lantai noise {NOISE_FLOOR_MS} ms)")
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    run = {"created_at": datetime.now().isoformat(timespec="seconds"), "environment": env,
+           "rows": rows, "results": results}
+    path = os.path.join(args.results_dir, f"run-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(run, fh, indent=2)
+    print(f"Hasil disimpan: {path}")
+
+    if args.update_baseline:
+        with open(os.path.join(args.results_dir, BASELINE_FILE), "w", encoding="utf-8") as fh:
+            json.dump(run, fh, indent=2)
+        print("Baseline diperbarui.")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
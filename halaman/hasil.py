@@ -1,6 +1,6 @@
 import streamlit as st
 import matplotlib.pyplot as plt
-import geopandas as gpd
+from src_model import choropleth, diagnostics, session_store
 
 def show():
     st.markdown("""
@@ -37,6 +37,7 @@ def show():
         st.warning("⚠️ Jalankan pengujian terlebih dahulu.")
         return
 
+    trace = diagnostics.start("hasil")
     hasil = st.session_state["hasil_keseluruhan"].strip().lower()
     params = st.session_state.get("selected_params", {})
 
@@ -72,6 +73,11 @@ def show():
                 <p><span class="param-label">Gamma:</span> 
                    <span class="param-value">{gamma_val}</span></p>
                 """
+                if "n_components" in params:
+                    html_gamma += f"""
+                <p><span class="param-label">Komponen Nystroem:</span> 
+                   <span class="param-value">{params["n_components"]}</span></p>
+                """
 
             st.markdown(f"""
                 <div class="param-card">
@@ -100,22 +106,32 @@ def show():
 
     with col2:
         # === Tabs untuk Peta dan Grafik Polutan ===
-        tab1, tab2 = st.tabs(["🗺️ Peta Kualitas Udara", "📊 Grafik Polutan"])
-
-        with tab1:
+        runtun = st.session_state.get("hasil_runtun")
+        labels = ["🗺️ Peta Kualitas Udara", "📊 Grafik Polutan"]
+        if runtun is not None:
+            labels.append("📈 Timeline T²")
+        tab1, tab2, *tab_timeline = st.tabs(labels)
+
+        with tab1, trace.stage("Peta"):
+            wilayah = st.session_state.get("hasil_wilayah")
             try:
-                jakarta = gpd.read_file("Data/Jakarta_Batas_Admin/dki_jakarta.shp")
-                warna = {"baik": "#226627", "kurang baik": "#ACCA03"}.get(hasil, "#B0B0B0")
-                fig, ax = plt.subplots(figsize=(3.5, 3.5))
-                jakarta.plot(ax=ax, color=warna, edgecolor="black", linewidth=1)
-                ax.set_title(f"Peta Kualitas Udara DKI Jakarta — {hasil.upper()}",
-                             fontsize=11, fontweight="bold")
-                ax.axis("off")
-                st.pyplot(fig)
+                if wilayah is not None:
+                    # Choropleth per wilayah dari upload titik; PNG dibuat sekali saat klasifikasi
+                    summary = wilayah["summary"]
+                    st.image(wilayah["png"], width="stretch")
+                    st.caption(
+                        f"{summary['inside']:,} dari {summary['rows']:,} titik masuk wilayah "
+                        f"({summary['outside']:,} di luar batas, {summary['rows'] - summary['clean']:,} tidak valid) · "
+                        f"join spasial {summary['join_seconds']:.2f} detik"
+                    )
+                    st.dataframe(wilayah["table"], width="stretch", hide_index=True)
+                else:
+                    # Geometri dan PNG per kategori di-cache per proses, tidak digambar ulang tiap rerun
+                    st.image(choropleth.render_map_png(hasil), width="stretch")
             except Exception as e:
                 st.error(f"Gagal menampilkan peta: {e}")
 
-        with tab2:
+        with tab2, trace.stage("Grafik T²"):
             if "t2_user" in st.session_state and "t2_threshold" in st.session_state:
                 t2_user = st.session_state["t2_user"]
                 t2_thr = st.session_state["t2_threshold"]
@@ -138,18 +154,36 @@ def show():
                 ax.legend(loc="upper right", frameon=False)
 
                 st.pyplot(fig)
+                plt.close(fig)
 
             else:
                 st.info("Nilai T² belum dihitung pada proses pengujian.")
 
+        if runtun is not None:
+            with tab_timeline[0], trace.stage("Timeline T²"):
+                # Timeline T² jendela geser; PNG dibuat sekali saat perhitungan
+                summary = runtun["summary"]
+                st.image(runtun["png"], width="stretch")
+                st.caption(
+                    f"{summary['days']:,} hari ({summary['observations']:,} observasi), jendela {summary['window_days']} hari, "
+                    f"{summary['scored_days']:,} hari dinilai · {summary['seconds']:.2f} detik"
+                )
+                st.dataframe(runtun["table"], width="stretch", hide_index=True)
+
+    diagnostics.finish(trace)
+    diagnostics.show_panel()
+
     st.markdown("<hr>", unsafe_allow_html=True)
     if st.button("🔙 Kembali ke Pengujian"):
         # Hapus session_state yang terkait hasil & pengujian
-        for key in ["hasil_keseluruhan", "polutan_input", "selected_params", 
+        for key in ["hasil_keseluruhan", "hasil_wilayah", "hasil_runtun", "bulk_result", "polutan_input", "selected_params", 
                     "selected_model", "kernel_choice", "show_model_selection",
                     "scaler", "feature_cols"]:
             if key in st.session_state:
                 del st.session_state[key]
+        artifacts = session_store.session_artifacts()
+        artifacts.pop("selected_model", None)
+        artifacts.pop("bulk_file", None)  # File CSV hasil prediksi massal ikut dihapus
 
         # Kembali ke halaman pelatihan & pengujian
         st.session_state.page = "📊 Pelatihan & Pengujian"
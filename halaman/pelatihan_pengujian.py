@@ -1,8 +1,9 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-import numpy as np
 from io import BytesIO
-from src_model import pipeline_training
+from src_model import diagnostics, ingest, jobs, model_store, pipeline_training, prediction, result_cache, search, session_store, training, upload_cache, validation
 
 def show():
     # === Styling ===
@@ -46,42 +47,45 @@ def show():
         )
     download_template()
 
-    uploaded_file = st.file_uploader("📤 Upload dataset Anda di sini:", type=["csv", "xlsx"])
+    uploaded_file = st.file_uploader("📤 Upload dataset Anda di sini:", type=ingest.UPLOAD_TYPES)
     if uploaded_file is None:
         st.info("Silakan upload dataset terlebih dahulu untuk memulai pelatihan.")
+        bundle = st.session_state.get("loaded_bundle")
+        if bundle is not None and not st.session_state.get("show_model_selection", False):
+            show_saved_model(bundle)
         return
 
-    df = pd.read_excel(uploaded_file) if uploaded_file.name.endswith(".xlsx") else pd.read_csv(uploaded_file)
-
-    # === Validasi Dataset ===
-    required_cols = {"so2_satelit", "co_satelit", "o3_satelit", "no2_satelit"}
-
-    # 1. Cek kolom wajib
-    if not required_cols.issubset(df.columns):
-        st.error(f"Dataset tidak valid! Kolom wajib: {required_cols}")
-        return
-
-    # 2. Cek missing values
-    if df[list(required_cols)].isnull().any().any():
-        st.error("Dataset mengandung missing value. Harap bersihkan terlebih dahulu sebelum training.")
-        return
-    
-    if "kategori_multivariat" in df.columns:
-        if df["kategori_multivariat"].notnull().any() and df["kategori_multivariat"].astype(str).str.strip().ne("").any():
-            st.error("Kolom 'kategori_multivariat' harus dikosongkan sebelum training.")
+    # Rerun Streamlit (ubah C, gamma, kernel, ...) tidak mem-parse ulang file:
+    # matriks fitur tervalidasi di-cache berdasarkan hash isi upload dan dibaca via memory-map
+    upload_store = upload_cache.get_default_cache()
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id is not None and st.session_state.get("upload_file_id") == file_id:
+        upload_key = st.session_state.upload_key
+    else:
+        upload_key = upload_cache.content_key(uploaded_file)
+        st.session_state.upload_file_id = file_id
+        st.session_state.upload_key = upload_key
+
+    X_upload, parse_info = upload_store.get(upload_key)
+    from_cache = X_upload is not None
+    if not from_cache:
+        data, parse_info = parse_and_validate(uploaded_file)
+        if data is None:
             return
+        X_upload, parse_info = upload_store.put(upload_key, data.X, parse_info)
 
-    # 3. Cek tipe data numerik
-    if not all(np.issubdtype(df[col].dtype, np.number) for col in list(required_cols)):
-        st.error("Dataset harus berisi nilai numerik untuk semua parameter polutan.")
-        return
-
-    # 4. Cek dataset kosong
-    if df.empty or len(df) < 10:
-        st.error("Dataset terlalu sedikit. Minimal 10 baris data untuk melakukan training.")
-        return
+    # Matriks yang di-cache sudah bersih (baris bernilai 0 / tak hingga dibuang)
+    data = validation.ValidatedData(X_upload, validation.ValidationReport.from_dict(parse_info["validasi"]))
+    cache_note = " (dari cache upload)" if from_cache else ""
+    st.caption(
+        f"Format {parse_info['format'].upper()}: {parse_info['rows']:,} baris diparse dalam "
+        f"{parse_info['seconds']:.2f} detik, puncak memori ±{parse_info['peak_bytes'] / 1024 ** 2:.1f} MB{cache_note}"
+    )
 
-    st.dataframe(df.head(10), width="stretch")
+    if data.report.n_rejected:
+        rejected = ", ".join(f"{reason}: {n}" for reason, n in data.report.counts.items() if n)
+        st.caption(f"{data.report.n_rejected:,} baris akan dihapus saat cleansing ({rejected}).")
+    st.dataframe(data.to_frame().head(10), width="stretch")
 
     # === Hyperparameter Inputs ===
     st.markdown("### ⚙️ Hyperparameter SVM")
@@ -90,31 +94,148 @@ def show():
         C_val = st.number_input("Nilai Regularisasi (C)", min_value=0.01, max_value=1000.0, value=1.0, step=0.1)
     with col2:
         gamma_val = st.number_input("Nilai Gamma (RBF Kernel)", min_value=0.0001, max_value=10.0, value=0.1, step=0.01)
+    rbf_approx = st.checkbox(
+        "Gunakan RBF aproksimasi (Nystroem) untuk dataset besar",
+        value=False,
+        help="Fitur RBF didekati dengan Nystroem lalu dilatih dengan classifier linear."
+    )
+    rbf_components = None
+    if rbf_approx:
+        rbf_components = int(st.number_input(
+            "Jumlah Komponen Aproksimasi", min_value=10, max_value=5000, value=300, step=10
+        ))
+    defer_refit = st.checkbox(
+        "Tunda pelatihan ulang data penuh sampai kernel dipilih",
+        value=False,
+        help="Model final 100% data hanya dilatih untuk kernel yang dipilih pada bagian Pemilihan Model."
+    )
+    low_memory = st.checkbox(
+        "Mode hemat memori (float32)",
+        value=False,
+        help="Fitur disimpan sebagai float32, label sebagai kategori, dan model dilatih bergantian "
+             "dengan satu buffer data bersama. Cocok untuk dataset besar."
+    )
+
+    # === Pencarian Hyperparameter ===
+    with st.expander("🔎 Pencarian Hyperparameter Otomatis (Successive Halving)"):
+        st.markdown(
+            "Semua kombinasi C × Gamma × Kernel dievaluasi dengan stratified cross-validation "
+            "secara paralel; kombinasi yang buruk dieliminasi lebih awal."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            C_grid_text = st.text_input("Grid C", value="0.1, 1, 10, 100")
+        with col2:
+            gamma_grid_text = st.text_input("Grid Gamma", value="0.001, 0.01, 0.1, 1")
+        col1, col2 = st.columns(2)
+        with col1:
+            kernels = st.multiselect("Kernel", ["Linear", "RBF"], default=["Linear", "RBF"])
+        with col2:
+            cv_folds = int(st.number_input("Jumlah Fold CV", min_value=2, max_value=10, value=5, step=1))
+        run_search_clicked = st.button("🔎 Cari & Latih dengan Hyperparameter Terbaik")
+
+        search_grid = None
+        if run_search_clicked:
+            try:
+                search_grid = {
+                    "C": search.parse_grid(C_grid_text),
+                    "gamma": search.parse_grid(gamma_grid_text),
+                    "kernels": [k.lower() for k in kernels],
+                    "cv": cv_folds,
+                }
+                # Grid divalidasi sebelum job dikirim
+                search.build_param_grid(search_grid["C"], search_grid["gamma"], search_grid["kernels"])
+            except ValueError as e:
+                st.error(f"Pencarian hyperparameter gagal: {e}")
+                run_search_clicked = False
+
+        if "search_summary" in st.session_state:
+            best = st.session_state.search_best
+            st.dataframe(st.session_state.search_summary, width="stretch")
+            gamma_info = f", Gamma = {best['gamma']}" if best["gamma"] is not None else ""
+            st.info(f"Konfigurasi terbaik: Kernel {best['kernel'].upper()}, C = {best['C']}{gamma_info}")
 
     # === Jalankan Training ===
-    if st.button("🚀 Jalankan Pelatihan Model"):
-        with st.spinner("Sedang melakukan cleansing, labeling, dan training model..."):
-            cleaned_df, results, trained_models = pipeline_training.run_training(df, C_val, gamma_val)
-
-        # Simpan hasil training di session_state
-        st.session_state.cleaned_df = cleaned_df
+    train_clicked = st.button("🚀 Jalankan Pelatihan Model")
+    kernel_default = "linear"
+    if run_search_clicked:
+        # Pencarian berjalan di job training yang sama; konfigurasi terbaik langsung dilatih
+        # dan dipilih di bagian Pemilihan Model
+        train_clicked = True
+
+    if train_clicked:
+        # Training dijalankan job latar belakang (antrian bersama semua sesi); halaman tidak membeku
+        config = pipeline_training.make_config(
+            C_val, gamma_val, defer_refit, rbf_components=rbf_components, low_memory=low_memory
+        )
+        try:
+            pipeline_training.submit_training(data, config, meta={
+                "kernel": kernel_default, "C": C_val, "gamma": gamma_val, "rbf_components": rbf_components,
+            }, search_grid=search_grid)
+        except jobs.JobError as e:
+            st.error(str(e))
+
+    bundle, job_meta = pipeline_training.poll_training()
+    if bundle is not None:
+        if "search_best" in job_meta:
+            st.session_state.search_summary = job_meta["search_summary"]
+            st.session_state.search_best = best = job_meta["search_best"]
+            gamma_info = f", Gamma = {best['gamma']}" if best["gamma"] is not None else ""
+            st.info(f"Konfigurasi terbaik: Kernel {best['kernel'].upper()}, C = {best['C']}{gamma_info}")
+        results, trained_models = pipeline_training.finish_training(bundle, job_meta["trace"])
+        kernel_default = job_meta["kernel"]
+
+        # Simpan hasil training: objek besar di store artefak sesi (dengan batas memori),
+        # sisanya di session_state
+        artifacts = session_store.session_artifacts()
         st.session_state.training_results = results
-        st.session_state.trained_models = trained_models
         st.session_state.show_model_selection = True
+        st.session_state.trained_params = {"C": job_meta["C"], "gamma": job_meta["gamma"]}
 
-        # Inisialisasi default model Linear
-        st.session_state.kernel_choice = "Linear"
-        st.session_state.selected_model = trained_models.get("linear_final")
+        # Inisialisasi default model (Linear, atau kernel terbaik hasil pencarian)
+        st.session_state.kernel_choice = training.KERNEL_NAMES[kernel_default]
+        artifacts["selected_model"] = training.ensure_final_model(trained_models, kernel_default)
+        artifacts["trained_models"] = trained_models
         st.session_state.scaler = trained_models.get("scaler")
         st.session_state.feature_cols = trained_models.get("feature_cols")
-        st.session_state.selected_params = {"kernel": "linear", "C": C_val, "gamma": gamma_val}
+        st.session_state.selected_params = {"kernel": kernel_default, "C": job_meta["C"], "gamma": job_meta["gamma"]}
+        st.session_state.rbf_components = job_meta["rbf_components"]
 
         st.success("✅ Pelatihan selesai! Silakan pilih model di bawah.")
 
+    with st.expander("🧠 Memori Sesi"):
+        mem = session_store.session_artifacts().snapshot()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Sesi Ini", f"{mem['session_bytes'] / 1024 ** 2:.1f} MB")
+        col2.metric("Semua Sesi", f"{mem['global_bytes'] / 1024 ** 2:.1f} MB")
+        col3.metric("Eviksi", mem["evictions"])
+        col4.metric("Dedup", mem["dedup_hits"])
+        st.caption(
+            f"Batas per sesi: {mem['session_budget'] / 1024 ** 2:.0f} MB · "
+            f"Batas global: {mem['global_budget'] / 1024 ** 2:.0f} MB · "
+            f"{mem['sessions']} sesi aktif · Hemat dedup: {mem['dedup_bytes'] / 1024 ** 2:.1f} MB"
+        )
+
+    with st.expander("📦 Statistik Cache Training"):
+        cache_stats = result_cache.get_default_cache().snapshot()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Hit Memori", cache_stats["memory_hits"])
+        col2.metric("Hit Disk", cache_stats["disk_hits"])
+        col3.metric("Miss", cache_stats["misses"])
+        col4.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        st.caption(
+            f"Entri di memori: {cache_stats['memory_items']} ({cache_stats['memory_bytes'] / 1024 ** 2:.1f} MB) · "
+            f"Eviksi memori: {cache_stats['memory_evictions']} · Eviksi disk: {cache_stats['disk_evictions']}"
+        )
+
+    diagnostics.show_panel()
+
     # === Bagian Pemilihan Model ===
     if st.session_state.get("show_model_selection", False):
         results = st.session_state.get("training_results")
-        trained = st.session_state.get("trained_models")
+        artifacts = session_store.session_artifacts()
+        trained = artifacts.get("trained_models")
+        trained_params = st.session_state.get("trained_params", {"C": C_val, "gamma": gamma_val})
 
         if results and trained:
             st.markdown("<hr><h2>✅ Pemilihan Model</h2>", unsafe_allow_html=True)
@@ -122,10 +243,10 @@ def show():
             # Pastikan ada key default kernel_choice
             if "kernel_choice" not in st.session_state:
                 st.session_state.kernel_choice = "Linear"
-                st.session_state.selected_model = trained_models.get("linear_final")
+                artifacts["selected_model"] = training.ensure_final_model(trained, "linear")
                 st.session_state.scaler = trained.get("scaler")
                 st.session_state.feature_cols = trained.get("feature_cols")
-                st.session_state.selected_params = {"kernel": "linear", "C": C_val, "gamma": gamma_val}
+                st.session_state.selected_params = {"kernel": "linear", **trained_params}
 
             # Radio button kernel
             kernel_choice = st.radio(
@@ -136,14 +257,18 @@ def show():
             )
 
             if st.session_state.kernel_choice == "Linear":
-                st.session_state.selected_model = trained.get("linear_final")
+                artifacts["selected_model"] = training.ensure_final_model(trained, "linear")
             else:
-                st.session_state.selected_model = trained.get("rbf_final")
+                artifacts["selected_model"] = training.ensure_final_model(trained, "rbf")
+            # Refit tertunda mengubah isi dict model; akuntansi byte di store diperbarui
+            artifacts["trained_models"] = trained
             st.session_state.selected_params = {
                 "kernel": kernel_choice.lower(),
-                "C": C_val,
-                "gamma": gamma_val
+                "C": trained_params["C"],
+                "gamma": trained_params["gamma"]
             }
+            if kernel_choice == "RBF" and st.session_state.get("rbf_components"):
+                st.session_state.selected_params["n_components"] = st.session_state.rbf_components
 
             params = st.session_state.selected_params
             c_display = params["C"]
@@ -156,6 +281,8 @@ def show():
             else:
                 # Jika RBF: Tampilkan C dan Gamma
                 param_html = f"<b>C:</b> {c_display} &nbsp; | &nbsp; <b>Gamma:</b> {gamma_display}"
+                if "n_components" in params:
+                    param_html += f" &nbsp; | &nbsp; <b>Komponen Nystroem:</b> {params['n_components']}"
 
             # Tampilkan info model dan metrik
             col1, col2 = st.columns([1.2, 2])
@@ -174,17 +301,121 @@ def show():
                     if k != "Confusion Matrix":
                         st.write(f"**{k}:** {v:.4f}")
 
+            with st.expander("💾 Simpan Model Terpilih"):
+                model_name = st.text_input("Nama model", value=model_store.DEFAULT_MODEL_NAME)
+                if st.button("💾 Simpan Model"):
+                    model = artifacts.get("selected_model")
+                    if model is None:
+                        st.warning(EVICTED_MESSAGE)
+                    else:
+                        try:
+                            path = model_store.save_bundle(
+                                model,
+                                st.session_state.scaler,
+                                st.session_state["trained_t2"]["model"],
+                                st.session_state.feature_cols,
+                                st.session_state.selected_params,
+                                metrics,
+                                name=model_name.strip(),
+                            )
+                        except model_store.ModelStoreError as e:
+                            st.error(str(e))
+                        else:
+                            preload_default_bundle.clear()
+                            st.success(f"✅ Model disimpan di `{path}`")
+
             # Form uji
             st.markdown("<hr><h2>Pengujian Model</h2>", unsafe_allow_html=True)
             show_testing_form()
+        elif results:
+            st.warning(EVICTED_MESSAGE)
         else:
             st.warning("Hasil pelatihan belum tersedia. Jalankan pelatihan terlebih dahulu.")
 
-def compute_T2(x_row, mean_vec, cov_inv):
-    x = np.array(x_row, dtype=float)
-    return float((x - mean_vec) @ cov_inv @ (x - mean_vec).T)
+
+def parse_and_validate(uploaded_file):
+    # Hanya kolom polutan (+ kategori untuk validasi) yang di-parse, dengan dtype float tetap;
+    # validasi dan cleansing dilakukan sekaligus dalam satu lintasan atas buffer numerik
+    trace = diagnostics.start("upload", file=uploaded_file.name)
+    try:
+        with trace.stage("Parse upload"):
+            df, parse_info = ingest.read_upload_profiled(uploaded_file, columns=ingest.TRAINING_COLS)
+        with trace.stage("Validasi & cleansing"):
+            data = validation.validate_and_clean(df)
+    except ValueError as e:
+        st.error(str(e))
+        return None, None
+    finally:
+        diagnostics.finish(trace)
+    parse_info["validasi"] = data.report.to_dict()
+    return data, parse_info
+
+
+@st.cache_resource(show_spinner=False)
+def preload_default_bundle():
+    # Dimuat sekali per proses; array besar di-memmap dari folder model
+    return model_store.load_default_bundle()
+
+
+EVICTED_MESSAGE = (
+    "Model sudah dibuang dari memori sesi (batas memori server). "
+    "Latih ulang atau muat model tersimpan."
+)
+
+
+def use_model_bundle(bundle):
+    st.session_state["trained_t2"] = bundle.trained_t2
+    session_store.session_artifacts()["selected_model"] = bundle.model
+    st.session_state.scaler = bundle.scaler
+    st.session_state.feature_cols = bundle.feature_cols
+    st.session_state.selected_params = dict(bundle.params)
+    st.session_state.loaded_bundle = bundle
+
+
+def show_saved_model(bundle):
+    # Model tersimpan bisa langsung dipakai untuk pengujian tanpa training ulang
+    use_model_bundle(bundle)
+    meta = bundle.meta
+    params = bundle.params
+    param_html = f"<b>Kernel:</b> {params.get('kernel', '-').upper()} &nbsp; | &nbsp; <b>C:</b> {params.get('C')}"
+    if params.get("kernel") == "rbf":
+        param_html += f" &nbsp; | &nbsp; <b>Gamma:</b> {params.get('gamma')}"
+
+    st.markdown("<hr><h2>📦 Model Tersimpan</h2>", unsafe_allow_html=True)
+    col1, col2 = st.columns([1.2, 2])
+    with col1:
+        st.markdown(f"""
+            <div style="background-color:#f8f9fa; padding:12px; border-radius:10px; text-align:center; border:1px solid #dcdcdc;">
+                <b>{meta['name']}</b> v{meta['version']:03d} ({meta['created_at']})<br>
+                {param_html}
+            </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown("#### 📈 Hasil Evaluasi Model")
+        for k, v in bundle.metrics.items():
+            if k != "Confusion Matrix":
+                st.write(f"**{k}:** {v:.4f}")
+
+    st.markdown("<hr><h2>Pengujian Model</h2>", unsafe_allow_html=True)
+    show_testing_form()
+
 
 def show_testing_form():
+    tab_manual, tab_bulk, tab_district, tab_timeline = st.tabs(
+        ["✍️ Input Manual", "📁 Prediksi Massal (Upload File)", "🗺️ Per Wilayah (Titik Koordinat)",
+         "📈 Runtun Waktu (Bertanggal)"]
+    )
+    with tab_manual:
+        show_manual_form()
+    with tab_bulk:
+        show_bulk_form()
+    with tab_district:
+        show_district_form()
+    with tab_timeline:
+        show_timeline_form()
+
+
+def show_manual_form():
     with st.form("uji_form"):
         st.markdown("<p>Masukkan nilai polutan (mol/m²):</p>", unsafe_allow_html=True)
         col1, col2 = st.columns(2)
@@ -196,27 +427,213 @@ def show_testing_form():
         submit = st.form_submit_button("🔍 Prediksi")
 
     if submit:
+        model = session_store.session_artifacts().get("selected_model")
+        if model is None:
+            st.warning(EVICTED_MESSAGE)
+            return
+
         t2_param = st.session_state["trained_t2"]
+        trace = diagnostics.start("prediksi_manual")
 
-        mean_vec = t2_param["mean"]
-        cov_inv = t2_param["cov_inv"]
+        t2_model = t2_param["model"]
         t2_threshold = t2_param["UCL"]
 
         # Input user harus diurutkan sesuai feature_cols
         input_row = [so2, co, o3, no2]
-        t2_user = compute_T2(input_row, mean_vec, cov_inv)
+        with trace.stage("T² input"):
+            t2_user = float(t2_model.score(input_row)[0])
 
         st.session_state["t2_user"] = t2_user
         st.session_state["t2_threshold"] = t2_threshold
 
-        model = st.session_state.selected_model
         scaler = st.session_state.scaler
 
-        X = pd.DataFrame([[so2, co, o3, no2]], columns=st.session_state.feature_cols)
-        X_scaled = scaler.transform(X)
-        pred = model.predict(X_scaled)[0].strip().lower()
+        with trace.stage("Scaling & predict"):
+            X = pd.DataFrame([[so2, co, o3, no2]], columns=st.session_state.feature_cols)
+            X_scaled = scaler.transform(X)
+            pred = model.predict(X_scaled)[0].strip().lower()
+        diagnostics.finish(trace)
 
         st.session_state["hasil_keseluruhan"] = pred
+        st.session_state.pop("hasil_wilayah", None)
+        st.session_state.pop("hasil_runtun", None)
         st.session_state.page = "📊 Hasil"
         st.session_state["polutan_input"] = {"so2": so2, "co": co, "o3": o3, "no2": no2}
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+
+
+def show_bulk_form():
+    st.markdown(
+        "<p>Upload file berisi kolom so2_satelit, co_satelit, o3_satelit, no2_satelit. "
+        "Setiap baris akan diprediksi kategorinya beserta nilai T².</p>",
+        unsafe_allow_html=True
+    )
+    bulk_file = st.file_uploader("📤 Upload data untuk prediksi massal:", type=ingest.UPLOAD_TYPES, key="bulk_file")
+
+    if bulk_file is not None and st.button("🔍 Prediksi Semua Baris"):
+        model = session_store.session_artifacts().get("selected_model")
+        if model is None:
+            st.warning(EVICTED_MESSAGE)
+            return
+        trace = diagnostics.start("prediksi_massal", file=bulk_file.name)
+        try:
+            try:
+                with trace.stage("Parse upload"):
+                    bulk_df = ingest.read_upload(bulk_file, columns=st.session_state.feature_cols)
+                    X = prediction.to_feature_array(bulk_df, st.session_state.feature_cols)
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+            # Hasil ditulis per chunk ke file sementara yang didaftarkan di store artefak sesi:
+            # file dihapus saat diganti hasil baru, saat kembali dari halaman Hasil, atau saat sesi ditutup
+            artifacts = session_store.session_artifacts()
+            artifacts.pop("bulk_file", None)
+            st.session_state.pop("bulk_result", None)
+            progress_bar = st.progress(0.0, text="Memproses prediksi...")
+            with trace.stage("Scoring & tulis CSV"), \
+                    tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as fh:
+                output = session_store.TempFile(fh.name)
+                try:
+                    summary = prediction.write_scored_csv(
+                        X,
+                        model,
+                        st.session_state.scaler,
+                        st.session_state["trained_t2"]["model"],
+                        fh,
+                        feature_cols=st.session_state.feature_cols,
+                        progress=lambda frac: progress_bar.progress(frac, text=f"Memproses prediksi... {frac:.0%}"),
+                    )
+                except BaseException:
+                    output.remove()
+                    raise
+            progress_bar.empty()
+        finally:
+            # Trace juga disimpan untuk run yang gagal, supaya tahap yang error terlihat di panel
+            diagnostics.finish(trace)
+        artifacts["bulk_file"] = output
+        summary["file_name"] = f"prediksi_{os.path.splitext(bulk_file.name)[0]}.csv"
+        st.session_state.bulk_result = summary
+
+    result = st.session_state.get("bulk_result")
+    output = session_store.session_artifacts().get("bulk_file")
+    if result and output is not None and output.exists():
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Jumlah Baris", f"{result['rows']:,}")
+        col2.metric("Baik", f"{result['counts'].get('baik', 0):,}")
+        col3.metric("Kurang Baik", f"{result['counts'].get('kurang baik', 0):,}")
+        st.caption(f"Throughput: {result['rows_per_s']:,.0f} baris/detik ({result['seconds']:.2f} detik)")
+        # File baru dibaca saat tombol diklik, bukan di setiap rerun
+        st.download_button(
+            label="📥 Download Hasil Prediksi (CSV)",
+            data=output.read,
+            file_name=result["file_name"],
+            mime="text/csv"
+        )
+
+
+def show_district_form():
+    # geopandas/shapely hanya dimuat saat form wilayah dipakai, bukan setiap halaman training dibuka
+    from src_model import choropleth, spatial
+
+    st.markdown(
+        "<p>Upload titik/piksel observasi berisi kolom lat, lon dan keempat polutan. "
+        "Titik digabungkan ke wilayah administrasi, lalu setiap wilayah diklasifikasi dari rata-rata polutannya.</p>",
+        unsafe_allow_html=True
+    )
+    points_file = st.file_uploader("📤 Upload titik observasi:", type=ingest.UPLOAD_TYPES, key="district_points")
+    boundary_file = st.file_uploader(
+        "🗺️ Batas wilayah (opsional, GeoJSON/GeoPackage/shapefile .zip; default batas DKI Jakarta):",
+        type=spatial.BOUNDARY_TYPES,
+        key="district_boundary",
+    )
+
+    if points_file is not None and st.button("🔍 Klasifikasi per Wilayah"):
+        model = session_store.session_artifacts().get("selected_model")
+        if model is None:
+            st.warning(EVICTED_MESSAGE)
+            return
+        feature_cols = st.session_state.feature_cols
+        t2_param = st.session_state["trained_t2"]
+        trace = diagnostics.start("prediksi_wilayah", file=points_file.name)
+        try:
+            try:
+                with trace.stage("Batas wilayah"):
+                    index = spatial.load_districts(boundary_file.getvalue() if boundary_file is not None else None)
+                with trace.stage("Parse upload"):
+                    points_df = ingest.read_upload(points_file, columns=spatial.upload_columns(feature_cols))
+                with st.spinner("Menggabungkan titik ke wilayah dan mengklasifikasi..."), trace.stage("Join spasial & klasifikasi"):
+                    table, summary = spatial.classify_points(
+                        points_df, index, model, st.session_state.scaler, t2_param["model"], feature_cols
+                    )
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+            with trace.stage("Render peta wilayah"):
+                png = choropleth.render_districts_png(index, table[prediction.PRED_COL])
+        finally:
+            diagnostics.finish(trace)
+        st.session_state.pop("hasil_runtun", None)
+        st.session_state["hasil_wilayah"] = {
+            "table": table,
+            "summary": summary,
+            "png": png,
+        }
+        # Ringkasan keseluruhan (rata-rata semua titik) tetap dipakai banner dan grafik T² di halaman Hasil
+        means = summary["overall_means"]
+        st.session_state["hasil_keseluruhan"] = summary["overall_label"]
+        st.session_state["t2_user"] = summary["overall_t2"]
+        st.session_state["t2_threshold"] = t2_param["UCL"]
+        st.session_state["polutan_input"] = {c.split("_")[0]: means[c] for c in feature_cols}
+        st.session_state.page = "📊 Hasil"
+        st.rerun()
+
+
+def show_timeline_form():
+    from src_model import rolling
+
+    st.markdown(
+        "<p>Upload observasi bertanggal berisi kolom tanggal dan keempat polutan. Observasi dirata-rata per hari, "
+        "lalu T² setiap hari dihitung terhadap jendela geser hari-hari sebelumnya.</p>",
+        unsafe_allow_html=True
+    )
+    series_file = st.file_uploader("📤 Upload observasi bertanggal:", type=ingest.UPLOAD_TYPES, key="timeline_file")
+    window_days = st.slider("Panjang jendela (hari)", 7, 365, rolling.DEFAULT_WINDOW_DAYS)
+
+    if series_file is not None and st.button("📈 Hitung Timeline T²"):
+        feature_cols = st.session_state.feature_cols
+        alpha = st.session_state["trained_t2"]["model"].alpha
+        trace = diagnostics.start("prediksi_runtun", file=series_file.name, window_days=window_days)
+        try:
+            try:
+                with trace.stage("Parse upload"):
+                    series_df = ingest.read_upload(series_file, columns=rolling.upload_columns(feature_cols))
+                with st.spinner("Menghitung T² jendela geser..."), trace.stage("T² jendela geser"):
+                    table, summary = rolling.classify_timeline(series_df, window_days, alpha, feature_cols)
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+            scored = table[table[rolling.T2_COL].notna()]
+            if not len(scored):
+                st.error(f"Belum ada hari dengan baseline minimal {validation.MIN_ROWS} hari dalam jendela.")
+                return
+            with trace.stage("Render timeline"):
+                png = rolling.render_timeline_png(table)
+        finally:
+            diagnostics.finish(trace)
+        st.session_state.pop("hasil_wilayah", None)
+        st.session_state["hasil_runtun"] = {
+            "table": table,
+            "summary": summary,
+            "png": png,
+        }
+        # Banner dan grafik T² di halaman Hasil memakai hari terakhir yang dinilai
+        last = scored.iloc[-1]
+        st.session_state["hasil_keseluruhan"] = last[rolling.LABEL_COL]
+        st.session_state["t2_user"] = float(last[rolling.T2_COL])
+        st.session_state["t2_threshold"] = float(last[rolling.UCL_COL])
+        st.session_state["polutan_input"] = {c.split("_")[0]: float(last[c]) for c in feature_cols}
+        st.session_state.page = "📊 Hasil"
+        st.rerun()
@@ -0,0 +1,57 @@
+import functools
+import os
+from io import BytesIO
+
+import geopandas as gpd
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+
+BOUNDARY_PATH = os.path.join("Data", "Jakarta_Batas_Admin", "dki_jakarta.shp")
+# Toleransi penyederhanaan dalam satuan CRS (derajat, EPSG:4326); 0.0005° ≈ 55 m,
+# tidak terlihat pada ukuran peta di halaman Hasil
+SIMPLIFY_TOLERANCE = 0.0005
+CATEGORY_COLORS = {"baik": "#226627", "kurang baik": "#ACCA03"}
+DEFAULT_COLOR = "#B0B0B0"
+MAP_DPI = 150
+
+
+@functools.lru_cache(maxsize=4)
+def load_boundary(path=BOUNDARY_PATH, tolerance=SIMPLIFY_TOLERANCE):
+    # Dibaca dan disederhanakan sekali per proses; hanya kolom geometri yang disimpan
+    boundary = gpd.read_file(path, columns=[])
+    if tolerance:
+        boundary["geometry"] = boundary.geometry.simplify(tolerance, preserve_topology=True)
+    return boundary
+
+
+@functools.lru_cache(maxsize=16)
+def render_map_png(category, path=BOUNDARY_PATH, tolerance=SIMPLIFY_TOLERANCE):
+    # Hanya ada sedikit kemungkinan warna, jadi PNG per kategori di-memo; Figure dibuat tanpa
+    # pyplot sehingga tidak terdaftar di state global matplotlib dan langsung dibebaskan
+    fig = Figure(figsize=(3.5, 3.5))
+    ax = fig.subplots()
+    load_boundary(path, tolerance).plot(
+        ax=ax, color=CATEGORY_COLORS.get(category, DEFAULT_COLOR), edgecolor="black", linewidth=1
+    )
+    ax.set_title(f"Peta Kualitas Udara DKI Jakarta — {category.upper()}", fontsize=11, fontweight="bold")
+    ax.axis("off")
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=MAP_DPI, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_districts_png(index, categories):
+    # Choropleth per wilayah (spatial.DistrictIndex) sesuai kategori prediksi; wilayah tanpa titik abu-abu.
+    # Dipanggil sekali per hasil klasifikasi, PNG-nya disimpan di session_state
+    colors = [CATEGORY_COLORS.get(c, DEFAULT_COLOR) if isinstance(c, str) else DEFAULT_COLOR for c in categories]
+    fig = Figure(figsize=(5, 5))
+    ax = fig.subplots()
+    gpd.GeoSeries(index.geometries, crs=4326).plot(ax=ax, color=colors, edgecolor="black", linewidth=0.5)
+    handles = [Patch(facecolor=color, edgecolor="black", label=name.title()) for name, color in CATEGORY_COLORS.items()]
+    handles.append(Patch(facecolor=DEFAULT_COLOR, edgecolor="black", label="Tanpa Data"))
+    ax.legend(handles=handles, loc="upper center", bbox_to_anchor=(0.5, 0), ncol=len(handles), fontsize=7, frameon=False)
+    ax.set_title("Peta Kualitas Udara per Wilayah", fontsize=11, fontweight="bold")
+    ax.axis("off")
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=MAP_DPI, bbox_inches="tight")
+    return buf.getvalue()
@@ -0,0 +1,81 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+from src_model import tracing
+
+# Jumlah trace terakhir per sesi yang bisa dilihat di panel diagnostik
+MAX_SESSION_TRACES = 20
+
+
+def enabled():
+    return tracing.ENABLED or st.session_state.get("trace_enabled", False)
+
+
+def start(name, **meta):
+    # NULL_TRACE jika instrumentasi nonaktif, jadi pemanggil tidak perlu memeriksa
+    return tracing.start(name, enabled(), **meta)
+
+
+def finish(trace):
+    # Trace aktif ditulis ke file JSON (DEFAULT_TRACE_DIR) dan disimpan di sesi untuk panel
+    if not trace.enabled:
+        return None
+    data = trace.to_dict()
+    try:
+        data["path"] = trace.save()
+    except OSError as e:
+        data["path"] = None
+        st.warning(f"Trace gagal disimpan: {e}")
+    traces = st.session_state.setdefault("traces", [])
+    traces.append(data)
+    del traces[:-MAX_SESSION_TRACES]
+    return data["path"]
+
+
+def show_panel():
+    with st.expander("🩺 Diagnostik Performa"):
+        if tracing.ENABLED:
+            st.caption("Instrumentasi aktif untuk semua sesi (JAKAIR_TRACE=1).")
+        else:
+            st.session_state.trace_enabled = st.toggle(
+                "Rekam waktu & memori per tahap",
+                value=st.session_state.get("trace_enabled", False),
+                help="Waktu wall, waktu CPU dan puncak memori setiap tahap training, prediksi dan halaman "
+                     "Hasil dicatat dan disimpan sebagai file JSON.",
+            )
+
+        traces = st.session_state.get("traces", [])
+        if not traces:
+            st.caption("Belum ada trace di sesi ini.")
+            return
+        options = list(range(len(traces) - 1, -1, -1))
+        index = st.selectbox(
+            "Trace",
+            options,
+            format_func=lambda i: f"{traces[i]['created_at']} · {traces[i]['name']} · {traces[i]['total_s']:.2f} detik",
+        )
+        trace = traces[index]
+        df = tracing.stages_frame(trace)
+        table = pd.DataFrame({
+            "Tahap": [name if pd.isna(parent) else f"↳ {name}" for name, parent in zip(df["name"], df["parent"])],
+            "Wall (ms)": df["wall_s"] * 1000,
+            "CPU (ms)": df["cpu_s"] * 1000,
+            "CPU": df["cpu_scope"],
+            "Puncak Memori (MB)": df["peak_rss_bytes"] / 1024 ** 2,
+            "Error": df["error"],
+        })
+        st.dataframe(table, width="stretch", hide_index=True)
+        st.caption(
+            "CPU proses mencakup semua thread (termasuk sesi lain); CPU thread hanya thread fit itu. "
+            "Memori = kenaikan puncak RSS sejak awal tahap."
+        )
+        if trace.get("path"):
+            st.caption(f"File trace: `{trace['path']}` · ringkasan antar run: `python -m src_model.tracing`")
+        st.download_button(
+            "📥 Download Trace (JSON)",
+            data=json.dumps(trace, indent=2, default=str),
+            file_name=f"trace-{trace['name']}-{trace['id']}.json",
+            mime="application/json",
+        )
@@ -0,0 +1,94 @@
+import os
+from collections import OrderedDict
+
+
+class MemoryLRU:
+    """LRU di memori dengan batas jumlah entri dan/atau byte; pemanggil yang memegang lock."""
+
+    def __init__(self, max_items=None, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # key -> (nilai, ukuran byte)
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key][0]
+
+    def put(self, key, value, size=0):
+        # Jumlah entri lama yang dibuang. Entri yang sendirian melebihi max_bytes tidak disimpan
+        self.pop(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return 0
+        self._items[key] = (value, size)
+        self.nbytes += size
+        evicted = 0
+        while (self.max_items is not None and len(self._items) > self.max_items) or \
+                (self.max_bytes is not None and self.nbytes > self.max_bytes):
+            _, (_, old_size) = self._items.popitem(last=False)
+            self.nbytes -= old_size
+            evicted += 1
+        return evicted
+
+    def pop(self, key, default=None):
+        if key not in self._items:
+            return default
+        value, size = self._items.pop(key)
+        self.nbytes -= size
+        return value
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+
+def touch(path):
+    # mtime dipakai sebagai urutan LRU di disk
+    os.utime(path)
+
+
+def evict_disk(directory, ext, max_bytes, keep=None, companions=()):
+    # Hapus file <key>.<ext> dengan mtime terlama sampai total ukurannya <= max_bytes.
+    # File pendamping (<key>.<companion>) ikut dihapus; key `keep` (entri yang baru ditulis) tidak
+    # pernah dihapus. File yang masih di-memmap tetap valid sampai mapping dilepas (POSIX).
+    # Mengembalikan daftar key yang dihapus.
+    suffix = f".{ext}"
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, name[:-len(suffix)]))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, key in sorted(entries):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        try:
+            os.remove(os.path.join(directory, key + suffix))
+        except OSError:
+            continue
+        for companion in companions:
+            try:
+                os.remove(os.path.join(directory, f"{key}.{companion}"))
+            except OSError:
+                pass
+        total -= size
+        evicted.append(key)
+    return evicted
+
@@ -0,0 +1,156 @@
+import numpy as np
+from scipy.linalg import cholesky, solve_triangular, LinAlgError
+from scipy.stats import f
+
+LABEL_BAIK = "baik"
+LABEL_KURANG_BAIK = "kurang baik"
+
+# Batas condition number sebelum kovarians dianggap hampir singular
+MAX_CONDITION = 1e10
+
+
+def compute_ucl(n, p, alpha):
+    if n <= p:
+        return np.nan
+    return (p * (n - 1) / (n - p)) * f.ppf(1 - alpha, p, n - p)
+
+
+def compute_prediction_ucl(n, p, alpha):
+    # Batas untuk observasi baru yang tidak ikut membentuk mean/kovarians (fase II)
+    if n <= p:
+        return np.nan
+    return (p * (n + 1) * (n - 1) / (n * (n - p))) * f.ppf(1 - alpha, p, n - p)
+
+
+def oas_shrinkage(cov, n):
+    # Intensitas shrinkage Oracle Approximating Shrinkage (Chen et al., 2010)
+    # dihitung pada matriks korelasi supaya tidak bergantung pada skala polutan
+    p = cov.shape[0]
+    emp = cov * (n - 1) / n
+    alpha = np.mean(emp ** 2)
+    mu = np.trace(emp) / p
+    den = (n + 1) * (alpha - mu ** 2 / p)
+    if den <= 0:
+        return 1.0
+    return float(min((alpha + mu ** 2) / den, 1.0))
+
+
+def shrink_covariance(cov, n, shrinkage=None):
+    sd = np.sqrt(np.clip(np.diag(cov), 0, None))
+    # Kolom konstan diberi simpangan baku minimal agar korelasi tetap terdefinisi
+    floor = max(sd.max(), 1.0) * 1e-12
+    sd = np.where(sd > floor, sd, floor)
+    corr = cov / np.outer(sd, sd)
+    np.fill_diagonal(corr, 1.0)
+    if shrinkage is None:
+        shrinkage = oas_shrinkage(corr, n)
+    target = np.eye(cov.shape[0])
+    corr_shrunk = (1 - shrinkage) * corr + shrinkage * target
+    return corr_shrunk * np.outer(sd, sd), shrinkage
+
+
+class HotellingT2:
+    """Model Hotelling's T² dengan faktor Cholesky kovarians yang di-cache."""
+
+    def __init__(self, alpha=0.01, shrinkage="auto", chunk_size=262144):
+        # shrinkage: "auto" (OAS hanya jika kovarians hampir singular),
+        # None (tanpa shrinkage), atau float 0..1 (intensitas tetap)
+        self.alpha = alpha
+        self.shrinkage = shrinkage
+        self.chunk_size = chunk_size
+
+    def fit(self, X):
+        X = self._as_float(X)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        n, p = X.shape
+        # Mean dan kovarians diakumulasi per chunk dalam float64: tanpa salinan data terpusat
+        # penuh seperti np.cov, dan input float32 tidak di-upcast sekaligus
+        mean_vec = X.mean(axis=0, dtype=np.float64)
+        m2 = np.zeros((p, p))
+        for start in range(0, n, self.chunk_size):
+            Xc = X[start:start + self.chunk_size] - mean_vec
+            m2 += Xc.T @ Xc
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov_mat = m2 / (n - 1)
+        return self.fit_moments(mean_vec, cov_mat, n)
+
+    def fit_moments(self, mean_vec, cov_mat, n):
+        # Fit dari statistik cukup (mean, kovarians ddof=1, jumlah baris)
+        mean_vec = np.asarray(mean_vec, dtype=float)
+        cov_mat = np.asarray(cov_mat, dtype=float)
+        p = mean_vec.shape[0]
+        if n <= p:
+            raise ValueError("UCL tidak dapat dihitung karena n <= p.")
+
+        shrinkage_ = 0.0
+        if self.shrinkage == "auto":
+            chol = self._try_cholesky(cov_mat)
+            if chol is None:
+                cov_mat, shrinkage_ = shrink_covariance(cov_mat, n)
+                chol = cholesky(cov_mat, lower=True)
+        elif self.shrinkage is None:
+            chol = self._try_cholesky(cov_mat)
+            if chol is None:
+                raise LinAlgError("Matriks kovarians singular.")
+        else:
+            cov_mat, shrinkage_ = shrink_covariance(cov_mat, n, float(self.shrinkage))
+            chol = cholesky(cov_mat, lower=True)
+
+        self.mean_ = mean_vec
+        self.cov_ = cov_mat
+        self.chol_ = chol
+        self.shrinkage_ = shrinkage_
+        self.n_samples_ = int(n)
+        self.n_features_ = p
+        self.ucl_ = compute_ucl(n, p, self.alpha)
+        # L⁻¹ᵀ di-cache supaya skoring menjadi satu perkalian matriks per chunk
+        self._whiten = solve_triangular(chol, np.eye(p), lower=True).T
+        return self
+
+    @classmethod
+    def from_factor(cls, mean_vec, chol, ucl, n, alpha=0.01, shrinkage=0.0):
+        # Rekonstruksi model tersimpan tanpa menghitung ulang faktorisasi
+        model = cls(alpha=alpha)
+        model.mean_ = mean_vec
+        model.chol_ = chol
+        model.cov_ = chol @ chol.T
+        model.shrinkage_ = shrinkage
+        model.n_samples_ = int(n)
+        model.n_features_ = len(mean_vec)
+        model.ucl_ = ucl
+        model._whiten = solve_triangular(chol, np.eye(len(mean_vec)), lower=True).T
+        return model
+
+    @staticmethod
+    def _try_cholesky(cov_mat):
+        try:
+            chol = cholesky(cov_mat, lower=True)
+        except LinAlgError:
+            return None
+        d = np.diag(chol)
+        if d.min() <= 0 or (d.max() / d.min()) ** 2 > MAX_CONDITION:
+            return None
+        return chol
+
+    @staticmethod
+    def _as_float(X):
+        # float32 dipertahankan (di-upcast per chunk saat dikurangi mean float64)
+        X = np.asarray(X)
+        return X if X.dtype.kind == "f" else X.astype(float)
+
+    def score(self, X):
+        X = self._as_float(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty(X.shape[0], dtype=float)
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = start + self.chunk_size
+            Z = (X[start:stop] - self.mean_) @ self._whiten
+            out[start:stop] = np.einsum("ij,ij->i", Z, Z)
+        return out
+
+    def predict(self, X, t2_values=None):
+        if t2_values is None:
+            t2_values = self.score(X)
+        return np.where(t2_values > self.ucl_, LABEL_KURANG_BAIK, LABEL_BAIK)
@@ -0,0 +1,193 @@
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src_model.schema import FEATURE_COLS, LABEL_COL
+
+UPLOAD_TYPES = ["csv", "xlsx", "parquet", "arrow", "feather"]
+# Kolom yang dibaca dari upload training: 4 fitur + kolom kategori (untuk validasi kosong)
+TRAINING_COLS = list(FEATURE_COLS) + [LABEL_COL]
+
+
+def detect_format(name):
+    name = (name or "").lower()
+    if name.endswith(".xlsx"):
+        return "xlsx"
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    if name.endswith((".arrow", ".feather", ".ipc")):
+        return "arrow"
+    return "csv"
+
+
+def _select(names, columns):
+    # Pemetaan nama kanonik (lowercase, tanpa spasi) -> nama asli di file
+    if columns is None:
+        return {str(n).strip().lower(): n for n in names}
+    wanted = set(columns)
+    return {str(n).strip().lower(): n for n in names if str(n).strip().lower() in wanted}
+
+
+def _column_types(selected):
+    import pyarrow as pa
+
+    # Tipe eksplisit: float64 untuk fitur, string untuk label (tanpa inferensi tipe per blok)
+    types = {orig: pa.float64() for canon, orig in selected.items() if canon in FEATURE_COLS}
+    if LABEL_COL in selected:
+        types[selected[LABEL_COL]] = pa.string()
+    return types
+
+
+def _table_to_frame(table, selected):
+    df = table.select(list(selected.values())).to_pandas()
+    df.columns = list(selected.keys())
+    return df
+
+
+def _read_csv(file, columns):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    # Header dibaca dulu supaya hanya kolom yang dibutuhkan yang di-parse
+    header = pd.read_csv(file, nrows=0).columns
+    file.seek(0)
+    selected = _select(header, columns)
+    # Upload Streamlit berada di memori (BytesIO): dibaca zero-copy oleh pyarrow
+    source = pa.BufferReader(pa.py_buffer(file.getbuffer())) if hasattr(file, "getbuffer") else file
+    try:
+        # Tanpa thread: parser multi-thread mengalokasikan buffer blok per thread sekaligus
+        # sehingga puncak memori naik jauh tanpa percepatan berarti untuk ukuran upload
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(use_threads=False),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(selected.values()),
+                column_types=_column_types(selected),
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid as e:
+        # Nilai non-numerik pada kolom polutan
+        raise ValueError(f"Dataset harus berisi nilai numerik untuk semua parameter polutan. ({e})") from e
+    return _table_to_frame(table, selected)
+
+
+def _read_parquet(file, columns):
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file)
+    selected = _select(pf.schema_arrow.names, columns)
+    table = pf.read(columns=list(selected.values()))
+    df = _table_to_frame(table, selected)
+    return _pin_float(df)
+
+
+def _read_arrow(file, columns):
+    import pyarrow as pa
+
+    # Arrow IPC file (Feather v2) atau IPC stream
+    try:
+        table = pa.ipc.open_file(file).read_all()
+    except pa.ArrowInvalid:
+        file.seek(0)
+        table = pa.ipc.open_stream(file).read_all()
+    selected = _select(table.column_names, columns)
+    return _pin_float(_table_to_frame(table, selected))
+
+
+def _read_xlsx(file, columns):
+    from openpyxl import load_workbook
+
+    # Mode read-only: sheet di-stream baris per baris tanpa membangun seluruh workbook
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        selected = _select([h for h in header if h is not None], columns)
+        index = {canon: list(header).index(orig) for canon, orig in selected.items()}
+        data = {canon: [] for canon in selected}
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue
+            for canon, j in index.items():
+                data[canon].append(row[j] if j < len(row) else None)
+    finally:
+        wb.close()
+    return _pin_float(pd.DataFrame(data))
+
+
+def _pin_float(df):
+    for c in df.columns:
+        if c in FEATURE_COLS and df[c].dtype != np.float64:
+            converted = pd.to_numeric(df[c], errors="coerce")
+            # Nilai non-numerik dibiarkan (object) agar validasi tipe data tetap menolak
+            if converted.notna().sum() == df[c].notna().sum():
+                df[c] = converted.astype(np.float64)
+    return df
+
+
+def read_upload(file, name=None, columns=None):
+    # Baca upload CSV/XLSX/Parquet/Arrow; columns=None membaca semua kolom.
+    # Nama kolom dikembalikan dalam bentuk kanonik (lowercase, tanpa spasi)
+    fmt = detect_format(name or getattr(file, "name", ""))
+    if isinstance(file, (bytes, bytearray)):
+        file = io.BytesIO(file)
+    if fmt == "xlsx":
+        return _read_xlsx(file, columns)
+    if fmt == "parquet":
+        return _read_parquet(file, columns)
+    if fmt == "arrow":
+        return _read_arrow(file, columns)
+    return _read_csv(file, columns)
+
+
+class PeakRSS:
+    """Sampling RSS proses di thread terpisah untuk memperkirakan puncak memori."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def current():
+        # Linux: /proc/self/statm (halaman); platform lain: ru_maxrss sebagai pendekatan
+        try:
+            with open("/proc/self/statm") as fh:
+                return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            import resource
+
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.current() - self.baseline)
+
+    def __enter__(self):
+        self.baseline = self.current()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current() - self.baseline)
+
+
+def read_upload_profiled(file, name=None, columns=None):
+    # Sama dengan read_upload, ditambah waktu parse dan kenaikan puncak RSS
+    start = time.perf_counter()
+    with PeakRSS() as mem:
+        df = read_upload(file, name, columns)
+    return df, {
+        "format": detect_format(name or getattr(file, "name", "")),
+        "seconds": time.perf_counter() - start,
+        "peak_bytes": mem.peak_bytes,
+        "rows": len(df),
+    }
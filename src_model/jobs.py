@@ -0,0 +1,236 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from src_model import singleton
+
+# Fit SVM independen dalam satu job training (model split + model final untuk dua kernel)
+FITS_PER_JOB = 4
+# Jumlah job yang berjalan bersamaan; core dibagi rata antar worker sehingga tiap job punya
+# thread untuk semua fit-nya sekaligus (selesai mendekati waktu fit paling lambat)
+DEFAULT_WORKERS = int(os.environ.get("JAKAIR_JOB_WORKERS", max(1, (os.cpu_count() or 1) // FITS_PER_JOB)))
+# Batas job yang belum selesai per sesi (antri + berjalan)
+MAX_PENDING_PER_SESSION = 3
+
+QUEUED = "antri"
+RUNNING = "berjalan"
+DONE = "selesai"
+FAILED = "gagal"
+CANCELLED = "dibatalkan"
+FINISHED = {DONE, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobError(ValueError):
+    pass
+
+
+class Job:
+    """Satu pekerjaan latar belakang milik satu sesi, dengan progres per tahap dan pembatalan kooperatif."""
+
+    def __init__(self, job_id, session_id, fn, args, kwargs, meta, threads):
+        self.id = job_id
+        self.session_id = session_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.meta = meta or {}
+        self.threads = threads  # Batas thread yang boleh dipakai fungsi job
+        self.state = QUEUED
+        self.stage = "Menunggu antrian"
+        self.progress = 0.0
+        self.log = []  # (tahap, detik sejak mulai)
+        self.result = None
+        self.error = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    def report(self, stage, fraction=None):
+        # Dipanggil fungsi job di batas tahap; permintaan batal diperiksa di sini
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.stage = stage
+        if fraction is not None:
+            self.progress = min(max(self.progress, fraction), 1.0)
+        self.log.append((stage, time.monotonic() - self.started_at))
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.state in FINISHED
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def waited(self):
+        return (self.started_at or time.monotonic()) - self.submitted_at
+
+
+class JobRunner:
+    """Pool worker terbatas; antrian per sesi dilayani bergiliran (round-robin) supaya adil antar sesi."""
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=MAX_PENDING_PER_SESSION, threads_per_job=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.threads_per_job = threads_per_job or max(1, (os.cpu_count() or 1) // workers)
+        self._queues = OrderedDict()  # session_id -> deque job antri; urutan = giliran berikutnya
+        self._jobs = {}  # job_id -> Job (antri, berjalan, atau selesai tetapi belum diambil)
+        # job_id -> Job yang sudah di-discard tetapi masih dijalankan worker (fit libsvm tidak bisa
+        # diinterupsi); tetap dihitung dalam batas per sesi sampai worker selesai
+        self._abandoned = {}
+        self._threads = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self.stats = {"submitted": 0, DONE: 0, FAILED: 0, CANCELLED: 0}
+
+    def submit(self, session_id, fn, *args, meta=None, **kwargs):
+        # fn(job, *args, **kwargs) dijalankan di thread worker; hasilnya disimpan di job.result
+        with self._cond:
+            pending = sum(
+                1 for j in itertools.chain(self._jobs.values(), self._abandoned.values())
+                if j.session_id == session_id and not j.finished
+            )
+            if pending >= self.max_pending:
+                raise JobError(f"Maksimal {self.max_pending} pekerjaan aktif per sesi. Tunggu atau batalkan yang berjalan.")
+            job = Job(f"job-{next(self._ids)}", session_id, fn, args, kwargs, meta, self.threads_per_job)
+            self._jobs[job.id] = job
+            self._queues.setdefault(session_id, deque()).append(job)
+            self.stats["submitted"] += 1
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"jakair-job-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return job
+
+    def _next_job(self):
+        # Sesi terdepan mendapat satu job, lalu pindah ke belakang giliran
+        if not self._queues:
+            return None
+        session_id, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(session_id)
+        else:
+            del self._queues[session_id]
+        return job
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                job.state = RUNNING
+                job.started_at = time.monotonic()
+                job.stage = "Mulai"
+            try:
+                job.result = job.fn(job, *job.args, **job.kwargs)
+            except JobCancelled:
+                self._finish(job, CANCELLED)
+            except Exception as e:
+                job.error = e
+                self._finish(job, FAILED)
+            else:
+                job.progress = 1.0
+                job.stage = "Selesai"
+                self._finish(job, DONE)
+
+    def _finish(self, job, state):
+        with self._cond:
+            job.finished_at = time.monotonic()
+            job.state = state
+            # Argumen (data upload) tidak perlu ditahan lagi
+            job.args, job.kwargs = (), {}
+            self.stats[state] += 1
+            if self._abandoned.pop(job.id, None) is not None:
+                job.result = job.error = None
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        # Job antri langsung dibatalkan; job berjalan berhenti di batas tahap berikutnya
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return
+            job._cancel.set()
+            queue = self._queues.get(job.session_id)
+            if job.state == QUEUED and queue is not None:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.session_id]
+                job.started_at = job.finished_at = time.monotonic()
+                job.state = CANCELLED
+                job.args, job.kwargs = (), {}
+                self.stats[CANCELLED] += 1
+
+    def collect(self, job_id):
+        # Ambil job yang sudah selesai dan lepaskan dari runner (hasilnya tidak ditahan lagi)
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+            return job
+
+    def discard(self, job_id):
+        # Batalkan dan lupakan job; job yang masih berjalan disimpan sebagai "abandoned" sampai
+        # worker selesai (hasilnya dibuang), supaya tetap dihitung dalam batas per sesi
+        self.cancel(job_id)
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is not None and not job.finished:
+                self._abandoned[job_id] = job
+
+    def position(self, job_id):
+        # Jumlah job antri yang akan mulai lebih dulu, mengikuti giliran round-robin
+        with self._cond:
+            queues = [list(q) for q in self._queues.values()]
+        ahead = 0
+        for depth in range(max((len(q) for q in queues), default=0)):
+            for q in queues:
+                if depth < len(q):
+                    if q[depth].id == job_id:
+                        return ahead
+                    ahead += 1
+        return None
+
+    def prune(self, is_active):
+        # Job milik sesi yang sudah ditutup dibatalkan dan hasilnya dilepas
+        with self._cond:
+            stale = [j.id for j in self._jobs.values() if not is_active(j.session_id)]
+        for job_id in stale:
+            self.discard(job_id)
+
+    def snapshot(self):
+        with self._cond:
+            states = [j.state for j in itertools.chain(self._jobs.values(), self._abandoned.values())]
+            stats = dict(self.stats)
+            stats["queued"] = states.count(QUEUED)
+            stats["running"] = states.count(RUNNING)
+            stats["abandoned"] = len(self._abandoned)
+            stats["sessions_waiting"] = len(self._queues)
+            stats["workers"] = self.workers
+            stats["threads_per_job"] = self.threads_per_job
+        return stats
+
+
+# Satu runner per proses, dipakai bersama oleh semua sesi Streamlit
+get_default_runner = singleton.lazy_default(JobRunner)
@@ -0,0 +1,85 @@
+import numpy as np
+
+METRIC_NAMES = ["Accuracy", "Precision", "Recall", "F1 Score"]
+DEFAULT_BOOTSTRAP = 2000
+DEFAULT_LEVEL = 0.95
+
+
+def encode(arrays):
+    # Label (string/kategori) -> kode integer dengan urutan label terurut seperti sklearn
+    arrays = [np.asarray(a) for a in arrays]
+    labels = np.unique(np.concatenate(arrays))
+    return labels, [np.searchsorted(labels, a) for a in arrays]
+
+
+def confusion_counts(y_true, y_pred):
+    # Satu lintasan bincount atas pasangan (aktual, prediksi)
+    labels, (t, p) = encode([y_true, y_pred])
+    k = len(labels)
+    return np.bincount(t * k + p, minlength=k * k).reshape(k, k), labels
+
+
+def scores_from_confusion(cm):
+    # Metrik weighted (setara sklearn average="weighted", zero_division=0) dari confusion matrix
+    # berdimensi (..., k, k); dimensi depan berupa batch resample bootstrap
+    cm = np.asarray(cm, dtype=np.float64)
+    n = cm.sum(axis=(-2, -1))
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = support / n[..., None]
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(support + predicted > 0, 2 * tp / (support + predicted), 0.0)
+        return {
+            "Accuracy": tp.sum(axis=-1) / n,
+            "Precision": (weight * precision).sum(axis=-1),
+            "Recall": (weight * recall).sum(axis=-1),
+            "F1 Score": (weight * f1).sum(axis=-1),
+        }
+
+
+def compute_metrics(y_true, y_pred):
+    cm, _ = confusion_counts(y_true, y_pred)
+    metrics = {name: float(v) for name, v in scores_from_confusion(cm).items()}
+    metrics["Confusion Matrix"] = cm
+    return metrics
+
+
+def bootstrap_intervals(y_true, predictions, n_boot=DEFAULT_BOOTSTRAP, level=DEFAULT_LEVEL, random_state=42):
+    # Interval kepercayaan bootstrap (persentil) untuk metrik tiap model pada data uji yang sama.
+    # Resample baris uji hanya mengubah jumlah tiap kombinasi (aktual, prediksi model...), jadi satu
+    # resample = satu tarikan multinomial atas sel tabel gabungan; seluruh batch dihitung sekaligus.
+    # Resample berpasangan: selisih antar model memakai resample yang sama.
+    names = list(predictions)
+    labels, codes = encode([y_true, *(predictions[name] for name in names)])
+    k, m = len(labels), len(names)
+    joint = np.zeros(len(codes[0]), dtype=np.int64)
+    for c in codes:
+        joint = joint * k + c
+    counts = np.bincount(joint, minlength=k ** (m + 1))
+    n = counts.sum()
+
+    rng = np.random.default_rng(random_state)
+    samples = rng.multinomial(n, counts / n, size=n_boot).reshape((n_boot,) + (k,) * (m + 1))
+    q = [(1 - level) / 2 * 100, (1 + level) / 2 * 100]
+
+    scores = {}
+    for i, name in enumerate(names):
+        # Marginal (aktual, prediksi model i): jumlahkan sumbu model lain
+        other = tuple(2 + j for j in range(m) if j != i)
+        scores[name] = scores_from_confusion(samples.sum(axis=other) if other else samples)
+
+    def percentile(values):
+        lo, hi = np.percentile(values, q)
+        return float(lo), float(hi)
+
+    intervals = {name: {metric: percentile(s[metric]) for metric in METRIC_NAMES} for name, s in scores.items()}
+    if m == 2:
+        a, b = names
+        intervals[f"{b} - {a}"] = {
+            metric: percentile(scores[b][metric] - scores[a][metric]) for metric in METRIC_NAMES
+        }
+    intervals["_meta"] = {"n_boot": n_boot, "level": level, "n_test": int(n)}
+    return intervals
@@ -0,0 +1,181 @@
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+
+from src_model.hotelling import HotellingT2
+
+FORMAT_VERSION = 1
+DEFAULT_MODEL_DIR = os.environ.get("JAKAIR_MODEL_DIR", "models")
+DEFAULT_MODEL_NAME = "default"
+LATEST_FILE = "LATEST"
+# Nama model menjadi nama folder di root model: tanpa pemisah path, "..", atau string kosong
+MODEL_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+# Membandingkan-lalu-mengganti pointer LATEST antar thread (sesi) dalam satu proses
+_latest_lock = threading.Lock()
+
+
+class ModelStoreError(ValueError):
+    pass
+
+
+@dataclass
+class ModelBundle:
+    path: str
+    model: object
+    scaler: object
+    t2: HotellingT2
+    feature_cols: list
+    params: dict
+    metrics: dict = field(default_factory=dict)
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def trained_t2(self):
+        return {
+            "model": self.t2,
+            "mean": self.t2.mean_,
+            "UCL": self.t2.ucl_,
+            "feature_cols": self.feature_cols
+        }
+
+
+def _versions(name_dir):
+    if not os.path.isdir(name_dir):
+        return []
+    return sorted(int(m.group(1)) for d in os.listdir(name_dir) if (m := re.fullmatch(r"v(\d+)", d)))
+
+
+def _jsonable_metrics(metrics):
+    out = {}
+    for k, v in (metrics or {}).items():
+        out[k] = v.tolist() if isinstance(v, np.ndarray) else float(v)
+    return out
+
+
+def validate_name(name):
+    if not isinstance(name, str) or not MODEL_NAME_PATTERN.fullmatch(name):
+        raise ModelStoreError(
+            "Nama model hanya boleh berisi huruf, angka, garis bawah (_) dan tanda hubung (-), tidak boleh kosong."
+        )
+    return name
+
+
+def save_bundle(model, scaler, t2, feature_cols, params, metrics=None, name=DEFAULT_MODEL_NAME, root=DEFAULT_MODEL_DIR):
+    # Setiap penyimpanan membuat versi baru: <root>/<name>/v001, v002, ...
+    validate_name(name)
+    name_dir = os.path.join(root, name)
+    os.makedirs(name_dir, exist_ok=True)
+    versions = _versions(name_dir)
+    version = (versions[-1] + 1) if versions else 1
+    # Folder versi diklaim dengan os.mkdir (atomik): penyimpanan bersamaan dari sesi lain
+    # yang menghitung nomor yang sama mencoba nomor berikutnya
+    while True:
+        path = os.path.join(name_dir, f"v{version:03d}")
+        try:
+            os.mkdir(path)
+            break
+        except FileExistsError:
+            version += 1
+
+    # joblib tanpa kompresi supaya array (support vector, dll.) bisa di-memmap saat load
+    joblib.dump(model, os.path.join(path, "model.joblib"))
+    joblib.dump(scaler, os.path.join(path, "scaler.joblib"))
+    np.save(os.path.join(path, "t2_mean.npy"), np.asarray(t2.mean_))
+    np.save(os.path.join(path, "t2_chol.npy"), np.asarray(t2.chol_))
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "feature_cols": list(feature_cols),
+        "params": dict(params),
+        "metrics": _jsonable_metrics(metrics),
+        "t2": {
+            "UCL": float(t2.ucl_),
+            "alpha": float(t2.alpha),
+            "n_samples": int(t2.n_samples_),
+            "shrinkage": float(t2.shrinkage_),
+        },
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+
+    # Pointer versi terbaru ditulis atomik; penyimpanan yang selesai belakangan dengan nomor versi
+    # lebih kecil tidak menimpa pointer ke versi yang lebih baru
+    with _latest_lock:
+        if version > _latest_version(name_dir):
+            tmp = os.path.join(name_dir, f"{LATEST_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(f"v{version:03d}\n")
+            os.replace(tmp, os.path.join(name_dir, LATEST_FILE))
+    return path
+
+
+def _latest_version(name_dir):
+    try:
+        with open(os.path.join(name_dir, LATEST_FILE), encoding="utf-8") as fh:
+            return int(fh.read().strip().lstrip("v"))
+    except (OSError, ValueError):
+        return 0
+
+
+def resolve_path(name_or_path=DEFAULT_MODEL_NAME, root=DEFAULT_MODEL_DIR):
+    # Terima path versi langsung, folder nama model (pakai LATEST), atau nama model di root
+    path = name_or_path if os.path.isdir(name_or_path) else os.path.join(root, name_or_path)
+    if os.path.isfile(os.path.join(path, "meta.json")):
+        return path
+    latest = os.path.join(path, LATEST_FILE)
+    if os.path.isfile(latest):
+        with open(latest, encoding="utf-8") as fh:
+            return os.path.join(path, fh.read().strip())
+    versions = _versions(path)
+    if versions:
+        return os.path.join(path, f"v{versions[-1]:03d}")
+    raise FileNotFoundError(f"Model bundle tidak ditemukan: {name_or_path}")
+
+
+def load_bundle(name_or_path=DEFAULT_MODEL_NAME, root=DEFAULT_MODEL_DIR, mmap=True):
+    path = resolve_path(name_or_path, root)
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+        meta = json.load(fh)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Format model bundle tidak didukung: {meta.get('format_version')}")
+
+    mmap_mode = "r" if mmap else None
+    model = joblib.load(os.path.join(path, "model.joblib"), mmap_mode=mmap_mode)
+    scaler = joblib.load(os.path.join(path, "scaler.joblib"))
+    t2_meta = meta["t2"]
+    t2 = HotellingT2.from_factor(
+        np.load(os.path.join(path, "t2_mean.npy"), mmap_mode=mmap_mode),
+        np.load(os.path.join(path, "t2_chol.npy")),
+        t2_meta["UCL"],
+        t2_meta["n_samples"],
+        alpha=t2_meta["alpha"],
+        shrinkage=t2_meta["shrinkage"],
+    )
+    return ModelBundle(
+        path=path,
+        model=model,
+        scaler=scaler,
+        t2=t2,
+        feature_cols=meta["feature_cols"],
+        params=meta["params"],
+        metrics=meta.get("metrics", {}),
+        meta=meta,
+    )
+
+
+def load_default_bundle(root=DEFAULT_MODEL_DIR):
+    # JAKAIR_DEFAULT_MODEL dapat menunjuk nama atau path bundle; None jika belum ada model
+    target = os.environ.get("JAKAIR_DEFAULT_MODEL", DEFAULT_MODEL_NAME)
+    try:
+        return load_bundle(target, root)
+    except FileNotFoundError:
+        return None
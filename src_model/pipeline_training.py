@@ -1,84 +1,178 @@
-import numpy as np
+import dataclasses
+
 import pandas as pd
-from scipy.stats import f
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.svm import SVC
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    precision_score,
-    recall_score,
-    confusion_matrix
-)
 import seaborn as sns
 import matplotlib.pyplot as plt
 import streamlit as st
+from src_model import diagnostics, jobs, result_cache, search, session_store, tracing, training
 
-def run_training(df, C_val, gamma_val):
-    st.markdown("### 1️⃣ Cleansing Data")
 
-    # Normalisasi kolom
-    df = df.copy()
-    df.columns = df.columns.astype(str).str.strip().str.lower()
+# Interval pembaruan panel progres selama job training berjalan (detik)
+POLL_SECONDS = 1.0
 
-    feature_cols = ["so2_satelit", "co_satelit", "o3_satelit", "no2_satelit"]
-    missing_cols = [c for c in feature_cols if c not in df.columns]
-    if missing_cols:
-        st.error(f"Dataset tidak valid — kolom hilang: {missing_cols}")
-        st.stop()
 
-    # Hapus baris bernilai 0
-    mask_nonzero = (df[feature_cols] != 0).all(axis=1)
-    df_clean = df[mask_nonzero].reset_index(drop=True)
-    st.markdown("Penghapusan baris dengan nilai 0 pada semua fitur")
-    st.write(f"Jumlah data setelah cleansing: {len(df_clean)} dari {len(df)}")
+def make_config(C_val, gamma_val, defer_refit=False, linear_max_rows=None, rbf_components=None, low_memory=False):
+    return training.TrainingConfig(
+        C=C_val,
+        gamma=gamma_val,
+        defer_refit=defer_refit,
+        linear_max_rows=linear_max_rows,
+        rbf_components=rbf_components,
+        low_memory=low_memory,
+    )
 
-    if df_clean.empty:
-        st.error("Semua data terhapus saat cleansing. Pastikan tidak semua nilai = 0.")
-        st.stop()
 
-    # === 2️⃣ Labeling Hotelling’s T² ===
-    st.markdown("### 2️⃣ Labeling (Hotelling's T²)")
-    X = df_clean[feature_cols].astype(float).values
-    n, p = X.shape
+def training_job(job, data, config, trace=tracing.NULL_TRACE):
+    # Dijalankan di thread worker (tanpa konteks Streamlit); progres dilaporkan per tahap ke job
+    return training.fit(
+        data, config, cache=result_cache.get_default_cache(), progress=job.report, max_workers=job.threads,
+        trace=trace,
+    )
 
-    cov_mat = np.cov(X, rowvar=False)
+
+def search_training_job(job, data, config, grid, trace=tracing.NULL_TRACE):
+    # Pencarian hyperparameter lalu training dengan konfigurasi terbaik, dalam satu job;
+    # CV paralel dibatasi thread milik job. Hasil pencarian dikembalikan lewat job.meta
+    job.report("Pencarian hyperparameter", 0.0)
     try:
-        cov_inv = np.linalg.inv(cov_mat)
-    except np.linalg.LinAlgError:
-        st.warning("Covariance singular — menambahkan regularisasi kecil.")
-        cov_mat += np.eye(p) * 1e-6
-        cov_inv = np.linalg.inv(cov_mat)
-
-    mean_vec = np.mean(X, axis=0)
-    T2_values = [float((x - mean_vec) @ cov_inv @ (x - mean_vec).T) for x in X]
-    df_clean["T2_stat"] = T2_values
-
-    alpha = 0.01 # Mempengaruhi jumlah kategori "baik" vs "kurang baik"
-    UCL = (p * (n - 1) / (n - p)) * f.ppf(1 - alpha, p, n - p) if n > p else np.nan
-    if np.isnan(UCL):
-        st.error("UCL tidak dapat dihitung karena n <= p.")
-        st.stop()
-    st.write(f"**Upper Control Limit (UCL)** untuk T²: {UCL:.4f}")    
-
-    # Label lowercase supaya konsisten
-    df_clean["kategori_multivariat"] = np.where(
-        df_clean["T2_stat"] > UCL, "kurang baik", "baik"
+        with trace.stage("Pencarian hyperparameter"):
+            X_search, y_search = search.prepare_search_data(data, config.alpha)
+            best, summary = search.run_search(
+                X_search, y_search, grid["C"], grid["gamma"], kernels=grid["kernels"], cv=grid["cv"],
+                n_jobs=job.threads, config=config,
+            )
+    except ValueError as e:
+        raise training.TrainingError(f"Pencarian hyperparameter gagal: {e}") from e
+    del X_search, y_search
+    gamma = best["gamma"] if best["gamma"] is not None else config.gamma
+    job.meta.update(search_best=best, search_summary=summary, kernel=best["kernel"], C=best["C"], gamma=gamma)
+    return training_job(job, data, dataclasses.replace(config, C=best["C"], gamma=gamma), trace)
+
+
+def submit_training(data, config, meta=None, search_grid=None):
+    # data: validation.ValidatedData dari halaman training. Job sebelumnya milik sesi ini dibatalkan
+    # (konfigurasi terbaru yang dipakai); meta ikut dikembalikan saat hasil diambil, termasuk
+    # trace instrumentasi (meta["trace"]) yang dilanjutkan saat hasil training dirender.
+    # search_grid (dict C, gamma, kernels, cv): cari hyperparameter terbaik dulu di job yang sama
+    runner = jobs.get_default_runner()
+    runner.prune(session_store.is_active_session)
+    old = st.session_state.pop("training_job", None)
+    if old is not None:
+        runner.discard(old)
+    trace = diagnostics.start("training", rows=len(data.X), **dataclasses.asdict(config))
+    meta = {**(meta or {}), "trace": trace}
+    session_id = session_store.current_session_id()
+    if search_grid is None:
+        job = runner.submit(session_id, training_job, data, config, trace, meta=meta)
+    else:
+        job = runner.submit(session_id, search_training_job, data, config, search_grid, trace, meta=meta)
+    st.session_state["training_job"] = job.id
+    return job
+
+
+def poll_training():
+    # Job training sesi ini: panel progres selama berjalan, (bundle, meta) sekali saat selesai
+    job_id = st.session_state.get("training_job")
+    if job_id is None:
+        return None, None
+    runner = jobs.get_default_runner()
+    job = runner.get(job_id)
+    if job is None:
+        st.session_state.pop("training_job", None)
+        return None, None
+    if not job.finished:
+        show_job_progress(job_id)
+        return None, None
+
+    runner.collect(job_id)
+    st.session_state.pop("training_job", None)
+    trace = job.meta["trace"]
+    if trace.enabled:
+        trace.meta.update(antri_s=job.waited, status=job.state)
+    if job.state != jobs.DONE:
+        # Tahap yang sempat berjalan tetap direkam untuk run gagal / dibatalkan
+        diagnostics.finish(trace)
+    if job.state == jobs.CANCELLED:
+        st.warning("⛔ Pelatihan dibatalkan.")
+    elif job.state == jobs.FAILED:
+        if isinstance(job.error, training.TrainingError):
+            st.error(str(job.error))
+        else:
+            st.error(f"Pelatihan gagal: {job.error}")
+    else:
+        return job.result, job.meta
+    return None, None
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def show_job_progress(job_id):
+    # Hanya fragment ini yang dijalankan ulang berkala; halaman tetap bisa dipakai selama training
+    runner = jobs.get_default_runner()
+    job = runner.get(job_id)
+    if job is None or job.finished:
+        # Rerun penuh supaya hasil diambil dan dirender oleh poll_training
+        st.rerun()
+    if job.state == jobs.QUEUED:
+        position = runner.position(job_id)
+        ahead = f" ({position} pekerjaan lebih dulu)" if position else ""
+        st.progress(0.0, text=f"⏳ Menunggu antrian pelatihan{ahead}...")
+    else:
+        text = "Membatalkan setelah tahap ini..." if job.cancel_requested else job.stage
+        st.progress(job.progress, text=f"{text} — {job.elapsed:.0f} detik")
+    snap = runner.snapshot()
+    st.caption(
+        f"{snap['running']} berjalan · {snap['queued']} antri · {snap['workers']} worker "
+        f"× {snap['threads_per_job']} thread"
     )
+    if st.button("⛔ Batalkan Pelatihan", disabled=job.cancel_requested):
+        runner.cancel(job_id)
+        st.rerun()
+
+
+def finish_training(bundle, trace=tracing.NULL_TRACE):
+    with trace.stage("Render hasil training"):
+        render_training(bundle, trace)
+    diagnostics.finish(trace)
+
+    # Simpan hasil training: metrik & parameter T² di session_state, model di store artefak sesi
+    # (tanpa model split yang hanya dipakai evaluasi)
+    trained_models = session_store.session_artifacts().put("trained_models", {
+        **training.drop_eval_models(bundle.models),
+        "scaler": bundle.scaler,
+        "feature_cols": bundle.feature_cols,
+    })
+    st.session_state["trained_t2"] = bundle.trained_t2
+    st.session_state["training_results"] = bundle.results
 
-    # Simpan model T² di session_state
-    trained_t2 = {
-        "mean": mean_vec,
-        "cov_inv": cov_inv,
-        "UCL": UCL,
-        "feature_cols": feature_cols
-    }
-    st.session_state["trained_t2"] = trained_t2
+    return bundle.results, trained_models
+
+
+def render_training(bundle, trace=tracing.NULL_TRACE):
+    df_clean = bundle.labeled
+    results = bundle.results
+
+    if bundle.cache_source:
+        st.info(f"⚡ Hasil training diambil dari cache ({bundle.cache_source}).")
+
+    st.markdown("### 1️⃣ Cleansing Data")
+    st.markdown("Penghapusan baris dengan nilai 0 pada semua fitur")
+    st.write(f"Jumlah data setelah cleansing: {len(df_clean)} dari {bundle.n_input_rows}")
+    if bundle.report is not None and bundle.report.n_rejected:
+        rejected = ", ".join(f"{reason}: {n}" for reason, n in bundle.report.counts.items() if n)
+        with st.expander(f"Baris yang dihapus ({bundle.report.n_rejected} — {rejected})"):
+            st.dataframe(bundle.report.rejected_frame(), width="stretch")
+
+    # === 2️⃣ Labeling Hotelling’s T² ===
+    st.markdown("### 2️⃣ Labeling (Hotelling's T²)")
+    if bundle.t2.shrinkage_ > 0:
+        st.warning(
+            f"Covariance hampir singular — shrinkage OAS diterapkan (intensitas {bundle.t2.shrinkage_:.4f})."
+        )
+    st.write(f"**Upper Control Limit (UCL)** untuk T²: {bundle.t2.ucl_:.4f}")
 
     # Ringkasan kategori
     st.markdown("#### Ringkasan Kategori")
-    label_counts = df_clean["kategori_multivariat"].value_counts()
+    label_counts = bundle.label_counts
     col1, col2 = st.columns(2)
     with col1:
         st.metric("Jumlah Baik", label_counts.get("baik", 0))
@@ -88,13 +182,8 @@ def run_training(df, C_val, gamma_val):
     st.write("Preview data setelah labeling:")
     st.dataframe(df_clean.head(10))
 
-    # Sortir berdasarkan nilai T²
-    df_sorted_asc = df_clean.sort_values(by="T2_stat", ascending=True)
-    df_sorted_desc = df_clean.sort_values(by="T2_stat", ascending=False)
-
     # Ambil 10 data terendah (baik) dan 10 tertinggi (kurang baik)
-    df_terendah = df_sorted_asc.head(10).drop(columns=["kategori_multivariat"])
-    df_tertinggi = df_sorted_desc.head(10).drop(columns=["kategori_multivariat"])
+    df_terendah, df_tertinggi = bundle.extremes(10)
 
     col1, col2 = st.columns(2)
     with col1:
@@ -107,89 +196,66 @@ def run_training(df, C_val, gamma_val):
 
     # === 3️⃣ Training Model SVM ===
     st.markdown("### 3️⃣ Training Model Custom (SVM)")
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(df_clean[feature_cols])
-    y = df_clean["kategori_multivariat"]
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_scaled,
-        y,
-        test_size=0.2,
-        random_state=42,
-        stratify=y
-    )
-
-    linear_model = SVC(kernel='linear', C=C_val)
-    rbf_model = SVC(kernel='rbf', C=C_val, gamma=gamma_val)
-
-    linear_model.fit(X_train, y_train)
-    rbf_model.fit(X_train, y_train)
-
-    # === Train model full data (for prediction use) ===
-    linear_final = SVC(kernel='linear', C=C_val)
-    rbf_final = SVC(kernel='rbf', C=C_val, gamma=gamma_val)
-
-    linear_final.fit(X_scaled, y)
-    rbf_final.fit(X_scaled, y)
-
-    y_pred_linear = linear_model.predict(X_test)
-    y_pred_rbf = rbf_model.predict(X_test)
-
-    results = {
-        "Linear": {
-            "Accuracy": accuracy_score(y_test, y_pred_linear),
-            "Precision": precision_score(y_test, y_pred_linear, average="weighted", zero_division=0),
-            "Recall": recall_score(y_test, y_pred_linear, average="weighted", zero_division=0),
-            "F1 Score": f1_score(y_test, y_pred_linear, average="weighted"),
-            "Confusion Matrix": confusion_matrix(y_test, y_pred_linear)
-        },
-        "RBF": {
-            "Accuracy": accuracy_score(y_test, y_pred_rbf),
-            "Precision": precision_score(y_test, y_pred_rbf, average="weighted", zero_division=0),
-            "Recall": recall_score(y_test, y_pred_rbf, average="weighted", zero_division=0),
-            "F1 Score": f1_score(y_test, y_pred_rbf, average="weighted"),
-            "Confusion Matrix": confusion_matrix(y_test, y_pred_rbf)
-        }
-    }
 
     # === 4️⃣ Tampilkan hasil ===
     st.markdown("#### 🔍 Perbandingan Model")
     class_names = ["Baik", "Kurang Baik"]
+    intervals = bundle.intervals or {}
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Linear Kernel")
-        for m, v in results["Linear"].items():
-            if m != "Confusion Matrix":
-                st.write(f"**{m}:** {v:.4f}")
-        fig, ax = plt.subplots()
-        sns.heatmap(results["Linear"]["Confusion Matrix"], annot=True, fmt="d", cmap="Blues", ax=ax, xticklabels=class_names, yticklabels=class_names)
-        ax.set_xlabel("Prediksi")
-        ax.set_ylabel("Aktual")
-        st.pyplot(fig)
+        st.caption(f"Backend: {bundle.backends['linear']}")
+        with trace.stage("Heatmap Linear"):
+            render_metrics(results["Linear"], class_names, intervals.get("Linear"))
 
     with col2:
         st.subheader("RBF Kernel")
-        for m, v in results["RBF"].items():
-            if m != "Confusion Matrix":
-                st.write(f"**{m}:** {v:.4f}")
-        fig, ax = plt.subplots()
-        sns.heatmap(results["RBF"]["Confusion Matrix"], annot=True, fmt="d", cmap="Blues", ax=ax, xticklabels=class_names, yticklabels=class_names)
-        ax.set_xlabel("Prediksi")
-        ax.set_ylabel("Aktual")
-        st.pyplot(fig)
-
-    # Simpan hasil training
-    trained_models = {
-        "linear": linear_model,
-        "rbf": rbf_model,
-        # Model final 100% data (untuk prediksi user)
-        "linear_final": linear_final,
-        "rbf_final": rbf_final,
-        "scaler": scaler,
-        "feature_cols": feature_cols,
-    }
-    st.session_state["trained_models"] = trained_models
-    st.session_state["training_results"] = results
-
-    return df_clean, results, trained_models
\ No newline at end of file
+        st.caption(f"Backend: {bundle.backends['rbf']}")
+        if "RBF Eksak" in results:
+            gap = results["RBF"]["Accuracy"] - results["RBF Eksak"]["Accuracy"]
+            st.caption(
+                f"Selisih akurasi vs RBF eksak ({results['RBF Eksak']['Jumlah Data Latih']} data latih): {gap:+.4f}"
+            )
+        with trace.stage("Heatmap RBF"):
+            render_metrics(results["RBF"], class_names, intervals.get("RBF"))
+
+    if "RBF - Linear" in intervals:
+        render_comparison(results, intervals)
+
+
+def render_metrics(metrics, class_names, intervals=None):
+    for m, v in metrics.items():
+        if m == "Confusion Matrix":
+            continue
+        if intervals and m in intervals:
+            lo, hi = intervals[m]
+            st.write(f"**{m}:** {v:.4f} (CI {lo:.4f} – {hi:.4f})")
+        else:
+            st.write(f"**{m}:** {v:.4f}")
+    fig, ax = plt.subplots()
+    sns.heatmap(metrics["Confusion Matrix"], annot=True, fmt="d", cmap="Blues", ax=ax, xticklabels=class_names, yticklabels=class_names)
+    ax.set_xlabel("Prediksi")
+    ax.set_ylabel("Aktual")
+    st.pyplot(fig)
+    plt.close(fig)
+
+
+def render_comparison(results, intervals):
+    # Selisih RBF - Linear dengan CI bootstrap berpasangan; CI yang memuat 0 berarti perbedaan belum meyakinkan
+    meta = intervals["_meta"]
+    st.markdown("#### 📏 Selisih RBF − Linear")
+    st.caption(
+        f"Interval kepercayaan {meta['level']:.0%} dari {meta['n_boot']:,} resample bootstrap "
+        f"data uji ({meta['n_test']:,} baris)"
+    )
+    rows = []
+    for m, (lo, hi) in intervals["RBF - Linear"].items():
+        rows.append({
+            "Metrik": m,
+            "Selisih": results["RBF"][m] - results["Linear"][m],
+            "CI Bawah": lo,
+            "CI Atas": hi,
+            "Kesimpulan": "Tidak signifikan" if lo <= 0 <= hi else ("RBF lebih baik" if lo > 0 else "Linear lebih baik"),
+        })
+    st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
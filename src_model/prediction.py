@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src_model.schema import FEATURE_COLS, T2_COL
+
+PRED_COL = "kategori_prediksi"
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def scale(X, scaler):
+    # Setara scaler.transform(X) untuk StandardScaler, tanpa validasi per panggilan
+    return (X - scaler.mean_) / scaler.scale_
+
+
+def score_array(X, model, scaler, t2_model):
+    # Prediksi SVM dan nilai T² untuk satu blok array (k, p) berurutan feature_cols
+    X = np.asarray(X, dtype=float)
+    return model.predict(scale(X, scaler)), t2_model.score(X)
+
+
+def to_feature_array(df, feature_cols=FEATURE_COLS):
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    missing_cols = [c for c in feature_cols if c not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Dataset tidak valid — kolom hilang: {missing_cols}")
+    X = df[list(feature_cols)].to_numpy(dtype=float)
+    if not np.isfinite(X).all():
+        raise ValueError("Dataset mengandung missing value atau nilai tidak valid.")
+    return X
+
+
+def iter_scored_chunks(X, model, scaler, t2_model, feature_cols=FEATURE_COLS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    for start in range(0, len(X), chunk_rows):
+        block = X[start:start + chunk_rows]
+        labels, t2_values = score_array(block, model, scaler, t2_model)
+        out = pd.DataFrame(block, columns=feature_cols)
+        out[PRED_COL] = labels
+        out[T2_COL] = t2_values
+        yield out
+
+
+def write_scored_csv(X, model, scaler, t2_model, fh, feature_cols=FEATURE_COLS,
+                     chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    # Tulis hasil per chunk ke file teks; mengembalikan ringkasan dan throughput
+    start = time.perf_counter()
+    counts = {}
+    done = 0
+    for i, chunk in enumerate(iter_scored_chunks(X, model, scaler, t2_model, feature_cols, chunk_rows)):
+        chunk.to_csv(fh, header=(i == 0), index=False)
+        for label, n in chunk[PRED_COL].value_counts().items():
+            counts[label] = counts.get(label, 0) + int(n)
+        done += len(chunk)
+        if progress is not None:
+            progress(done / len(X))
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": done,
+        "seconds": elapsed,
+        "rows_per_s": done / elapsed if elapsed > 0 else float("inf"),
+        "counts": counts,
+    }
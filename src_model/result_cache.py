@@ -0,0 +1,105 @@
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+import joblib
+import numpy as np
+import sklearn
+
+from src_model import disk_lru, session_store, singleton
+
+DEFAULT_CACHE_DIR = os.environ.get("JAKAIR_CACHE_DIR", os.path.join(".cache", "training"))
+# Tingkat memori dibatasi byte (frame berlabel + model + X_full bisa ratusan MB per entri)
+DEFAULT_MEMORY_BYTES = int(os.environ.get("JAKAIR_CACHE_MEMORY_BYTES", 256 * 1024 ** 2))
+DEFAULT_DISK_BYTES = int(os.environ.get("JAKAIR_CACHE_DISK_BYTES", 2 * 1024 ** 3))
+# Dinaikkan jika isi TrainingBundle berubah; versi sklearn ikut di key karena model di-pickle
+FORMAT_VERSION = 1
+
+
+def make_key(X, config):
+    # Hash konten matriks fitur bersih (dalam dtype aslinya) + seluruh parameter training
+    X = np.ascontiguousarray(X)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{FORMAT_VERSION}:sklearn{sklearn.__version__}:{X.shape}{X.dtype.str}".encode())
+    h.update(X.data)
+    h.update(json.dumps(dataclasses.asdict(config), sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Cache hasil training dua tingkat: LRU di memori dan file joblib di disk."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, memory_bytes=DEFAULT_MEMORY_BYTES, disk_bytes=DEFAULT_DISK_BYTES):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = disk_lru.MemoryLRU(max_bytes=memory_bytes)
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.joblib")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self.stats["memory_hits"] += 1
+                return self._memory.get(key), "memori"
+
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+            disk_lru.touch(path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+            # File rusak atau pickle lama yang kelas/modulnya sudah tidak ada dianggap miss
+            with self._lock:
+                self.stats["misses"] += 1
+            return None, None
+
+        size = session_store.sizeof(value)
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, value, size)
+        return value, "disk"
+
+    def put(self, key, value):
+        # Disk penuh / read-only tidak menggagalkan training: entri hanya disimpan di memori
+        size = session_store.sizeof(value)
+        with self._lock:
+            self._remember(key, value, size)
+        if self.disk_bytes <= 0:
+            return
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, self._path(key))
+            evicted = disk_lru.evict_disk(self.directory, "joblib", self.disk_bytes, keep=key)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.stats["disk_evictions"] += len(evicted)
+
+    def _remember(self, key, value, size):
+        # Ukuran dihitung pemanggil di luar lock (menelusuri frame dan model bisa lama)
+        self.stats["memory_evictions"] += self._memory.put(key, value, size)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_items"] = len(self._memory)
+            stats["memory_bytes"] = self._memory.nbytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+# Satu cache per proses, dipakai bersama oleh semua sesi Streamlit
+get_default_cache = singleton.lazy_default(ResultCache)
@@ -0,0 +1,216 @@
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cholesky, LinAlgError
+
+from src_model import validation
+from src_model.hotelling import LABEL_BAIK, LABEL_KURANG_BAIK, MAX_CONDITION, compute_prediction_ucl
+from src_model.schema import DATE_COL, FEATURE_COLS, LABEL_COL, T2_COL
+
+DEFAULT_WINDOW_DAYS = 30
+DATE_ALIASES = {"date": DATE_COL, "waktu": DATE_COL}
+COUNT_COL = "jumlah_observasi"
+WINDOW_COL = "n_jendela"
+UCL_COL = "UCL"
+
+
+def cholupdate(L, x, sign=1.0):
+    # Update (sign=+1) / downdate (sign=-1) rank-one faktor Cholesky bawah in-place: L Lᵀ ± x xᵀ.
+    # L berupa list of list: untuk p kecil (4 polutan) loop skalar jauh lebih cepat dari slice numpy.
+    # False jika downdate membuat matriks tidak lagi positif definit (L tidak bisa dipakai lagi)
+    x = list(x)
+    p = len(x)
+    for k in range(p):
+        d = L[k][k]
+        r2 = d * d + sign * x[k] * x[k]
+        if d <= 0 or r2 <= 0:
+            return False
+        r = math.sqrt(r2)
+        c = r / d
+        s = x[k] / d
+        L[k][k] = r
+        for i in range(k + 1, p):
+            L[i][k] = (L[i][k] + sign * s * x[i]) / c
+            x[i] = c * x[i] - s * L[i][k]
+    return True
+
+
+def forward_norm2(L, v):
+    # ‖L⁻¹v‖² dengan substitusi maju
+    z = []
+    total = 0.0
+    for i, row in enumerate(L):
+        zi = (v[i] - sum(row[j] * z[j] for j in range(i))) / row[i]
+        z.append(zi)
+        total += zi * zi
+    return total
+
+
+class RollingMoments:
+    """Mean dan faktor Cholesky scatter matrix jendela geser, diperbarui rank-one saat data masuk/keluar."""
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self.mean = np.zeros(p)
+        # Faktor Cholesky bawah (list of list) dari M2 = Σ (x - mean)(x - mean)ᵀ; None selama belum positif definit
+        self.chol = None
+        self.refactors = 0
+
+    def add(self, x):
+        # Welford: M2' = M2 + n/(n+1) δδᵀ, δ = x - mean lama
+        n = self.n + 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / n
+        if self.chol is not None:
+            cholupdate(self.chol, (delta * math.sqrt(self.n / n)).tolist(), 1.0)
+        self.n = n
+
+    def remove(self, x):
+        # Kebalikan add: M2' = M2 - n/(n-1) δδᵀ, δ = x - mean saat ini
+        n = self.n - 1
+        if n <= 0:
+            self.n, self.mean, self.chol = 0, np.zeros(self.p), None
+            return
+        delta = x - self.mean
+        self.mean = self.mean - delta / n
+        if self.chol is not None and not cholupdate(self.chol, (delta * math.sqrt(self.n / n)).tolist(), -1.0):
+            self.chol = None
+        self.n = n
+
+    def refactor(self, X):
+        # Hitung ulang dari data jendela: saat awal dan jika downdate gagal secara numerik
+        self.n = len(X)
+        self.mean = X.mean(axis=0)
+        self.chol = None
+        self.refactors += 1
+        if self.n > self.p:
+            D = X - self.mean
+            try:
+                self.chol = cholesky(D.T @ D, lower=True).tolist()
+            except LinAlgError:
+                pass
+
+    def t2(self, x):
+        # Kovarians = M2 / (n - 1), jadi T² = (n - 1) ‖L⁻¹(x - mean)‖²
+        if self.chol is None:
+            return np.nan
+        d = [self.chol[k][k] for k in range(self.p)]
+        if min(d) <= 0 or (max(d) / min(d)) ** 2 > MAX_CONDITION:
+            return np.nan
+        return (self.n - 1) * forward_norm2(self.chol, (x - self.mean).tolist())
+
+
+def upload_columns(feature_cols=FEATURE_COLS):
+    # Kolom yang dibaca dari upload observasi bertanggal (termasuk alias kolom tanggal)
+    return list(feature_cols) + [DATE_COL, *DATE_ALIASES]
+
+
+def daily_series(df, feature_cols=FEATURE_COLS):
+    # Observasi bertanggal -> satu vektor rata-rata polutan per hari (baris tidak valid dibuang)
+    df = df.rename(columns=lambda c: DATE_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    if DATE_COL not in df.columns:
+        raise validation.ValidationError(f"Dataset tidak valid — kolom hilang: ['{DATE_COL}']")
+    # Jumlah hari minimum untuk baseline diperiksa di rolling_t2, bukan batas baris training
+    X, report = validation.clean_rows(validation.feature_matrix(df, feature_cols, min_rows=1), inplace=True)
+    keep = np.ones(report.n_rows, dtype=bool)
+    keep[report.rejected_index] = False
+    days = pd.to_datetime(df[DATE_COL], errors="coerce").to_numpy()[keep].astype("datetime64[D]")
+    dated = ~np.isnat(days)
+    X, days = X[dated], days[dated]
+    if not len(days):
+        raise validation.ValidationError("Tidak ada observasi dengan tanggal yang valid.")
+
+    # Rata-rata per hari dengan bincount (tanpa groupby)
+    unique_days, code = np.unique(days, return_inverse=True)
+    counts = np.bincount(code)
+    means = np.empty((len(unique_days), X.shape[1]))
+    for j in range(X.shape[1]):
+        means[:, j] = np.bincount(code, weights=X[:, j]) / counts
+    return unique_days, means, counts, report
+
+
+def rolling_t2(days, X, window_days=DEFAULT_WINDOW_DAYS, alpha=0.01, min_periods=validation.MIN_ROWS):
+    # T² hari t terhadap baseline hari [t - window_days, t - 1]. Menggeser jendela satu hari berarti
+    # satu update rank-one (hari t - 1 masuk) dan downdate untuk hari yang keluar, bukan fit ulang.
+    # Hari t bukan bagian baseline, jadi dipakai UCL observasi baru; jendela < min_periods hari tidak dinilai
+    n, p = X.shape
+    min_periods = max(min_periods, p + 1)
+    day_num = np.asarray(days, dtype="datetime64[D]").astype(np.int64)
+    state = RollingMoments(p)
+    t2 = np.full(n, np.nan)
+    n_window = np.zeros(n, dtype=np.int64)
+    lo = 0
+    for i in range(n):
+        if i > 0:
+            state.add(X[i - 1])
+        while lo < i and day_num[lo] < day_num[i] - window_days:
+            state.remove(X[lo])
+            lo += 1
+        if state.chol is None and state.n > p:
+            state.refactor(X[lo:i])
+        n_window[i] = state.n
+        if state.n >= min_periods:
+            t2[i] = state.t2(X[i])
+
+    # UCL hanya bergantung pada ukuran jendela: dihitung sekali per ukuran yang muncul
+    ucl = np.full(n, np.nan)
+    for k in np.unique(n_window[n_window >= min_periods]):
+        ucl[n_window == k] = compute_prediction_ucl(int(k), p, alpha)
+    return t2, ucl, n_window, state.refactors
+
+
+def classify_timeline(df, window_days=DEFAULT_WINDOW_DAYS, alpha=0.01, feature_cols=FEATURE_COLS):
+    # Runtun harian T² dan kategori dari upload observasi bertanggal
+    days, X, counts, report = daily_series(df, feature_cols)
+    start = time.perf_counter()
+    t2, ucl, n_window, refactors = rolling_t2(days, X, window_days, alpha)
+    seconds = time.perf_counter() - start
+
+    table = pd.DataFrame(X, columns=list(feature_cols))
+    table.insert(0, COUNT_COL, counts)
+    table.insert(0, DATE_COL, pd.to_datetime(days))
+    table[WINDOW_COL] = n_window
+    table[T2_COL] = t2
+    table[UCL_COL] = ucl
+    scored = ~np.isnan(t2)
+    table[LABEL_COL] = None
+    table.loc[scored, LABEL_COL] = np.where(t2[scored] > ucl[scored], LABEL_KURANG_BAIK, LABEL_BAIK)
+    return table, {
+        "rows": report.n_rows,
+        "observations": int(counts.sum()),
+        "days": len(days),
+        "scored_days": int(scored.sum()),
+        "window_days": window_days,
+        "refactors": refactors,
+        "seconds": seconds,
+    }
+
+
+def render_timeline_png(table, dpi=150):
+    # Timeline T² harian + UCL jendela, titik diwarnai per kategori; dibuat sekali per hasil
+    from io import BytesIO
+
+    from matplotlib.figure import Figure
+
+    from src_model.choropleth import CATEGORY_COLORS, DEFAULT_COLOR
+
+    fig = Figure(figsize=(8, 3.2))
+    ax = fig.subplots()
+    dates = table[DATE_COL]
+    ax.plot(dates, table[T2_COL], color="#3498DB", linewidth=0.8, zorder=1)
+    ax.step(dates, table[UCL_COL], where="post", linestyle="--", linewidth=1, color="#E74C3C", label="UCL", zorder=2)
+    for label, color in CATEGORY_COLORS.items():
+        mask = (table[LABEL_COL] == label).to_numpy()
+        ax.scatter(dates[mask], table[T2_COL][mask], s=8, color=color, label=label.title(), zorder=3)
+    if table[LABEL_COL].isna().any():
+        ax.scatter([], [], s=8, color=DEFAULT_COLOR, label="Belum cukup data")
+    ax.set_ylabel("Nilai T²")
+    ax.set_title("Timeline T² (jendela geser)", fontsize=11, fontweight="bold")
+    ax.legend(loc="upper left", fontsize=7, frameon=False, ncol=4)
+    fig.autofmt_xdate()
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
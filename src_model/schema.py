@@ -0,0 +1,6 @@
+FEATURE_COLS = ["so2_satelit", "co_satelit", "o3_satelit", "no2_satelit"]
+LABEL_COL = "kategori_multivariat"
+T2_COL = "T2_stat"
+LAT_COL = "lat"
+LON_COL = "lon"
+DATE_COL = "tanggal"
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from src_model import svm_backend, training, validation
+from src_model.schema import FEATURE_COLS, LABEL_COL
+
+
+def parse_grid(text):
+    # "0.1, 1, 10" -> [0.1, 1.0, 10.0]
+    values = [float(v) for v in text.replace(";", ",").split(",") if v.strip()]
+    if not values or any(v <= 0 for v in values):
+        raise ValueError("Grid harus berisi angka positif yang dipisahkan koma.")
+    return sorted(set(values))
+
+
+def prepare_search_data(data, alpha=0.01):
+    # Cleansing + labeling T² + scaling yang sama dengan training.fit
+    df_clean = validation.ensure_validated(data).to_frame()
+    training.label_dataframe(df_clean, alpha)
+    # Satu array kontigu yang di-share (memmap joblib) ke semua worker
+    X_scaled = np.ascontiguousarray(StandardScaler().fit_transform(df_clean[FEATURE_COLS]))
+    return X_scaled, df_clean[LABEL_COL].to_numpy()
+
+
+class SVMCandidate(ClassifierMixin, BaseEstimator):
+    """Kandidat pencarian dengan backend yang sama seperti training.fit_models (liblinear / Nystroem)."""
+
+    def __init__(self, kernel="rbf", C=1.0, gamma=0.1, rbf_components=None, linear_max_rows=None, n_rows=None):
+        self.kernel = kernel
+        self.C = C
+        self.gamma = gamma
+        self.rbf_components = rbf_components
+        self.linear_max_rows = linear_max_rows
+        self.n_rows = n_rows
+
+    def fit(self, X, y):
+        # Backend linear dipilih dari jumlah baris data penuh (n_rows), bukan subsampel iterasi halving,
+        # supaya kandidat sama dengan model yang nanti dilatih
+        if self.kernel == "linear":
+            model = svm_backend.make_linear_model(self.C, self.n_rows or len(y), self.linear_max_rows)
+        elif self.rbf_components:
+            model = svm_backend.make_approx_rbf_model(self.C, self.gamma, self.rbf_components)
+        else:
+            model = svm_backend.make_rbf_model(self.C, self.gamma)
+        self.model_ = model.fit(X, y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(X)
+
+
+def build_param_grid(C_grid, gamma_grid, kernels):
+    grid = []
+    if "linear" in kernels:
+        grid.append({"kernel": ["linear"], "C": list(C_grid)})
+    if "rbf" in kernels:
+        grid.append({"kernel": ["rbf"], "C": list(C_grid), "gamma": list(gamma_grid)})
+    if not grid:
+        raise ValueError("Pilih minimal satu kernel.")
+    return grid
+
+
+def run_search(X_scaled, y, C_grid, gamma_grid, kernels=("linear", "rbf"), cv=5, factor=3, n_jobs=-1, config=None):
+    # Successive halving: semua konfigurasi dievaluasi dengan sedikit data dulu,
+    # hanya 1/factor terbaik yang lanjut ke iterasi berikutnya dengan data lebih banyak.
+    # config (training.TrainingConfig): kandidat memakai backend yang sama (mis. RBF aproksimasi)
+    minority = int(pd.Series(y).value_counts().min())
+    n_splits = min(cv, minority)
+    if n_splits < 2:
+        raise ValueError("Setiap kategori membutuhkan minimal 2 data untuk cross-validation.")
+
+    param_grid = build_param_grid(C_grid, gamma_grid, kernels)
+    n = len(y)
+    n_candidates = sum(int(np.prod([len(v) for v in g.values()])) for g in param_grid)
+    n_iter = int(np.ceil(np.log(n_candidates) / np.log(factor))) if n_candidates > 1 else 0
+    # Sama dengan "exhaust", tetapi subsampel iterasi pertama dijaga cukup besar agar
+    # kategori minoritas (~alpha dari data) tetap muncul di setiap fold
+    min_resources = max(n // factor ** n_iter, int(np.ceil(n_splits * 2 * n / minority)))
+    min_resources = min(min_resources, n)
+
+    candidate = SVMCandidate(n_rows=n)
+    if config is not None:
+        candidate.set_params(rbf_components=config.rbf_components, linear_max_rows=config.linear_max_rows)
+    search = HalvingGridSearchCV(
+        candidate,
+        param_grid,
+        cv=StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42),
+        factor=factor,
+        resource="n_samples",
+        min_resources=min_resources,
+        scoring="f1_weighted",
+        n_jobs=n_jobs,
+        refit=False,
+        random_state=42,
+    )
+    search.fit(X_scaled, y)
+
+    cv_results = pd.DataFrame(search.cv_results_)
+    summary = pd.DataFrame({
+        "Kernel": cv_results["param_kernel"].str.upper(),
+        "C": cv_results["param_C"],
+        "Gamma": cv_results.get("param_gamma", pd.Series(np.nan, index=cv_results.index)),
+        "Iterasi": cv_results["iter"],
+        "Jumlah Data": cv_results["n_resources"],
+        "F1 (CV)": cv_results["mean_test_score"],
+    })
+    # Hanya hasil iterasi terakhir tiap konfigurasi yang relevan untuk peringkat
+    summary = (
+        summary.sort_values(["Iterasi", "F1 (CV)"], ascending=[False, False])
+        .drop_duplicates(subset=["Kernel", "C", "Gamma"])
+        .reset_index(drop=True)
+    )
+    best = dict(search.best_params_)
+    best.setdefault("gamma", None)
+    return best, summary
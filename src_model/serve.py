@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from src_model import model_store, prediction
+from src_model.hotelling import LABEL_BAIK, LABEL_KURANG_BAIK
+from src_model.schema import T2_COL
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Micro-batching: request satu baris yang datang dalam MAX_WAIT_MS setelah request pertama
+# digabung (maksimal MAX_BATCH baris) menjadi satu panggilan predict + T²
+MAX_BATCH = 256
+MAX_WAIT_MS = 1.0
+MAX_BODY_BYTES = 16 * 1024 ** 2
+
+
+class RequestError(ValueError):
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class Scorer:
+    """Model bundle tersimpan; predict dan T² dijalankan di satu thread di luar event loop."""
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.feature_cols = list(bundle.feature_cols)
+        self.ucl = float(bundle.t2.ucl_)
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="jakair-score")
+
+    def score(self, X):
+        labels, t2 = prediction.score_array(X, self.bundle.model, self.bundle.scaler, self.bundle.t2)
+        return [
+            {
+                prediction.PRED_COL: str(label).strip().lower(),
+                T2_COL: float(value),
+                "kategori_T2": LABEL_KURANG_BAIK if value > self.ucl else LABEL_BAIK,
+            }
+            for label, value in zip(labels, t2)
+        ]
+
+    async def run(self, X):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.score, X)
+
+    def row(self, obj):
+        # Satu baris: dict {kolom fitur: nilai} (nama kolom tidak peka huruf besar) atau list nilai berurutan
+        if isinstance(obj, dict):
+            lower = {str(k).strip().lower(): v for k, v in obj.items()}
+            missing_cols = [c for c in self.feature_cols if c not in lower]
+            if missing_cols:
+                raise RequestError(f"Kolom hilang: {missing_cols}")
+            values = [lower[c] for c in self.feature_cols]
+        elif isinstance(obj, list):
+            if len(obj) != len(self.feature_cols):
+                raise RequestError(f"Baris harus berisi {len(self.feature_cols)} nilai: {self.feature_cols}")
+            values = obj
+        else:
+            raise RequestError("Baris harus berupa objek atau array nilai polutan.")
+        try:
+            values = [float(v) for v in values]
+        except (TypeError, ValueError):
+            raise RequestError("Nilai polutan harus berupa angka.") from None
+        if not all(math.isfinite(v) for v in values):
+            raise RequestError("Nilai polutan tidak boleh kosong atau tak hingga.")
+        return values
+
+
+class MicroBatcher:
+    """Menggabungkan request satu baris yang datang bersamaan menjadi satu panggilan predict/T²."""
+
+    def __init__(self, scorer, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.stats = {"rows": 0, "batches": 0, "largest_batch": 0}
+
+    async def submit(self, values):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((values, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch:
+            if not self.queue.empty():
+                items.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def run(self):
+        # Selama satu batch dihitung di thread scorer, request baru menumpuk di antrian dan
+        # menjadi batch berikutnya; di beban rendah batch berisi satu baris tanpa menunggu lama
+        while True:
+            items = await self._collect()
+            X = np.array([values for values, _ in items], dtype=np.float64)
+            try:
+                results = await self.scorer.run(X)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+            self.stats["rows"] += len(items)
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+
+
+class InferenceService:
+    """Server HTTP/1.1 (keep-alive) minimal di atas asyncio untuk prediksi kualitas udara."""
+
+    def __init__(self, bundle, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.scorer = Scorer(bundle)
+        self.batcher = MicroBatcher(self.scorer, max_batch, max_wait_ms)
+        self.requests = 0
+
+    async def predict(self, payload):
+        # Objek tunggal -> lewat micro-batcher; list / {"rows": [...]} -> satu panggilan langsung
+        if isinstance(payload, dict) and "rows" in payload:
+            payload = payload["rows"]
+        if isinstance(payload, list) and payload and isinstance(payload[0], (dict, list)):
+            X = np.array([self.scorer.row(obj) for obj in payload], dtype=np.float64)
+            return {"results": await self.scorer.run(X)}
+        return await self.batcher.submit(self.scorer.row(payload))
+
+    def health(self):
+        bundle = self.scorer.bundle
+        return {
+            "status": "ok",
+            "model": bundle.path,
+            "kernel": bundle.params.get("kernel"),
+            "feature_cols": self.scorer.feature_cols,
+            "UCL": self.scorer.ucl,
+        }
+
+    def stats(self):
+        stats = dict(self.batcher.stats)
+        stats["requests"] = self.requests
+        stats["mean_batch"] = stats["rows"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    async def dispatch(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.health()
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, self.stats()
+        if path == "/predict":
+            if method != "POST":
+                raise RequestError("Gunakan POST.", HTTPStatus.METHOD_NOT_ALLOWED)
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise RequestError("Body harus berupa JSON.") from None
+            return HTTPStatus.OK, await self.predict(payload)
+        raise RequestError(f"Endpoint tidak ditemukan: {path}", HTTPStatus.NOT_FOUND)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = header.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    if len(parts) != 3:
+                        raise RequestError("Request line tidak valid.")
+                    method, target, version = parts
+                    keep_alive = keep_alive and version == "HTTP/1.1"
+                    try:
+                        length = int(headers.get("content-length") or 0)
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        # Panjang body tidak diketahui: sisa stream tidak bisa dipakai untuk request berikutnya
+                        keep_alive = False
+                        raise RequestError("Content-Length tidak valid.")
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise RequestError("Body terlalu besar.", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        batcher = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.scorer.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal untuk prediksi kualitas udara dari model bundle.")
+    parser.add_argument("model", nargs="?", default=model_store.DEFAULT_MODEL_NAME,
+                        help="Nama model bundle (di --root) atau path folder bundle")
+    parser.add_argument("--root", default=model_store.DEFAULT_MODEL_DIR)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="1 = tanpa micro-batching")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    bundle = model_store.load_bundle(args.model, args.root)
+    service = InferenceService(bundle, args.max_batch, args.max_wait_ms)
+
+    def ready(server):
+        print(f"Model: {bundle.path}", flush=True)
+        print(f"Melayani di http://{args.host}:{server.sockets[0].getsockname()[1]} "
+              f"(POST /predict, GET /health, GET /stats)", flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src_model import singleton
+
+DEFAULT_SESSION_BYTES = int(os.environ.get("JAKAIR_SESSION_BYTES", 512 * 1024 ** 2))
+DEFAULT_GLOBAL_BYTES = int(os.environ.get("JAKAIR_GLOBAL_SESSION_BYTES", 2 * 1024 ** 3))
+# Objek di bawah ukuran ini tidak di-hash untuk dedup (biaya hash lebih besar dari penghematannya)
+DEDUP_MIN_BYTES = 64 * 1024
+# Artefak yang dibutuhkan untuk prediksi; dievict paling akhir
+ESSENTIAL = {"selected_model"}
+
+
+def sizeof(obj, _seen=None):
+    # Perkiraan ukuran memori: buffer numpy/pandas dihitung penuh, view dihitung lewat base-nya,
+    # objek lain (estimator sklearn, dict, list) ditelusuri atributnya
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        if isinstance(obj.base, np.ndarray):
+            return sizeof(obj.base, _seen)
+        return sys.getsizeof(obj) if obj.flags.owndata else obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sizeof(k, _seen) + sizeof(v, _seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(sizeof(v, _seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + sizeof(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+class TempFile:
+    """File sementara milik sesi; dihapus saat artefaknya dilepas (diganti, dievict, atau sesi ditutup)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def read(self):
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+@dataclass
+class _Blob:
+    obj: object
+    size: int
+    refs: int = 0
+
+
+@dataclass
+class _Entry:
+    parts: dict  # kunci bagian -> fingerprint blob (None untuk nilai non-dict)
+    is_dict: bool
+    essential: bool
+
+
+class ArtifactStore:
+    """Artefak berat per sesi dengan akuntansi byte, anggaran per sesi & global (LRU) dan dedup lintas sesi."""
+
+    def __init__(self, session_bytes=DEFAULT_SESSION_BYTES, global_bytes=DEFAULT_GLOBAL_BYTES, dedup_min_bytes=DEDUP_MIN_BYTES):
+        self.session_bytes = session_bytes
+        self.global_bytes = global_bytes
+        self.dedup_min_bytes = dedup_min_bytes
+        self._entries = OrderedDict()  # (session_id, nama) -> _Entry, urutan LRU
+        self._blobs = {}  # fingerprint -> _Blob
+        self._by_id = {}  # id(objek) -> fingerprint, jalur cepat untuk objek yang sama
+        self._total = 0
+        self._lock = threading.RLock()
+        self.stats = {"evictions": 0, "evicted_bytes": 0, "dedup_hits": 0, "dedup_bytes": 0}
+
+    def _fingerprint(self, obj):
+        with self._lock:
+            fp = self._by_id.get(id(obj))
+        if fp is not None:
+            return fp, None
+        # Hash konten dihitung di luar lock: bisa lama untuk model besar
+        size = sizeof(obj)
+        if size < self.dedup_min_bytes:
+            return f"id:{id(obj)}", size
+        return joblib.hash(obj), size
+
+    def _acquire(self, obj, fp, size):
+        blob = self._blobs.get(fp)
+        if blob is None:
+            # size None: objek dikenali lewat id tetapi blob-nya baru saja dilepas sesi lain
+            blob = self._blobs[fp] = _Blob(obj, sizeof(obj) if size is None else size)
+            self._by_id[id(obj)] = fp
+            self._total += blob.size
+        elif blob.obj is not obj:
+            # Model identik dari sesi lain: objek yang sudah ada dipakai bersama
+            self.stats["dedup_hits"] += 1
+            self.stats["dedup_bytes"] += blob.size
+        blob.refs += 1
+        return blob
+
+    def _release(self, fp):
+        blob = self._blobs[fp]
+        blob.refs -= 1
+        if blob.refs <= 0:
+            del self._blobs[fp]
+            self._by_id.pop(id(blob.obj), None)
+            self._total -= blob.size
+            if isinstance(blob.obj, TempFile):
+                blob.obj.remove()
+
+    def put(self, session_id, name, value, essential=None):
+        # Nilai dict dipecah per item supaya tiap model di dalamnya bisa di-dedup sendiri
+        is_dict = isinstance(value, dict)
+        items = value.items() if is_dict else [(None, value)]
+        fingerprints = {k: (v, *self._fingerprint(v)) for k, v in items}
+        if essential is None:
+            essential = name in ESSENTIAL
+
+        key = (session_id, name)
+        with self._lock:
+            parts = {k: fp for k, (v, fp, size) in fingerprints.items()}
+            for v, fp, size in fingerprints.values():
+                self._acquire(v, fp, size)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                for fp in old.parts.values():
+                    self._release(fp)
+            self._entries[key] = _Entry(parts, is_dict, essential)
+            self._evict(session_id, protect=key)
+            return self._value(self._entries[key])
+
+    def _value(self, entry):
+        if entry.is_dict:
+            return {k: self._blobs[fp].obj for k, fp in entry.parts.items()}
+        return self._blobs[entry.parts[None]].obj
+
+    def get(self, session_id, name, default=None):
+        key = (session_id, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return self._value(entry)
+
+    def discard(self, session_id, name):
+        with self._lock:
+            entry = self._entries.pop((session_id, name), None)
+            if entry is not None:
+                for fp in entry.parts.values():
+                    self._release(fp)
+
+    def drop_session(self, session_id):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == session_id]:
+                self.discard(*key)
+
+    def prune(self, is_active):
+        # Hapus artefak sesi yang sudah tidak aktif (browser ditutup)
+        with self._lock:
+            sessions = {sid for sid, _ in self._entries}
+        for sid in sessions:
+            if not is_active(sid):
+                self.drop_session(sid)
+
+    def session_size(self, session_id):
+        # Blob yang dipakai beberapa artefak dalam sesi yang sama dihitung sekali
+        with self._lock:
+            fps = {fp for (sid, _), e in self._entries.items() if sid == session_id for fp in e.parts.values()}
+            return sum(self._blobs[fp].size for fp in fps)
+
+    def _victim(self, session_id, protect, allow_essential):
+        # LRU, artefak non-esensial lebih dulu; artefak yang baru disimpan tidak ikut dievict
+        fallback = None
+        for key, entry in self._entries.items():
+            if key == protect or (session_id is not None and key[0] != session_id):
+                continue
+            if not entry.essential:
+                return key
+            if allow_essential and fallback is None:
+                fallback = key
+        return fallback
+
+    def _evict_one(self, key):
+        before = self._total
+        self.discard(*key)
+        self.stats["evictions"] += 1
+        self.stats["evicted_bytes"] += before - self._total
+
+    def _evict(self, session_id, protect=None):
+        # Anggaran sesi hanya mengevict artefak non-esensial sesi itu sendiri; anggaran global
+        # boleh mengevict model terpilih sesi lain (paling lama tidak dipakai) sebagai upaya terakhir
+        while self.session_size(session_id) > self.session_bytes:
+            key = self._victim(session_id, protect, allow_essential=False)
+            if key is None:
+                break
+            self._evict_one(key)
+        while self._total > self.global_bytes:
+            key = self._victim(None, protect, allow_essential=True)
+            if key is None:
+                break
+            self._evict_one(key)
+
+    def snapshot(self, session_id=None):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["sessions"] = len({sid for sid, _ in self._entries})
+            stats["entries"] = len(self._entries)
+            stats["global_bytes"] = self._total
+            stats["global_budget"] = self.global_bytes
+            stats["session_budget"] = self.session_bytes
+            if session_id is not None:
+                stats["session_bytes"] = self.session_size(session_id)
+        return stats
+
+
+# Satu store per proses, dipakai bersama oleh semua sesi Streamlit
+get_default_store = singleton.lazy_default(ArtifactStore)
+
+
+def current_session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "lokal"
+
+
+def is_active_session(session_id):
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return True
+    return runtime.get_instance().is_active_session(session_id)
+
+
+class SessionArtifacts:
+    """Akses dict-like ke artefak sesi Streamlit yang sedang berjalan."""
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+
+    def get(self, name, default=None):
+        return self.store.get(self.session_id, name, default)
+
+    def put(self, name, value, essential=None):
+        # Sesi yang sudah ditutup dibersihkan sebelum artefak baru masuk hitungan anggaran
+        self.store.prune(is_active_session)
+        return self.store.put(self.session_id, name, value, essential)
+
+    def pop(self, name, default=None):
+        value = self.get(name, default)
+        self.store.discard(self.session_id, name)
+        return value
+
+    def __getitem__(self, name):
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.put(name, value)
+
+    def __contains__(self, name):
+        return self.get(name, _MISSING) is not _MISSING
+
+    def snapshot(self):
+        return self.store.snapshot(self.session_id)
+
+
+_MISSING = object()
+
+
+def session_artifacts():
+    return SessionArtifacts(get_default_store(), current_session_id())
@@ -0,0 +1,15 @@
+import threading
+
+
+def lazy_default(factory):
+    # Getter instance tunggal per proses (dibuat saat pertama dipakai), dipakai bersama semua sesi
+    instance = None
+    lock = threading.Lock()
+
+    def get():
+        nonlocal instance
+        with lock:
+            if instance is None:
+                instance = factory()
+            return instance
+    return get
@@ -0,0 +1,193 @@
+import functools
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from src_model import prediction, validation
+from src_model.schema import FEATURE_COLS, LAT_COL, LON_COL, T2_COL
+
+BOUNDARY_TYPES = ["geojson", "json", "gpkg", "zip"]
+# Kolom nama wilayah pada file batas administrasi, urutan prioritas (nama kolom lowercase)
+NAME_CANDIDATES = ["kecamatan", "wadmkc", "kelurahan", "wadmkd", "namobj", "district", "nama", "name"]
+COORD_ALIASES = {"latitude": LAT_COL, "longitude": LON_COL, "lng": LON_COL}
+DISTRICT_COL = "wilayah"
+COUNT_COL = "jumlah_titik"
+# Resolusi grid bantu (sel per sisi) dan ukuran chunk titik saat join
+GRID_CELLS = 256
+CHUNK_ROWS = 1_000_000
+
+
+class DistrictIndex:
+    """Poligon wilayah dengan STRtree dan grid bantu untuk join titik-ke-wilayah secara vektor."""
+
+    def __init__(self, names, geometries, grid_cells=GRID_CELLS):
+        self.names = [str(n) for n in names]
+        self.geometries = shapely.make_valid(np.asarray(geometries, dtype=object))
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+        self.grid_cells = grid_cells
+
+        xmin, ymin, xmax, ymax = shapely.total_bounds(self.geometries)
+        self.origin = (xmin, ymin)
+        self.cell_size = (max(xmax - xmin, 1e-12) / grid_cells, max(ymax - ymin, 1e-12) / grid_cells)
+        ix, iy = np.meshgrid(np.arange(grid_cells), np.arange(grid_cells))
+        x0 = xmin + ix.ravel() * self.cell_size[0]
+        y0 = ymin + iy.ravel() * self.cell_size[1]
+        boxes = shapely.box(x0, y0, x0 + self.cell_size[0], y0 + self.cell_size[1])
+
+        # Sel yang seluruhnya berada di dalam satu wilayah dipetakan langsung tanpa uji geometri;
+        # sel yang memotong batas wilayah menyimpan kandidat wilayah dari STRtree
+        self.cell_owner = np.full(len(boxes), -1, dtype=np.int32)
+        cell_idx, geom_idx = self.tree.query(boxes, predicate="within")
+        self.cell_owner[cell_idx] = geom_idx
+        cell_idx, geom_idx = self.tree.query(boxes, predicate="intersects")
+        border = self.cell_owner[cell_idx] < 0
+        cell_idx, geom_idx = cell_idx[border], geom_idx[border]
+        border_cells = np.unique(cell_idx)
+        self.border_row = np.full(len(boxes), -1, dtype=np.int32)
+        self.border_row[border_cells] = np.arange(len(border_cells))
+        self.border_candidates = np.zeros((len(border_cells), len(self.names)), dtype=bool)
+        self.border_candidates[self.border_row[cell_idx], geom_idx] = True
+
+    def __len__(self):
+        return len(self.names)
+
+    def assign(self, lon, lat, chunk_rows=CHUNK_ROWS):
+        # Kode wilayah per titik (indeks ke self.names), -1 untuk titik di luar semua wilayah
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+        codes = np.empty(len(lon), dtype=np.int32)
+        for start in range(0, len(lon), chunk_rows):
+            stop = start + chunk_rows
+            codes[start:stop] = self._assign_chunk(lon[start:stop], lat[start:stop])
+        return codes
+
+    def _assign_chunk(self, x, y):
+        g = self.grid_cells
+        ix = np.floor((x - self.origin[0]) / self.cell_size[0]).astype(np.int64)
+        iy = np.floor((y - self.origin[1]) / self.cell_size[1]).astype(np.int64)
+        inside = (ix >= 0) & (ix < g) & (iy >= 0) & (iy < g)
+        cell = np.where(inside, iy * g + ix, 0)
+        codes = np.where(inside, self.cell_owner[cell], -1).astype(np.int32)
+
+        # Hanya titik di sel perbatasan yang diuji point-in-polygon, per kandidat wilayah
+        row = np.where(inside, self.border_row[cell], -1)
+        border = np.flatnonzero(row >= 0)
+        if len(border):
+            candidates = self.border_candidates[row[border]]
+            for k in np.flatnonzero(candidates.any(axis=0)):
+                idx = border[candidates[:, k]]
+                idx = idx[codes[idx] < 0]
+                hit = shapely.contains_xy(self.geometries[k], x[idx], y[idx])
+                codes[idx[hit]] = k
+        return codes
+
+
+def _name_column(columns):
+    lower = {str(c).strip().lower(): c for c in columns}
+    for name in NAME_CANDIDATES:
+        if name in lower:
+            return lower[name]
+    return None
+
+
+def read_districts(source=None, name_col=None, grid_cells=GRID_CELLS):
+    # source: path/file-like/bytes GeoJSON, GeoPackage atau shapefile (zip); None = batas bawaan
+    import geopandas as gpd
+
+    from src_model import choropleth
+
+    if source is None:
+        source = choropleth.BOUNDARY_PATH
+    elif isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    try:
+        gdf = gpd.read_file(source)
+    except Exception as e:
+        raise ValueError(f"File batas wilayah tidak dapat dibaca. ({e})") from e
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    gdf = gdf[gdf.geometry.notna() & ~gdf.geometry.is_empty]
+    if not len(gdf):
+        raise ValueError("File batas wilayah tidak berisi poligon.")
+
+    col = name_col or _name_column(gdf.columns)
+    names = gdf[col].astype(str).tolist() if col else [f"Wilayah {i + 1}" for i in range(len(gdf))]
+    return DistrictIndex(names, gdf.geometry.values, grid_cells)
+
+
+@functools.lru_cache(maxsize=8)
+def load_districts(data=None, name_col=None):
+    # Indeks dibangun sekali per isi file batas (bytes) per proses
+    return read_districts(data, name_col)
+
+
+def upload_columns(feature_cols=FEATURE_COLS):
+    # Kolom yang dibaca dari upload titik (termasuk alias nama koordinat)
+    return list(feature_cols) + [LAT_COL, LON_COL, *COORD_ALIASES]
+
+
+def point_matrix(df, feature_cols=FEATURE_COLS):
+    # Matriks [fitur..., lon, lat] bersih: baris kosong / tak hingga / 0 dibuang (seperti cleansing training)
+    df = df.rename(columns=lambda c: COORD_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+    M, report = validation.clean_rows(
+        validation.feature_matrix(df, list(feature_cols) + [LON_COL, LAT_COL], min_rows=1), inplace=True
+    )
+    if report.n_clean == 0:
+        raise validation.ValidationError("Tidak ada titik valid setelah cleansing.")
+    p = len(feature_cols)
+    return M[:, :p], M[:, p], M[:, p + 1], report
+
+
+def aggregate(codes, X, n_districts):
+    # Jumlah titik dan rata-rata tiap polutan per wilayah dengan bincount (tanpa groupby)
+    valid = codes >= 0
+    c = codes[valid]
+    counts = np.bincount(c, minlength=n_districts)
+    means = np.full((n_districts, X.shape[1]), np.nan)
+    has = counts > 0
+    for j in range(X.shape[1]):
+        sums = np.bincount(c, weights=X[:, j][valid], minlength=n_districts)
+        means[has, j] = sums[has] / counts[has]
+    return counts, means
+
+
+def classify_points(df, index, model, scaler, t2_model, feature_cols=FEATURE_COLS):
+    # Titik -> wilayah (join spasial) -> rata-rata polutan per wilayah -> prediksi SVM & T² per wilayah
+    X, lon, lat, report = point_matrix(df, feature_cols)
+    start = time.perf_counter()
+    codes = index.assign(lon, lat)
+    join_seconds = time.perf_counter() - start
+
+    counts, means = aggregate(codes, X, len(index))
+    table = pd.DataFrame(means, columns=list(feature_cols))
+    table.insert(0, COUNT_COL, counts)
+    table.insert(0, DISTRICT_COL, index.names)
+    table[prediction.PRED_COL] = None
+    table[T2_COL] = np.nan
+    has = counts > 0
+    if has.any():
+        labels, t2_values = prediction.score_array(means[has], model, scaler, t2_model)
+        table.loc[has, prediction.PRED_COL] = [str(v).strip().lower() for v in labels]
+        table.loc[has, T2_COL] = t2_values
+
+    n_inside = int(counts.sum())
+    if n_inside == 0:
+        raise validation.ValidationError("Tidak ada titik yang berada di dalam batas wilayah.")
+    # Ringkasan keseluruhan: rata-rata semua titik yang masuk wilayah
+    overall = X[codes >= 0].mean(axis=0)
+    label, t2_value = prediction.score_array(overall[None, :], model, scaler, t2_model)
+    return table, {
+        "rows": report.n_rows,
+        "clean": report.n_clean,
+        "inside": n_inside,
+        "outside": report.n_clean - n_inside,
+        "join_seconds": join_seconds,
+        "points_per_s": report.n_clean / join_seconds if join_seconds > 0 else float("inf"),
+        "overall_label": str(label[0]).strip().lower(),
+        "overall_t2": float(t2_value[0]),
+        "overall_means": dict(zip(feature_cols, overall.tolist())),
+    }
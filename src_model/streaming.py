@@ -0,0 +1,164 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src_model.hotelling import HotellingT2, LABEL_BAIK, LABEL_KURANG_BAIK
+from src_model.schema import FEATURE_COLS, LABEL_COL, T2_COL
+from src_model.validation import MISSING, NON_FINITE, REASONS, ZERO, clean_rows
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+
+def _is_parquet(path):
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, feature_cols=FEATURE_COLS):
+    # Menghasilkan array float64 (k, p) per chunk dengan urutan kolom feature_cols;
+    # hanya kolom fitur yang dibaca dari disk
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(path)
+        names = {name.strip().lower(): name for name in pf.schema_arrow.names}
+        missing_cols = [c for c in feature_cols if c not in names]
+        if missing_cols:
+            raise ValueError(f"Dataset tidak valid — kolom hilang: {missing_cols}")
+        columns = [names[c] for c in feature_cols]
+        for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+            X = np.empty((batch.num_rows, len(columns)), dtype=float)
+            for j, name in enumerate(columns):
+                X[:, j] = batch.column(name).to_numpy(zero_copy_only=False)
+            yield X
+        return
+
+    wanted = set(feature_cols)
+    reader = pd.read_csv(
+        path,
+        usecols=lambda c: str(c).strip().lower() in wanted,
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        chunk.columns = chunk.columns.astype(str).str.strip().str.lower()
+        missing_cols = [c for c in feature_cols if c not in chunk.columns]
+        if missing_cols:
+            raise ValueError(f"Dataset tidak valid — kolom hilang: {missing_cols}")
+        yield chunk[list(feature_cols)].to_numpy(dtype=float)
+
+
+def clean_chunk(X):
+    # Aturan cleansing yang sama dengan training (validation.clean_rows); baris kosong juga
+    # dibuang (bukan error) karena tidak ada validasi UI di mode streaming. Chunk milik pemanggil,
+    # jadi dipadatkan in-place
+    X_clean, report = clean_rows(X, inplace=True)
+    counts = report.counts
+    return X_clean, {
+        "rows": report.n_rows,
+        "non_finite": counts[REASONS[MISSING]] + counts[REASONS[NON_FINITE]],
+        "zero": counts[REASONS[ZERO]],
+    }
+
+
+class RunningMoments:
+    """Akumulasi mean dan kovarians per chunk (penggabungan paralel Chan et al.)."""
+
+    def __init__(self, p):
+        self.n = 0
+        self.mean = np.zeros(p)
+        self.m2 = np.zeros((p, p))
+
+    def update(self, X):
+        if len(X) == 0:
+            return self
+        other = RunningMoments(X.shape[1])
+        other.n = len(X)
+        other.mean = X.mean(axis=0)
+        Xc = X - other.mean
+        other.m2 = Xc.T @ Xc
+        return self.merge(other)
+
+    def merge(self, other):
+        n = self.n + other.n
+        if other.n == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.n * other.n / n)
+        self.n = n
+        return self
+
+    @property
+    def cov(self):
+        return self.m2 / (self.n - 1)
+
+
+def fit_streaming(path, alpha=0.01, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # Pass pertama: cleansing per chunk dan akumulasi mean/kovarians
+    moments = RunningMoments(len(FEATURE_COLS))
+    stats = {"rows": 0, "non_finite": 0, "zero": 0}
+    for X in iter_chunks(path, chunk_rows):
+        X_clean, chunk_stats = clean_chunk(X)
+        moments.update(X_clean)
+        for k, v in chunk_stats.items():
+            stats[k] += v
+    stats["clean_rows"] = moments.n
+
+    if moments.n <= len(FEATURE_COLS):
+        raise ValueError("UCL tidak dapat dihitung karena n <= p.")
+    model = HotellingT2(alpha=alpha).fit_moments(moments.mean, moments.cov, moments.n)
+    return model, stats
+
+
+def label_streaming(path, model, out_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # Pass kedua: hitung T² dan kategori per chunk lalu tulis langsung ke disk
+    counts = {LABEL_BAIK: 0, LABEL_KURANG_BAIK: 0}
+    writer = None
+    first = True
+    try:
+        for X in iter_chunks(path, chunk_rows):
+            X_clean, _ = clean_chunk(X)
+            t2 = model.score(X_clean)
+            labels = model.predict(X_clean, t2)
+            out = pd.DataFrame(X_clean, columns=FEATURE_COLS)
+            out[T2_COL] = t2
+            out[LABEL_COL] = labels
+            for k in counts:
+                counts[k] += int((labels == k).sum())
+
+            if _is_parquet(out_path):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(out, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table)
+            else:
+                out.to_csv(out_path, mode="w" if first else "a", header=first, index=False)
+            first = False
+    finally:
+        if writer is not None:
+            writer.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Labeling Hotelling's T² secara streaming untuk dataset yang lebih besar dari RAM."
+    )
+    parser.add_argument("input", help="File CSV/Parquet input")
+    parser.add_argument("output", help="File CSV/Parquet output berlabel")
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    model, stats = fit_streaming(args.input, args.alpha, args.chunk_rows)
+    print(f"Jumlah data setelah cleansing: {stats['clean_rows']} dari {stats['rows']}")
+    print(f"Upper Control Limit (UCL) untuk T²: {model.ucl_:.4f}")
+    counts = label_streaming(args.input, model, args.output, args.chunk_rows)
+    print(f"Jumlah Baik: {counts[LABEL_BAIK]}  Jumlah Kurang Baik: {counts[LABEL_KURANG_BAIK]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+
+from sklearn.kernel_approximation import Nystroem
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.svm import SVC, LinearSVC
+
+# Di atas jumlah baris ini SVC(kernel='linear') (libsvm) diganti LinearSVC (liblinear)
+# yang waktu trainingnya kurang lebih linear terhadap jumlah baris
+LINEAR_SVC_MAX_ROWS = int(os.environ.get("JAKAIR_LINEAR_SVC_MAX_ROWS", 100_000))
+
+# Cache kernel libsvm (MB): default sklearn 200, diperkecil di mode hemat memori
+# (hanya mempengaruhi kecepatan fit, bukan model yang dihasilkan)
+DEFAULT_CACHE_MB = 200
+LOW_MEMORY_CACHE_MB = 32
+
+
+def use_liblinear(n_rows, max_rows=None):
+    if max_rows is None:
+        max_rows = LINEAR_SVC_MAX_ROWS
+    return n_rows > max_rows
+
+
+def make_linear_model(C_val, n_rows, max_rows=None, cache_size=DEFAULT_CACHE_MB):
+    if use_liblinear(n_rows, max_rows):
+        return LinearSVC(C=C_val, dual="auto", max_iter=10_000)
+    return SVC(kernel='linear', C=C_val, cache_size=cache_size)
+
+
+def make_rbf_model(C_val, gamma_val, cache_size=DEFAULT_CACHE_MB):
+    return SVC(kernel='rbf', C=C_val, gamma=gamma_val, cache_size=cache_size)
+
+
+def backend_name(model):
+    if isinstance(model, Pipeline):
+        nystroem = model.steps[0][1]
+        return f"Nystroem ({nystroem.n_components} komponen) + liblinear"
+    return "liblinear (LinearSVC)" if isinstance(model, LinearSVC) else "libsvm (SVC)"
+
+
+# Subsampel maksimum untuk model RBF eksak pembanding saat mode aproksimasi
+RBF_REFERENCE_MAX_ROWS = 20_000
+
+
+def make_approx_rbf_model(C_val, gamma_val, n_components, random_state=42):
+    # Fitur Nystroem + classifier linear: training mendekati linear terhadap jumlah
+    # baris dan biaya prediksi tetap (n_components), tidak bergantung support vector
+    return make_pipeline(
+        Nystroem(kernel="rbf", gamma=gamma_val, n_components=n_components, random_state=random_state),
+        LinearSVC(C=C_val, dual="auto", max_iter=10_000),
+    )
+
+
+def reference_sample(X, y, max_rows=None, random_state=42):
+    if max_rows is None:
+        max_rows = RBF_REFERENCE_MAX_ROWS
+    if len(y) <= max_rows:
+        return X, y
+    X_ref, _, y_ref, _ = train_test_split(
+        X, y, train_size=max_rows, random_state=random_state, stratify=y
+    )
+    return X_ref, y_ref
@@ -0,0 +1,219 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from src_model.ingest import PeakRSS
+
+# Instrumentasi per tahap (waktu wall, waktu CPU, puncak memori) untuk jalur training dan prediksi.
+# Nonaktif secara default; JAKAIR_TRACE=1 mengaktifkan untuk semua sesi (atau lewat panel diagnostik)
+ENABLED = os.environ.get("JAKAIR_TRACE", "").lower() in ("1", "true", "ya")
+DEFAULT_TRACE_DIR = os.environ.get("JAKAIR_TRACE_DIR", os.path.join(".cache", "traces"))
+# Interval sampling RSS per tahap (detik)
+RSS_INTERVAL = 0.005
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTrace:
+    """Trace nonaktif: semua operasi tidak melakukan apa-apa (tanpa timer, thread sampler, atau alokasi)."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def wrap(self, name, fn):
+        return fn
+
+    def to_dict(self):
+        return None
+
+    def save(self, directory=DEFAULT_TRACE_DIR):
+        return None
+
+
+NULL_TRACE = NullTrace()
+
+
+class _Stage:
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.parent = self.trace._stack[-1] if self.trace._stack else None
+        self.trace._stack.append(self.name)
+        self.mem = PeakRSS(RSS_INTERVAL).__enter__()
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu
+        self.mem.__exit__(exc_type, exc, tb)
+        self.trace._stack.pop()
+        self.trace._add(
+            name=self.name,
+            parent=self.parent,
+            start_s=self.start - self.trace._t0,
+            wall_s=wall,
+            cpu_s=cpu,
+            cpu_scope="proses",
+            peak_rss_bytes=self.mem.peak_bytes,
+            error=exc_type.__name__ if exc_type is not None else None,
+        )
+        return False
+
+
+class Trace:
+    """Rekaman tahap satu run (training, prediksi, render halaman), diekspor sebagai file JSON."""
+
+    enabled = True
+
+    def __init__(self, name, **meta):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.meta = meta
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.stages = []
+        self._stack = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def stage(self, name):
+        # Tahap bersarang dicatat dengan parent; CPU = waktu CPU seluruh proses (termasuk thread fit
+        # paralel, juga sesi lain yang berjalan bersamaan), memori = kenaikan puncak RSS sejak awal tahap
+        return _Stage(self, name)
+
+    def wrap(self, name, fn):
+        # Untuk fungsi yang dijalankan di thread pool (fit SVM paralel): waktu CPU thread itu saja;
+        # puncak memori tidak dicatat karena RSS tidak bisa dipisah per thread
+        parent = self._stack[-1] if self._stack else None
+
+        def run(*args, **kwargs):
+            cpu = time.thread_time()
+            start = time.perf_counter()
+            error = None
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self._add(
+                    name=name,
+                    parent=parent,
+                    start_s=start - self._t0,
+                    wall_s=time.perf_counter() - start,
+                    cpu_s=time.thread_time() - cpu,
+                    cpu_scope="thread",
+                    peak_rss_bytes=None,
+                    error=error,
+                )
+        return run
+
+    def _add(self, **span):
+        with self._lock:
+            self.stages.append(span)
+
+    def to_dict(self):
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s["start_s"])
+        return {
+            "id": self.id,
+            "name": self.name,
+            "created_at": self.created_at,
+            "meta": self.meta,
+            "total_s": time.perf_counter() - self._t0,
+            "stages": stages,
+        }
+
+    def save(self, directory=DEFAULT_TRACE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S}-{self.name}-{self.id}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2, default=str)
+        return path
+
+
+def start(name, enabled=None, **meta):
+    # enabled=None mengikuti JAKAIR_TRACE; trace nonaktif adalah NULL_TRACE bersama
+    if not (ENABLED if enabled is None else enabled):
+        return NULL_TRACE
+    return Trace(name, **meta)
+
+
+def stages_frame(trace):
+    # Satu baris per tahap; trace berupa Trace atau dict hasil to_dict / file JSON
+    data = trace.to_dict() if isinstance(trace, Trace) else trace
+    df = pd.DataFrame(data["stages"], columns=[
+        "name", "parent", "start_s", "wall_s", "cpu_s", "cpu_scope", "peak_rss_bytes", "error"
+    ])
+    df.insert(0, "trace", data["name"])
+    df.insert(1, "trace_id", data["id"])
+    return df
+
+
+def load_traces(directory=DEFAULT_TRACE_DIR, name=None):
+    frames = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        if name is None or data.get("name") == name:
+            frames.append(stages_frame(data))
+    if not frames:
+        return stages_frame({"name": None, "id": None, "stages": []})
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize(df):
+    # Agregasi antar run: median / p95 waktu wall, median CPU, puncak memori maksimum per tahap
+    if not len(df):
+        return pd.DataFrame()
+    grouped = df.groupby(["trace", "name"], sort=False)
+    return pd.DataFrame({
+        "runs": grouped.size(),
+        "wall_median_s": grouped["wall_s"].median(),
+        "wall_p95_s": grouped["wall_s"].quantile(0.95),
+        "cpu_median_s": grouped["cpu_s"].median(),
+        "peak_rss_max_mb": grouped["peak_rss_bytes"].max() / 1024 ** 2,
+    }).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ringkasan file trace per tahap dari beberapa run.")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_TRACE_DIR)
+    parser.add_argument("--name", help="Hanya trace dengan nama ini (mis. training)")
+    parser.add_argument("--csv", help="Tulis semua tahap (tanpa agregasi) ke file CSV")
+    args = parser.parse_args()
+
+    df = load_traces(args.directory, args.name)
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    if not len(df):
+        print(f"Tidak ada trace di {args.directory}")
+        return
+    print(f"{df['trace_id'].nunique()} trace, {len(df)} tahap dari {args.directory}")
+    print(summarize(df).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+
+if __name__ == "__main__":
+    main()
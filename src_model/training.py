@@ -0,0 +1,303 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from src_model import metrics, result_cache, svm_backend, tracing, validation
+from src_model.hotelling import HotellingT2, LABEL_BAIK, LABEL_KURANG_BAIK
+from src_model.schema import FEATURE_COLS, LABEL_COL, T2_COL
+
+KERNEL_NAMES = {"linear": "Linear", "rbf": "RBF"}
+
+
+class TrainingError(ValueError):
+    pass
+
+
+@dataclass
+class TrainingConfig:
+    C: float
+    gamma: float
+    alpha: float = 0.01  # Mempengaruhi jumlah kategori "baik" vs "kurang baik"
+    defer_refit: bool = False
+    linear_max_rows: Optional[int] = None
+    rbf_components: Optional[int] = None
+    low_memory: bool = False  # Fitur float32, label kategorikal, satu buffer float64 bersama untuk SVM
+    test_size: float = 0.2
+    random_state: int = 42
+
+
+@dataclass
+class TrainingBundle:
+    config: TrainingConfig
+    feature_cols: list
+    n_input_rows: int
+    labeled: pd.DataFrame  # Data bersih + kolom T2_stat dan kategori_multivariat
+    t2: HotellingT2
+    scaler: StandardScaler
+    models: dict  # linear, rbf, linear_final, rbf_final (+ X_full/y_full jika refit ditunda)
+    results: dict  # Metrik per kernel ("Linear", "RBF", opsional "RBF Eksak")
+    backends: dict = field(default_factory=dict)
+    cache_source: Optional[str] = None  # "memori"/"disk" jika diambil dari cache
+    report: Optional[validation.ValidationReport] = None  # Baris yang ditolak saat cleansing
+    intervals: Optional[dict] = None  # CI bootstrap metrik per kernel + selisih RBF - Linear
+
+    @property
+    def label_counts(self):
+        return self.labeled[LABEL_COL].value_counts()
+
+    def extremes(self, k=10):
+        # k data dengan T² terendah (paling baik) dan tertinggi (paling kurang baik);
+        # seleksi parsial O(n) lalu hanya k baris yang diurutkan, tanpa salinan terurut seluruh data
+        t2 = self.labeled[T2_COL].to_numpy()
+        k = min(k, len(t2))
+        if k == 0:
+            empty = self.labeled.iloc[:0].drop(columns=[LABEL_COL])
+            return empty, empty
+        lowest = np.argpartition(t2, k - 1)[:k]
+        lowest = lowest[np.argsort(t2[lowest], kind="stable")]
+        highest = np.argpartition(t2, len(t2) - k)[-k:]
+        highest = highest[np.argsort(-t2[highest], kind="stable")]
+        return (
+            self.labeled.iloc[lowest].drop(columns=[LABEL_COL]),
+            self.labeled.iloc[highest].drop(columns=[LABEL_COL]),
+        )
+
+    @property
+    def trained_t2(self):
+        return {
+            "model": self.t2,
+            "mean": self.t2.mean_,
+            "UCL": self.t2.ucl_,
+            "feature_cols": self.feature_cols
+        }
+
+
+def compute_metrics(y_test, y_pred):
+    # Semua metrik dari satu confusion matrix (satu lintasan atas y_test)
+    return metrics.compute_metrics(y_test, y_pred)
+
+
+def _fit(model, X, y):
+    return model.fit(X, y)
+
+
+def fit_models_parallel(fit_jobs, max_workers=None, trace=tracing.NULL_TRACE):
+    # libsvm melepas GIL saat fit, jadi thread pool cukup untuk paralel
+    # tanpa menyalin data ke proses lain
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    pool = ThreadPoolExecutor(max_workers=min(len(fit_jobs), max_workers))
+    try:
+        futures = {pool.submit(trace.wrap(f"fit {name}", _fit), *job): name for name, job in fit_jobs.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Jika pemanggil berhenti di tengah (job dibatalkan), fit yang belum mulai tidak dijalankan;
+        # fit yang sedang berjalan di libsvm tidak bisa diinterupsi dan ditunggu selesai
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def ensure_final_model(trained_models, kernel):
+    # Refit data penuh untuk kernel terpilih jika sebelumnya ditunda
+    key = f"{kernel}_final"
+    if trained_models.get(key) is None:
+        model = clone(trained_models[kernel])
+        trained_models[key] = model.fit(trained_models["X_full"], trained_models["y_full"])
+        if all(trained_models.get(f"{k}_final") is not None for k in KERNEL_NAMES):
+            trained_models.pop("X_full", None)
+            trained_models.pop("y_full", None)
+    return trained_models[key]
+
+
+def drop_eval_models(models):
+    # Model split hanya dipakai untuk metrik evaluasi; setelah itu cukup disimpan sebagai
+    # estimator belum di-fit (parameternya masih dipakai ensure_final_model untuk refit)
+    return {k: clone(v) if k in KERNEL_NAMES and v is not None else v for k, v in models.items()}
+
+
+def label_dataframe(df_clean, alpha=0.01, feature_cols=FEATURE_COLS, low_memory=False):
+    # Labeling Hotelling's T²; kolom T2_stat dan kategori_multivariat ditambahkan in-place
+    X = df_clean[feature_cols].to_numpy()
+    # Diperiksa sebelum fit: dengan n <= p kovarians NaN dan faktorisasi Cholesky gagal lebih dulu
+    if len(X) <= len(feature_cols):
+        raise TrainingError(
+            f"UCL tidak dapat dihitung karena n <= p ({len(X)} baris bersih untuk {len(feature_cols)} fitur)."
+        )
+    t2_model = HotellingT2(alpha=alpha).fit(X)
+
+    t2_values = t2_model.score(X)
+    if low_memory:
+        # T² disimpan float32 dan label sebagai kategori (1 byte/baris); kategori tetap
+        # ditentukan dari T² float64 sebelum dibulatkan
+        df_clean[T2_COL] = t2_values.astype(np.float32)
+        df_clean[LABEL_COL] = pd.Categorical.from_codes(
+            (t2_values > t2_model.ucl_).astype(np.int8), categories=[LABEL_BAIK, LABEL_KURANG_BAIK]
+        )
+    else:
+        df_clean[T2_COL] = t2_values
+        # Label lowercase supaya konsisten
+        df_clean[LABEL_COL] = t2_model.predict(X, t2_values)
+    return t2_model
+
+
+def shared_split(X_scaled, y, config, chunk_rows=65536):
+    # Mode hemat memori: libsvm/liblinear hanya menerima float64, jadi data disalin sekali ke satu
+    # buffer float64 dengan baris latih di depan. X_train/X_test menjadi view dari buffer itu dan
+    # model final memakai buffer yang sama, bukan salinan terpisah per job.
+    y = np.asarray(y)
+    train_idx, test_idx = train_test_split(
+        np.arange(len(y)),
+        test_size=config.test_size,
+        random_state=config.random_state,
+        stratify=y
+    )
+    order = np.concatenate([train_idx, test_idx])
+    X_all = np.empty(X_scaled.shape, dtype=np.float64)
+    for start in range(0, len(order), chunk_rows):
+        X_all[start:start + chunk_rows] = X_scaled[order[start:start + chunk_rows]]
+    y_all = y[order]
+    n_train = len(train_idx)
+    return X_all, y_all, X_all[:n_train], X_all[n_train:], y_all[:n_train], y_all[n_train:]
+
+
+def _report(progress, stage, fraction):
+    if progress is not None:
+        progress(stage, fraction)
+
+
+def fit_models(X_scaled, y, config, progress=None, max_workers=None, trace=tracing.NULL_TRACE):
+    with trace.stage("Split data"):
+        if config.low_memory:
+            X_full, y_full, X_train, X_test, y_train, y_test = shared_split(X_scaled, y, config)
+        else:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X_scaled,
+                y,
+                test_size=config.test_size,
+                random_state=config.random_state,
+                stratify=y
+            )
+            X_full, y_full = X_scaled, y
+
+    cache_size = svm_backend.LOW_MEMORY_CACHE_MB if config.low_memory else svm_backend.DEFAULT_CACHE_MB
+    linear_model = svm_backend.make_linear_model(config.C, len(y), config.linear_max_rows, cache_size)
+    if config.rbf_components:
+        rbf_model = svm_backend.make_approx_rbf_model(config.C, config.gamma, config.rbf_components)
+    else:
+        rbf_model = svm_backend.make_rbf_model(config.C, config.gamma, cache_size)
+
+    # Model split (evaluasi) dan model final 100% data dilatih paralel;
+    # metrik dihitung begitu model split selesai
+    fit_jobs = {
+        "linear": (linear_model, X_train, y_train),
+        "rbf": (rbf_model, X_train, y_train),
+    }
+    if config.rbf_components:
+        # RBF eksak pada subsampel sebagai pembanding akurasi model aproksimasi
+        X_ref, y_ref = svm_backend.reference_sample(X_train, y_train)
+        fit_jobs["rbf_exact"] = (svm_backend.make_rbf_model(config.C, config.gamma, cache_size), X_ref, y_ref)
+    if not config.defer_refit:
+        fit_jobs["linear_final"] = (clone(linear_model), X_full, y_full)
+        fit_jobs["rbf_final"] = (clone(rbf_model), X_full, y_full)
+
+    fitted = {}
+    results = {"Linear": None, "RBF": None}
+    predictions = {}
+    # Mode hemat memori: fit dijalankan bergantian supaya memori kerja solver tidak menumpuk
+    if config.low_memory:
+        max_workers = 1
+    _report(progress, f"Training SVM ({len(fit_jobs)} model)", 0.3)
+    with trace.stage("Training SVM"):
+        for name, model in fit_models_parallel(fit_jobs, max_workers, trace):
+            fitted[name] = model
+            _report(progress, f"Fit {name} selesai", 0.3 + 0.55 * len(fitted) / len(fit_jobs))
+            if name in KERNEL_NAMES:
+                with trace.stage(f"Metrik {KERNEL_NAMES[name]}"):
+                    predictions[KERNEL_NAMES[name]] = model.predict(X_test)
+                    results[KERNEL_NAMES[name]] = compute_metrics(y_test, predictions[KERNEL_NAMES[name]])
+            elif name == "rbf_exact":
+                with trace.stage("Metrik RBF Eksak"):
+                    results["RBF Eksak"] = compute_metrics(y_test, model.predict(X_test))
+                results["RBF Eksak"]["Jumlah Data Latih"] = len(y_ref)
+
+    models = {
+        "linear": fitted["linear"],
+        "rbf": fitted["rbf"],
+        # Model final 100% data (untuk prediksi user); None jika refit ditunda
+        "linear_final": fitted.get("linear_final"),
+        "rbf_final": fitted.get("rbf_final"),
+    }
+    if config.defer_refit:
+        # Data penuh disimpan agar refit bisa dilakukan saat kernel dipilih
+        # (tetap float32 di mode hemat memori; di-upcast sementara saat refit)
+        models["X_full"] = X_scaled
+        models["y_full"] = y
+    # Resample bootstrap berpasangan atas prediksi data uji (urutan Linear lalu RBF)
+    _report(progress, "Menghitung CI bootstrap", 0.9)
+    with trace.stage("CI bootstrap"):
+        intervals = metrics.bootstrap_intervals(y_test, {k: predictions[k] for k in ("Linear", "RBF")})
+    return models, results, intervals
+
+
+def fit(data, config, cache=None, progress=None, max_workers=None, trace=tracing.NULL_TRACE):
+    # Entry point headless: cleansing -> labeling T² -> training SVM, tanpa Streamlit.
+    # data: DataFrame mentah atau validation.ValidatedData (validasi + cleansing sudah dilakukan)
+    # progress(tahap, fraksi) dipanggil di batas tahap; boleh raise untuk menghentikan training
+    # max_workers: batas thread fit paralel (default semua core)
+    # trace: tracing.Trace untuk mencatat waktu dan memori per tahap (default nonaktif)
+    feature_cols = list(FEATURE_COLS)
+    _report(progress, "Cleansing data", 0.0)
+    dtype = np.float32 if config.low_memory else np.float64
+    try:
+        with trace.stage("Cleansing"):
+            data = validation.ensure_validated(data, feature_cols, dtype)
+    except validation.ValidationError as e:
+        raise TrainingError(str(e)) from e
+    report = data.report
+
+    if cache is not None:
+        with trace.stage("Cek cache"):
+            key = result_cache.make_key(data.X, config)
+            cached, source = cache.get(key)
+        if cached is not None:
+            return replace(cached, n_input_rows=report.n_rows, cache_source=source, report=report)
+
+    # Frame berbagi buffer dengan data.X (tanpa salinan); kolom label ditambahkan setelahnya
+    _report(progress, "Labeling Hotelling's T²", 0.1)
+    with trace.stage("Labeling T²"):
+        df_clean = pd.DataFrame(data.X, columns=feature_cols, copy=False)
+        t2_model = label_dataframe(df_clean, config.alpha, feature_cols, config.low_memory)
+
+    _report(progress, "Scaling fitur", 0.25)
+    with trace.stage("Scaling"):
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(df_clean[feature_cols])
+    y = df_clean[LABEL_COL]
+    models, results, intervals = fit_models(X_scaled, y, config, progress, max_workers, trace)
+    del X_scaled, y  # Hanya dipertahankan di models jika refit ditunda
+
+    bundle = TrainingBundle(
+        config=config,
+        feature_cols=feature_cols,
+        n_input_rows=report.n_rows,
+        labeled=df_clean,
+        t2=t2_model,
+        scaler=scaler,
+        models=models,
+        results=results,
+        backends={k: svm_backend.backend_name(models[k]) for k in KERNEL_NAMES},
+        report=report,
+        intervals=intervals,
+    )
+    if cache is not None:
+        _report(progress, "Menyimpan cache", 0.97)
+        with trace.stage("Simpan cache"):
+            cache.put(key, bundle)
+    return bundle
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from src_model import disk_lru, singleton
+from src_model.schema import FEATURE_COLS
+
+DEFAULT_UPLOAD_DIR = os.environ.get("JAKAIR_UPLOAD_CACHE_DIR", os.path.join(".cache", "uploads"))
+DEFAULT_UPLOAD_BYTES = int(os.environ.get("JAKAIR_UPLOAD_CACHE_BYTES", 1024 ** 3))
+MEMORY_ITEMS = 16
+# Dinaikkan jika isi entri berubah (v2: matriks sudah dibersihkan + laporan validasi)
+FORMAT_VERSION = 2
+
+
+def content_key(file):
+    # Hash isi file upload (bukan nama) supaya file yang sama dengan nama lain tetap hit
+    h = hashlib.blake2b(digest_size=20)
+    if hasattr(file, "getbuffer"):
+        h.update(file.getbuffer())
+    else:
+        pos = file.tell()
+        file.seek(0)
+        for block in iter(lambda: file.read(1 << 20), b""):
+            h.update(block)
+        file.seek(pos)
+    h.update(f"v{FORMAT_VERSION}:{','.join(FEATURE_COLS)}".encode())
+    return h.hexdigest()
+
+
+class UploadCache:
+    """Matriks fitur upload yang sudah tervalidasi, disimpan sebagai .npy dan dibaca via memory-map."""
+
+    def __init__(self, directory=DEFAULT_UPLOAD_DIR, disk_bytes=DEFAULT_UPLOAD_BYTES, memory_items=MEMORY_ITEMS):
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.memory_items = memory_items
+        self._memory = disk_lru.MemoryLRU(memory_items)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f"{key}.{ext}")
+
+    def get(self, key):
+        # (array memmap read-only, info parse) atau (None, None)
+        with self._lock:
+            if key in self._memory:
+                self.stats["hits"] += 1
+                return self._memory.get(key)
+        try:
+            X = np.load(self._path(key, "npy"), mmap_mode="r")
+            with open(self._path(key, "json"), encoding="utf-8") as fh:
+                info = json.load(fh)
+            disk_lru.touch(self._path(key, "npy"))
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None, None
+        with self._lock:
+            self.stats["hits"] += 1
+            self._remember(key, (X, info))
+        return X, info
+
+    def put(self, key, X, info=None):
+        # Simpan atomik lalu kembalikan versi memmap supaya halaman tidak memegang salinan kedua.
+        # Matriks yang lebih besar dari batas disk, atau gagal ditulis, hanya disimpan di memori
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        info = dict(info or {})
+        if X.nbytes <= self.disk_bytes:
+            X = self._write(key, X, info)
+        with self._lock:
+            self._remember(key, (X, info))
+        return X, info
+
+    def _write(self, key, X, info):
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_npy = f"{self._path(key, 'npy')}.{suffix}"
+        tmp_json = f"{self._path(key, 'json')}.{suffix}"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_npy, "wb") as fh:
+                np.save(fh, X)
+            with open(tmp_json, "w", encoding="utf-8") as fh:
+                json.dump(info, fh)
+            os.replace(tmp_json, self._path(key, "json"))
+            os.replace(tmp_npy, self._path(key, "npy"))
+            evicted = disk_lru.evict_disk(self.directory, "npy", self.disk_bytes, keep=key, companions=("json",))
+            with self._lock:
+                for old in evicted:
+                    self._memory.pop(old)
+            return np.load(self._path(key, "npy"), mmap_mode="r")
+        except OSError:
+            for path in (tmp_npy, tmp_json):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return X
+
+    def _remember(self, key, value):
+        self._memory.put(key, value)
+
+
+get_default_cache = singleton.lazy_default(UploadCache)
@@ -0,0 +1,174 @@
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+from src_model.schema import FEATURE_COLS, LABEL_COL
+
+MIN_ROWS = 10
+CHUNK_ROWS = 65536
+
+# Kode alasan penolakan baris (0 = baris bersih)
+OK = 0
+MISSING = 1
+NON_FINITE = 2
+ZERO = 3
+REASONS = {MISSING: "nilai kosong", NON_FINITE: "nilai tak hingga", ZERO: "nilai 0"}
+
+
+class ValidationError(ValueError):
+    pass
+
+
+@dataclass
+class ValidationReport:
+    n_rows: int
+    n_clean: int
+    counts: dict  # alasan -> jumlah baris ditolak
+    rejected_index: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    rejected_reason: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint8))
+
+    @property
+    def n_rejected(self):
+        return self.n_rows - self.n_clean
+
+    def rejected_frame(self, limit=1000):
+        # Baris ditolak beserta alasannya (nomor baris = indeks data, mulai dari 0)
+        reasons = np.array([REASONS.get(int(c), "") for c in range(max(REASONS) + 1)], dtype=object)
+        return pd.DataFrame({
+            "baris": self.rejected_index[:limit],
+            "alasan": reasons[self.rejected_reason[:limit]],
+        })
+
+    def to_dict(self, limit=1000):
+        # Ringkasan JSON-able; daftar baris ditolak dipotong sampai `limit`
+        return {
+            "n_rows": int(self.n_rows),
+            "n_clean": int(self.n_clean),
+            "counts": {k: int(v) for k, v in self.counts.items()},
+            "rejected_index": self.rejected_index[:limit].tolist(),
+            "rejected_reason": self.rejected_reason[:limit].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            n_rows=d["n_rows"],
+            n_clean=d["n_clean"],
+            counts=dict(d["counts"]),
+            rejected_index=np.asarray(d.get("rejected_index", []), dtype=np.int64),
+            rejected_reason=np.asarray(d.get("rejected_reason", []), dtype=np.uint8),
+        )
+
+
+@dataclass
+class ValidatedData:
+    X: np.ndarray  # Matriks fitur kontigu (float64, atau float32 di mode hemat memori), hanya baris bersih
+    report: ValidationReport
+    feature_cols: list = field(default_factory=lambda: list(FEATURE_COLS))
+
+    def __len__(self):
+        return len(self.X)
+
+    def to_frame(self):
+        return pd.DataFrame(self.X, columns=self.feature_cols, copy=False)
+
+
+def feature_matrix(df, feature_cols=FEATURE_COLS, dtype=np.float64, min_rows=MIN_ROWS):
+    # Pemeriksaan level kolom (tanpa menyalin frame), lalu satu salinan kontigu bertipe dtype.
+    # min_rows: MIN_ROWS untuk training; jalur prediksi memakai 1 (cukup tidak kosong)
+    columns = {str(c).strip().lower(): c for c in df.columns}
+    missing_cols = [c for c in feature_cols if c not in columns]
+    if missing_cols:
+        raise ValidationError(f"Dataset tidak valid — kolom hilang: {missing_cols}")
+
+    if LABEL_COL in columns:
+        label = df[columns[LABEL_COL]]
+        filled = label[label.notna()]
+        if len(filled) and filled.astype(str).str.strip().ne("").any():
+            raise ValidationError(f"Kolom '{LABEL_COL}' harus dikosongkan sebelum training.")
+
+    selected = [columns[c] for c in feature_cols]
+    if not all(np.issubdtype(df[c].dtype, np.number) for c in selected):
+        raise ValidationError("Dataset harus berisi nilai numerik untuk semua parameter polutan.")
+
+    if len(df) < min_rows:
+        if min_rows <= 1:
+            raise ValidationError("Dataset kosong — tidak ada baris data.")
+        raise ValidationError(f"Dataset terlalu sedikit. Minimal {min_rows} baris data untuk melakukan training.")
+
+    # Diisi per kolom supaya hasilnya langsung C-contiguous (to_numpy frame multi-blok bisa F-order)
+    X = np.empty((len(df), len(selected)), dtype=dtype)
+    for j, c in enumerate(selected):
+        X[:, j] = df[c].to_numpy()
+    return X
+
+
+def clean_rows(X, inplace=False, chunk_rows=CHUNK_ROWS):
+    # Satu lintasan per chunk: klasifikasi baris (kosong / tak hingga / 0) lalu baris bersih
+    # langsung dipadatkan ke depan buffer. Dengan inplace=True tidak ada salinan kedua.
+    n = len(X)
+    out = X if inplace else np.empty_like(X, order="C")
+    counts = {REASONS[c]: 0 for c in REASONS}
+    rejected_index, rejected_reason = [], []
+    write = 0
+    for start in range(0, n, chunk_rows):
+        chunk = X[start:start + chunk_rows]
+        # Per kolom (bukan .any(axis=1) pada array 2D): reduksi sepanjang sumbu pendek jauh lebih lambat
+        ok = np.ones(len(chunk), dtype=bool)
+        for j in range(chunk.shape[1]):
+            col = chunk[:, j]
+            ok &= np.isfinite(col)
+            ok &= col != 0
+
+        bad = np.flatnonzero(~ok)
+        if len(bad):
+            # Alasan hanya dihitung untuk baris yang ditolak
+            rows = chunk[bad]
+            code = np.full(len(bad), ZERO, dtype=np.uint8)
+            code[~np.isfinite(rows).all(axis=1)] = NON_FINITE
+            code[np.isnan(rows).any(axis=1)] = MISSING
+            rejected_index.append(bad + start)
+            rejected_reason.append(code)
+            for c, k in zip(*np.unique(code, return_counts=True)):
+                counts[REASONS[int(c)]] += int(k)
+            kept = chunk[ok]
+        else:
+            kept = chunk
+        # Area tulis selalu di depan area baca, jadi aman untuk buffer yang sama
+        if not (inplace and kept is chunk and write == start):
+            out[write:write + len(kept)] = kept
+        write += len(kept)
+
+    report = ValidationReport(
+        n_rows=n,
+        n_clean=write,
+        counts=counts,
+        rejected_index=np.concatenate(rejected_index) if rejected_index else np.empty(0, dtype=np.int64),
+        rejected_reason=np.concatenate(rejected_reason) if rejected_reason else np.empty(0, dtype=np.uint8),
+    )
+    return out[:write], report
+
+
+def validate_and_clean(df, feature_cols=FEATURE_COLS, allow_missing=False, dtype=np.float64):
+    # Validasi upload + cleansing training dalam satu tahap
+    X, report = clean_rows(feature_matrix(df, feature_cols, dtype), inplace=True)
+    n_missing = report.counts[REASONS[MISSING]]
+    if n_missing and not allow_missing:
+        rows = report.rejected_index[report.rejected_reason == MISSING][:5].tolist()
+        raise ValidationError(
+            "Dataset mengandung missing value. Harap bersihkan terlebih dahulu sebelum training. "
+            f"({n_missing} baris, contoh baris: {rows})"
+        )
+    if report.n_clean == 0:
+        raise ValidationError("Semua data terhapus saat cleansing. Pastikan tidak semua nilai = 0.")
+    return ValidatedData(X=X, report=report, feature_cols=list(feature_cols))
+
+
+def ensure_validated(data, feature_cols=FEATURE_COLS, dtype=np.float64):
+    # Terima DataFrame mentah atau ValidatedData yang sudah divalidasi sebelumnya
+    if isinstance(data, ValidatedData):
+        if data.X.dtype != dtype:
+            return replace(data, X=np.ascontiguousarray(data.X, dtype=dtype))
+        return data
+    return validate_and_clean(data, feature_cols, dtype=dtype)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from sklearn.covariance import oas
+
+from src_model.hotelling import HotellingT2, shrink_covariance
+
+
+def baseline_t2(X, mean, cov):
+    # Rumus awal: (x - mean)ᵀ Σ⁻¹ (x - mean) per baris dengan inverse eksplisit
+    inv = np.linalg.inv(cov)
+    return np.array([(x - mean) @ inv @ (x - mean) for x in X])
+
+
+def lognormal(seed, n=400, p=4):
+    rng = np.random.default_rng(seed)
+    return rng.lognormal(size=(n, p)) * [10.0, 0.5, 30.0, 2.0]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_score_matches_inverse_formula(seed):
+    X = lognormal(seed)
+    model = HotellingT2(alpha=0.01).fit(X)
+
+    assert model.shrinkage_ == 0.0
+    np.testing.assert_allclose(model.mean_, X.mean(axis=0))
+    np.testing.assert_allclose(model.cov_, np.cov(X, rowvar=False))
+    expected = baseline_t2(X, X.mean(axis=0), np.cov(X, rowvar=False))
+    np.testing.assert_allclose(model.score(X), expected, rtol=1e-10)
+
+
+def test_chunked_fit_and_score_match_single_chunk():
+    X = lognormal(0, n=1000)
+    whole = HotellingT2().fit(X)
+    chunked = HotellingT2(chunk_size=64).fit(X)
+
+    np.testing.assert_allclose(chunked.cov_, whole.cov_, rtol=1e-12)
+    np.testing.assert_allclose(chunked.score(X), whole.score(X), rtol=1e-10)
+
+
+def test_float32_input_scored_in_float64():
+    X = lognormal(1).astype(np.float32)
+    model = HotellingT2().fit(X)
+    X64 = X.astype(np.float64)
+    expected = baseline_t2(X64, X64.mean(axis=0), np.cov(X64, rowvar=False))
+    np.testing.assert_allclose(model.score(X), expected, rtol=1e-6)
+
+
+def test_near_singular_covariance_uses_oas_shrinkage():
+    # Kolom terakhir hampir kombinasi linear kolom pertama: Cholesky eksak tidak stabil
+    rng = np.random.default_rng(0)
+    X = lognormal(2)
+    X[:, 3] = 2.0 * X[:, 0] + rng.normal(scale=1e-6, size=len(X))
+    model = HotellingT2().fit(X)
+
+    # Intensitas OAS dihitung pada matriks korelasi = OAS sklearn atas data terstandardisasi
+    Z = (X - X.mean(axis=0)) / X.std(axis=0, ddof=1)
+    _, expected_shrinkage = oas(Z)
+    assert 0 < model.shrinkage_ <= 1
+    assert model.shrinkage_ == pytest.approx(expected_shrinkage, rel=1e-9)
+
+    cov_shrunk, _ = shrink_covariance(np.cov(X, rowvar=False), len(X), model.shrinkage_)
+    np.testing.assert_allclose(model.cov_, cov_shrunk, rtol=1e-12)
+    np.testing.assert_allclose(model.score(X), baseline_t2(X, X.mean(axis=0), cov_shrunk), rtol=1e-8)
+    # Varians tiap fitur tidak berubah oleh shrinkage (hanya korelasi yang ditarik ke 0)
+    np.testing.assert_allclose(np.diag(model.cov_), X.var(axis=0, ddof=1), rtol=1e-12)
+
+
+def test_fixed_shrinkage_and_singular_without_shrinkage():
+    X = lognormal(3)
+    model = HotellingT2(shrinkage=0.3).fit(X)
+    assert model.shrinkage_ == 0.3
+    cov_shrunk, _ = shrink_covariance(np.cov(X, rowvar=False), len(X), 0.3)
+    np.testing.assert_allclose(model.score(X), baseline_t2(X, X.mean(axis=0), cov_shrunk), rtol=1e-8)
+
+    X[:, 3] = X[:, 0]
+    with pytest.raises(np.linalg.LinAlgError):
+        HotellingT2(shrinkage=None).fit(X)
+
+
+def test_fit_rejects_n_not_greater_than_p():
+    with pytest.raises(ValueError, match="n <= p"):
+        HotellingT2().fit(lognormal(0, n=4))
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+
+from src_model import jobs
+
+TIMEOUT = 10
+
+
+def wait_until(predicate):
+    deadline = time.monotonic() + TIMEOUT
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timeout")
+        time.sleep(0.005)
+
+
+def blocker():
+    # Job yang menahan satu-satunya worker sampai event di-set
+    started, release = threading.Event(), threading.Event()
+
+    def fn(job):
+        started.set()
+        release.wait(TIMEOUT)
+        return "blocker"
+    return fn, started, release
+
+
+def test_sessions_are_served_round_robin():
+    runner = jobs.JobRunner(workers=1, max_pending=5)
+    fn, started, release = blocker()
+    runner.submit("x", fn)
+    assert started.wait(TIMEOUT)
+
+    order = []
+
+    def record(job, name):
+        order.append(name)
+
+    submitted = [runner.submit("a", record, f"a{i}") for i in range(3)]
+    submitted += [runner.submit("b", record, f"b{i}") for i in range(2)]
+    submitted.append(runner.submit("c", record, "c0"))
+
+    # Posisi antrian mengikuti giliran: a0, b0, c0, a1, b1, a2
+    assert [runner.position(j.id) for j in submitted] == [0, 3, 5, 1, 4, 2]
+
+    release.set()
+    wait_until(lambda: all(j.finished for j in submitted))
+    assert order == ["a0", "b0", "c0", "a1", "b1", "a2"]
+    assert all(j.state == jobs.DONE for j in submitted)
+
+
+def test_pending_limit_per_session():
+    runner = jobs.JobRunner(workers=1, max_pending=2)
+    fn, started, release = blocker()
+    runner.submit("a", fn)
+    assert started.wait(TIMEOUT)
+    runner.submit("a", lambda job: None)
+
+    with pytest.raises(jobs.JobError):
+        runner.submit("a", lambda job: None)
+    runner.submit("b", lambda job: None)  # sesi lain tidak terpengaruh
+    release.set()
+
+
+def test_cancel_queued_job_never_runs():
+    runner = jobs.JobRunner(workers=1)
+    fn, started, release = blocker()
+    runner.submit("a", fn)
+    assert started.wait(TIMEOUT)
+
+    ran = threading.Event()
+    queued = runner.submit("b", lambda job: ran.set())
+    runner.cancel(queued.id)
+    assert queued.state == jobs.CANCELLED
+    assert runner.position(queued.id) is None
+
+    release.set()
+    after = runner.submit("b", lambda job: "ok")
+    wait_until(lambda: after.finished)
+    assert not ran.is_set()
+    assert runner.snapshot()[jobs.CANCELLED] == 1
+
+
+def test_cancel_running_job_stops_at_next_stage():
+    runner = jobs.JobRunner(workers=1)
+    in_stage, stages = threading.Event(), []
+
+    def fn(job):
+        for i in range(100):
+            job.report(f"tahap {i}", i / 100)
+            stages.append(i)
+            in_stage.set()
+            time.sleep(0.01)
+        return "selesai"
+
+    job = runner.submit("a", fn)
+    assert in_stage.wait(TIMEOUT)
+    runner.cancel(job.id)
+    wait_until(lambda: job.finished)
+
+    assert job.state == jobs.CANCELLED
+    assert job.result is None
+    assert len(stages) < 100
+    assert runner.collect(job.id) is job
+    assert runner.get(job.id) is None
+
+
+def test_failed_job_keeps_error():
+    runner = jobs.JobRunner(workers=1)
+
+    def fn(job):
+        raise ValueError("rusak")
+
+    job = runner.submit("a", fn)
+    wait_until(lambda: job.finished)
+    assert job.state == jobs.FAILED
+    assert str(job.error) == "rusak"
+
+
+def test_discarded_running_job_counts_until_worker_finishes():
+    runner = jobs.JobRunner(workers=1, max_pending=1)
+    fn, started, release = blocker()
+    job = runner.submit("a", fn)
+    assert started.wait(TIMEOUT)
+
+    runner.discard(job.id)
+    assert runner.get(job.id) is None
+    assert runner.snapshot()["abandoned"] == 1
+    with pytest.raises(jobs.JobError):
+        runner.submit("a", lambda job: None)
+
+    release.set()
+    wait_until(lambda: job.finished)
+    assert runner.snapshot()["abandoned"] == 0
+    assert job.result is None  # hasil job yang dibuang tidak ditahan
+    runner.submit("a", lambda job: None)
+
+
+def test_prune_discards_jobs_of_closed_sessions():
+    runner = jobs.JobRunner(workers=1)
+    fn, started, release = blocker()
+    runner.submit("aktif", fn)
+    assert started.wait(TIMEOUT)
+    closed = runner.submit("tutup", lambda job: None)
+
+    runner.prune(lambda session_id: session_id == "aktif")
+    assert closed.state == jobs.CANCELLED
+    assert runner.get(closed.id) is None
+    release.set()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from src_model import metrics
+
+LABELS = np.array(["baik", "kurang baik"])
+
+
+def sklearn_scores(y_true, y_pred):
+    kw = {"average": "weighted", "zero_division": 0}
+    return {
+        "Accuracy": accuracy_score(y_true, y_pred),
+        "Precision": precision_score(y_true, y_pred, **kw),
+        "Recall": recall_score(y_true, y_pred, **kw),
+        "F1 Score": f1_score(y_true, y_pred, **kw),
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compute_metrics_matches_sklearn(seed):
+    rng = np.random.default_rng(seed)
+    y_true = LABELS[(rng.random(500) < 0.1).astype(int)]
+    flip = rng.random(500) < 0.2
+    y_pred = np.where(flip, LABELS[::-1][(y_true == "kurang baik").astype(int)], y_true)
+
+    result = metrics.compute_metrics(y_true, y_pred)
+    for name, value in sklearn_scores(y_true, y_pred).items():
+        assert result[name] == pytest.approx(value, abs=1e-12)
+
+
+def test_class_never_predicted():
+    # Model yang selalu memprediksi "baik": precision kelas minoritas 0 (zero_division=0)
+    y_true = np.array(["baik"] * 90 + ["kurang baik"] * 10)
+    y_pred = np.array(["baik"] * 100)
+
+    result = metrics.compute_metrics(y_true, y_pred)
+    for name, value in sklearn_scores(y_true, y_pred).items():
+        assert result[name] == pytest.approx(value, abs=1e-12)
+    np.testing.assert_array_equal(result["Confusion Matrix"], [[90, 0], [10, 0]])
+
+
+def test_class_only_predicted():
+    # Kelas yang hanya muncul di prediksi (support 0) tidak ikut bobot weighted
+    y_true = np.array(["baik"] * 20)
+    y_pred = np.array(["baik"] * 15 + ["kurang baik"] * 5)
+
+    result = metrics.compute_metrics(y_true, y_pred)
+    for name, value in sklearn_scores(y_true, y_pred).items():
+        assert result[name] == pytest.approx(value, abs=1e-12)
+
+
+def test_scores_from_confusion_batch_matches_single():
+    # Dimensi depan (batch resample bootstrap) dihitung sama seperti satu per satu
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, 50, size=(7, 2, 2))
+    batch[3, :, 1] = 0
+    stacked = metrics.scores_from_confusion(batch)
+    for b in range(len(batch)):
+        single = metrics.scores_from_confusion(batch[b])
+        for name in metrics.METRIC_NAMES:
+            assert stacked[name][b] == pytest.approx(single[name])
@@ -0,0 +1,56 @@
+import threading
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from src_model import model_store
+from src_model.hotelling import HotellingT2
+from src_model.schema import FEATURE_COLS
+
+
+@pytest.fixture(scope="module")
+def parts():
+    X = np.random.default_rng(0).lognormal(size=(100, 4))
+    t2 = HotellingT2().fit(X)
+    scaler = StandardScaler().fit(X)
+    return SVC().fit(scaler.transform(X), t2.predict(X)), scaler, t2
+
+
+def test_concurrent_saves_get_distinct_versions(parts, tmp_path, monkeypatch):
+    # Semua thread membaca daftar versi yang sama sebelum ada yang membuat folder
+    n = 6
+    barrier = threading.Barrier(n)
+    versions = model_store._versions
+
+    def racing_versions(name_dir):
+        found = versions(name_dir)
+        barrier.wait(5)
+        return found
+
+    monkeypatch.setattr(model_store, "_versions", racing_versions)
+    paths, errors = [], []
+
+    def save():
+        try:
+            paths.append(model_store.save_bundle(*parts, FEATURE_COLS, {"kernel": "rbf"}, root=str(tmp_path)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(p[-4:] for p in paths) == [f"v{i:03d}" for i in range(1, n + 1)]
+    monkeypatch.undo()
+    assert model_store.load_bundle("default", str(tmp_path)).path.endswith(f"v{n:03d}")
+
+
+def test_invalid_name_rejected(parts, tmp_path):
+    with pytest.raises(model_store.ModelStoreError):
+        model_store.save_bundle(*parts, FEATURE_COLS, {}, name="../keluar", root=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
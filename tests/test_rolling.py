@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from scipy.linalg import cholesky
+
+from src_model import rolling, validation
+from src_model.hotelling import compute_prediction_ucl
+
+
+def brute_force(day_num, X, window_days, min_periods):
+    # Baseline setiap hari dihitung ulang dari nol: np.cov jendela lalu solve
+    n, p = X.shape
+    t2 = np.full(n, np.nan)
+    n_window = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        in_window = (np.arange(n) < i) & (day_num >= day_num[i] - window_days)
+        W = X[in_window]
+        n_window[i] = len(W)
+        if len(W) >= min_periods:
+            cov = np.cov(W, rowvar=False)
+            if np.linalg.cond(cov) < 1e12:
+                d = X[i] - W.mean(axis=0)
+                t2[i] = d @ np.linalg.solve(cov, d)
+    return t2, n_window
+
+
+def gapped_series(n, p=4, seed=0):
+    rng = np.random.default_rng(seed)
+    # Hari dengan celah acak 1-3 hari, jadi jumlah hari dalam jendela berubah-ubah
+    day_num = np.cumsum(rng.integers(1, 4, n))
+    days = (np.datetime64("2020-01-01") + day_num).astype("datetime64[D]")
+    X = rng.lognormal(size=(n, p)) @ rng.uniform(0.5, 1.5, (p, p))
+    return days, day_num, X
+
+
+@pytest.mark.parametrize("window_days", [25, 40, 120])
+def test_rolling_t2_matches_brute_force(window_days):
+    days, day_num, X = gapped_series(300)
+    min_periods = max(validation.MIN_ROWS, X.shape[1] + 1)
+
+    t2, ucl, n_window, _ = rolling.rolling_t2(days, X, window_days)
+    expected, expected_window = brute_force(day_num, X, window_days, min_periods)
+
+    np.testing.assert_array_equal(n_window, expected_window)
+    np.testing.assert_array_equal(np.isnan(t2), np.isnan(expected))
+    scored = ~np.isnan(expected)
+    assert scored.sum() > 200
+    np.testing.assert_allclose(t2[scored], expected[scored], rtol=1e-9)
+    for i in np.flatnonzero(scored):
+        assert ucl[i] == pytest.approx(compute_prediction_ucl(int(n_window[i]), X.shape[1], 0.01))
+
+
+def test_rolling_t2_recovers_after_failed_downdate():
+    # Jendela yang sempat berisi hari konstan (tidak positif definit) difaktorkan ulang
+    days, day_num, X = gapped_series(120, seed=1)
+    X[30:45] = X[30]
+    t2, _, _, refactors = rolling.rolling_t2(days, X, 30)
+    expected, _ = brute_force(day_num, X, 30, max(validation.MIN_ROWS, X.shape[1] + 1))
+    assert refactors > 1  # Faktorisasi awal + ulang setelah downdate gagal
+    both = ~np.isnan(t2) & ~np.isnan(expected)
+    late = both & (np.arange(len(X)) > 80)
+    assert late.any()
+    np.testing.assert_allclose(t2[late], expected[late], rtol=1e-6)
+
+
+@pytest.mark.parametrize("sign", [1.0, -1.0])
+def test_cholupdate_matches_refactorization(sign):
+    rng = np.random.default_rng(2)
+    A = rng.normal(size=(50, 4))
+    M = A.T @ A
+    x = rng.normal(size=4) * (0.5 if sign < 0 else 2.0)
+    L = cholesky(M, lower=True).tolist()
+
+    assert rolling.cholupdate(L, x.tolist(), sign)
+    np.testing.assert_allclose(np.array(L), cholesky(M + sign * np.outer(x, x), lower=True), rtol=1e-10)
+
+
+def test_cholupdate_reports_loss_of_definiteness():
+    L = np.eye(2).tolist()
+    assert not rolling.cholupdate(L, [2.0, 0.0], -1.0)
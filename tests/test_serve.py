@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from src_model import model_store, prediction, serve
+from src_model.hotelling import HotellingT2
+from src_model.schema import FEATURE_COLS, T2_COL
+
+ROW = {"so2_satelit": 1.0, "co_satelit": 0.5, "o3_satelit": 2.0, "no2_satelit": 1.5}
+
+
+@pytest.fixture(scope="module")
+def bundle(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    X = rng.lognormal(size=(200, 4))
+    t2 = HotellingT2().fit(X)
+    scaler = StandardScaler().fit(X)
+    model = SVC(kernel="linear").fit(scaler.transform(X), t2.predict(X))
+    root = str(tmp_path_factory.mktemp("models"))
+    model_store.save_bundle(model, scaler, t2, FEATURE_COLS, {"kernel": "linear", "C": 1.0}, root=root)
+    return model_store.load_bundle(model_store.DEFAULT_MODEL_NAME, root)
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        return None
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", ""):
+            break
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return int(status_line.split()[1]), headers, json.loads(body)
+
+
+def exchange(bundle, raw, max_responses=10):
+    # Kirim byte mentah lewat satu koneksi; kembalikan semua respons sampai koneksi ditutup server
+    async def run():
+        service = serve.InferenceService(bundle)
+        batcher = asyncio.create_task(service.batcher.run())
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            responses = []
+            while len(responses) < max_responses:
+                response = await asyncio.wait_for(read_response(reader), 10)
+                if response is None:
+                    break
+                responses.append(response)
+                if response[1].get("connection") == "close":
+                    break
+            writer.close()
+            return responses
+        finally:
+            server.close()
+            batcher.cancel()
+            service.scorer.executor.shutdown(wait=False)
+    return asyncio.run(run())
+
+
+def request(method, path, body=b"", headers=None, version="HTTP/1.1"):
+    headers = {"Content-Length": str(len(body)), **(headers or {})}
+    head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return f"{method} {path} {version}\r\n{head}\r\n".encode() + body
+
+
+def test_predict_single_row_and_batch(bundle):
+    body = json.dumps(ROW).encode()
+    batch = json.dumps({"rows": [ROW, list(ROW.values())]}).encode()
+    (status, _, single), (status_batch, _, many) = exchange(
+        bundle, request("POST", "/predict", body) + request("POST", "/predict", batch), max_responses=2
+    )
+
+    assert status == status_batch == 200
+    assert set(single) == {prediction.PRED_COL, T2_COL, "kategori_T2"}
+    assert len(many["results"]) == 2
+    assert many["results"][0] == many["results"][1]
+    assert many["results"][0][T2_COL] == pytest.approx(single[T2_COL])
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3"])
+def test_invalid_content_length_is_400_and_closes(bundle, length):
+    raw = f"POST /predict HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode()
+    (status, headers, payload), = exchange(bundle, raw)
+
+    assert status == 400
+    assert payload["error"] == "Content-Length tidak valid."
+    assert headers["connection"] == "close"
+
+
+def test_empty_content_length_means_no_body(bundle):
+    (status, _, payload), = exchange(bundle, b"POST /predict HTTP/1.1\r\nContent-Length:\r\n\r\n", max_responses=1)
+    assert status == 400
+    assert payload["error"] == "Body harus berupa JSON."
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"{bukan json", "Body harus berupa JSON."),
+    (json.dumps({"so2_satelit": 1.0}).encode(), "Kolom hilang"),
+    (json.dumps([1, 2, 3]).encode(), "Baris harus berisi 4 nilai"),
+    (json.dumps({**ROW, "co_satelit": "x"}).encode(), "Nilai polutan harus berupa angka."),
+    (json.dumps({**ROW, "co_satelit": None}).encode(), "Nilai polutan harus berupa angka."),
+    (b'{"so2_satelit": 1, "co_satelit": NaN, "o3_satelit": 1, "no2_satelit": 1}', "tak hingga"),
+    (json.dumps("teks").encode(), "Baris harus berupa objek"),
+])
+def test_malformed_body_is_400_and_keeps_connection(bundle, body, message):
+    # Koneksi keep-alive tetap bisa dipakai setelah request yang ditolak
+    (status, _, payload), (status_next, _, _) = exchange(
+        bundle, request("POST", "/predict", body) + request("GET", "/health"), max_responses=2
+    )
+
+    assert status == 400
+    assert message in payload["error"]
+    assert status_next == 200
+
+
+def test_routing_errors(bundle):
+    responses = exchange(
+        bundle,
+        request("GET", "/predict") + request("GET", "/tidak-ada") + request("GET", "/stats"),
+        max_responses=3,
+    )
+
+    assert [r[0] for r in responses] == [405, 404, 200]
+    assert responses[2][2]["requests"] == 3
+
+
+def test_bad_request_line_and_oversized_body(bundle):
+    (status, _, payload), = exchange(bundle, b"OMONG KOSONG\r\n\r\n", max_responses=1)
+    assert status == 400
+    assert payload["error"] == "Request line tidak valid."
+
+    raw = f"POST /predict HTTP/1.1\r\nContent-Length: {serve.MAX_BODY_BYTES + 1}\r\n\r\n".encode()
+    (status, headers, _), = exchange(bundle, raw)
+    assert status == 413
+    assert headers["connection"] == "close"
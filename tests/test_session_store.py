@@ -0,0 +1,108 @@
+import numpy as np
+
+from src_model.session_store import ArtifactStore, TempFile, sizeof
+
+SIZE = sizeof(np.zeros(1000))
+
+
+def array(value):
+    return np.full(1000, float(value))
+
+
+def test_session_budget_evicts_oldest_non_essential():
+    store = ArtifactStore(session_bytes=int(SIZE * 2.5), global_bytes=SIZE * 100, dedup_min_bytes=1)
+    store.put("s1", "selected_model", array(0))  # esensial
+    store.put("s1", "a", array(1))
+    store.put("s1", "b", array(2))  # melebihi anggaran: "a" (non-esensial terlama) dievict
+
+    assert store.get("s1", "a") is None
+    assert store.get("s1", "selected_model") is not None
+    assert store.get("s1", "b") is not None
+    assert store.stats["evictions"] == 1
+    assert store.session_size("s1") <= store.session_bytes
+
+    # Akses memperbarui urutan LRU; artefak yang baru disimpan tidak pernah dievict
+    store.put("s1", "c", array(3))
+    assert store.get("s1", "b") is None
+    assert store.get("s1", "c") is not None
+
+
+def test_session_budget_never_evicts_essential_or_other_sessions():
+    store = ArtifactStore(session_bytes=int(SIZE * 1.5), global_bytes=SIZE * 100, dedup_min_bytes=1)
+    store.put("s2", "a", array(9))
+    store.put("s1", "selected_model", array(0))
+    store.put("s1", "b", array(1))
+
+    assert store.get("s1", "selected_model") is not None
+    assert store.get("s1", "b") is not None
+    assert store.get("s2", "a") is not None
+
+
+def test_global_budget_evicts_essential_of_other_session_last():
+    store = ArtifactStore(session_bytes=SIZE * 100, global_bytes=int(SIZE * 2.5), dedup_min_bytes=1)
+    store.put("s1", "selected_model", array(0))
+    store.put("s2", "a", array(1))
+    store.put("s3", "b", array(2))  # non-esensial sesi lain dievict lebih dulu
+
+    assert store.get("s2", "a") is None
+    assert store.get("s1", "selected_model") is not None
+
+    store.put("s2", "selected_model", array(3))  # "b" (non-esensial) tetap dievict lebih dulu
+    assert store.get("s3", "b") is None
+
+    # Hanya esensial tersisa: model yang paling lama tidak diakses (s1) dievict
+    store.put("s4", "selected_model", array(4))
+    assert store.get("s1", "selected_model") is None
+    assert store.get("s2", "selected_model") is not None
+    assert store.snapshot()["global_bytes"] <= store.global_bytes
+
+
+def test_identical_objects_are_shared_across_sessions():
+    store = ArtifactStore(dedup_min_bytes=1)
+    first = store.put("s1", "model", array(7))
+    second = store.put("s2", "model", array(7))  # objek berbeda, isi sama
+
+    assert second is first
+    assert store.stats["dedup_hits"] == 1
+    assert store.snapshot()["global_bytes"] == SIZE
+    assert store.session_size("s1") == store.session_size("s2") == SIZE
+
+    # Blob bersama baru dilepas setelah sesi terakhir yang memakainya dihapus
+    store.drop_session("s1")
+    assert store.get("s2", "model") is first
+    store.drop_session("s2")
+    assert store.snapshot()["global_bytes"] == 0
+
+
+def test_dict_values_dedup_per_item():
+    store = ArtifactStore(dedup_min_bytes=1)
+    store.put("s1", "trained_models", {"linear": array(1), "rbf": array(2)})
+    store.put("s2", "trained_models", {"linear": array(1), "rbf": array(3)})
+
+    assert store.stats["dedup_hits"] == 1
+    assert store.snapshot()["global_bytes"] == 3 * SIZE
+    assert set(store.get("s2", "trained_models")) == {"linear", "rbf"}
+
+
+def test_small_objects_are_not_deduplicated():
+    store = ArtifactStore(dedup_min_bytes=SIZE * 2)
+    store.put("s1", "x", array(1))
+    store.put("s2", "x", array(1))
+
+    assert store.stats["dedup_hits"] == 0
+    assert store.snapshot()["global_bytes"] == 2 * SIZE
+
+
+def test_replacing_artifact_releases_old_blob_and_temp_file(tmp_path):
+    store = ArtifactStore(dedup_min_bytes=1)
+    path = tmp_path / "hasil.csv"
+    path.write_text("a,b\n")
+    store.put("s1", "bulk_file", TempFile(str(path)))
+
+    store.put("s1", "bulk_file", array(1))
+    assert not path.exists()
+    assert store.snapshot()["global_bytes"] == SIZE
+
+    store.prune(lambda session_id: False)
+    assert store.snapshot()["entries"] == 0
+    assert store.snapshot()["global_bytes"] == 0
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src_model import validation
+from src_model.streaming import RunningMoments, clean_chunk
+
+
+def chunks(X, sizes):
+    start = 0
+    for size in sizes:
+        yield X[start:start + size]
+        start += size
+
+
+@pytest.mark.parametrize("sizes", [[1000], [1, 2, 997], [300, 0, 450, 250], [7] * 142 + [6]])
+def test_update_matches_np_cov(sizes):
+    X = np.random.default_rng(0).lognormal(size=(1000, 4))
+    moments = RunningMoments(4)
+    for chunk in chunks(X, sizes):
+        moments.update(chunk)
+
+    assert moments.n == 1000
+    np.testing.assert_allclose(moments.mean, X.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(moments.cov, np.cov(X, rowvar=False), rtol=1e-10)
+
+
+def test_merge_tree_matches_np_cov():
+    # Penggabungan berpasangan (seperti hasil worker paralel), termasuk bagian kosong
+    X = np.random.default_rng(1).normal(size=(999, 3))
+    parts = [RunningMoments(3).update(chunk) for chunk in chunks(X, [100, 0, 250, 1, 400, 248])]
+    while len(parts) > 1:
+        parts = [a.merge(b) for a, b in zip(parts[::2], parts[1::2])] + parts[len(parts) // 2 * 2:]
+    moments = parts[0]
+
+    assert moments.n == 999
+    np.testing.assert_allclose(moments.mean, X.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(moments.cov, np.cov(X, rowvar=False), rtol=1e-10)
+
+
+def test_large_offset_is_stable():
+    # Mean besar dengan varians kecil: rumus naif E[x²] - E[x]² kehilangan presisi, Chan tidak
+    rng = np.random.default_rng(2)
+    X = 1e6 + rng.normal(scale=1e-2, size=(5000, 4))
+    moments = RunningMoments(4)
+    for chunk in chunks(X, [1234, 2345, 1421]):
+        moments.update(chunk)
+
+    # Toleransi absolut relatif terhadap varians (1e-4): entri off-diagonal mendekati 0
+    np.testing.assert_allclose(moments.cov, np.cov(X, rowvar=False), rtol=1e-6, atol=1e-12)
+
+
+def test_merge_into_empty():
+    X = np.random.default_rng(3).normal(size=(50, 2))
+    moments = RunningMoments(2).merge(RunningMoments(2).update(X))
+
+    assert moments.n == 50
+    np.testing.assert_allclose(moments.cov, np.cov(X, rowvar=False), rtol=1e-12)
+
+
+def test_clean_chunk_follows_validation_rules():
+    X = np.random.default_rng(2).lognormal(size=(50, 4))
+    X[3, 1] = np.nan
+    X[5, 2] = np.inf
+    X[7, 0] = 0.0
+    expected, _ = validation.clean_rows(X.copy())
+
+    X_clean, stats = clean_chunk(X)
+    np.testing.assert_array_equal(X_clean, expected)
+    assert stats == {"rows": 50, "non_finite": 2, "zero": 1}
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src_model import validation
+from src_model.schema import FEATURE_COLS
+from src_model.validation import MISSING, NON_FINITE, REASONS, ZERO
+
+
+def dirty_matrix(n=50, seed=0):
+    # Baris bersih acak dengan baris kotor di posisi yang diketahui (termasuk di batas chunk)
+    X = np.random.default_rng(seed).lognormal(size=(n, 4))
+    bad = {
+        0: ([0, 1], [np.nan, 0.0], MISSING),  # kosong lebih diutamakan dari 0
+        3: ([2], [np.inf], NON_FINITE),
+        4: ([0, 3], [0.0, -np.inf], NON_FINITE),  # tak hingga lebih diutamakan dari 0
+        7: ([1], [0.0], ZERO),
+        8: ([0, 1, 2, 3], [0.0] * 4, ZERO),
+        15: ([3], [np.nan], MISSING),
+        16: ([2, 3], [np.inf, np.nan], MISSING),
+        n - 1: ([0], [0.0], ZERO),
+    }
+    for row, (cols, values, _) in bad.items():
+        X[row, cols] = values
+    reasons = {row: reason for row, (_, _, reason) in bad.items()}
+    return X, reasons
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 4, 8, 65536])
+def test_clean_rows_reasons_and_order(chunk_rows):
+    X, reasons = dirty_matrix()
+    original = X.copy()
+    mask = np.ones(len(X), dtype=bool)
+    mask[list(reasons)] = False
+
+    out, report = validation.clean_rows(X, chunk_rows=chunk_rows)
+
+    np.testing.assert_array_equal(out, original[mask])
+    np.testing.assert_array_equal(X, original)  # inplace=False tidak mengubah input
+    assert report.n_rows == len(X)
+    assert report.n_clean == mask.sum()
+    assert report.n_rejected == len(reasons)
+    np.testing.assert_array_equal(report.rejected_index, sorted(reasons))
+    np.testing.assert_array_equal(report.rejected_reason, [reasons[i] for i in sorted(reasons)])
+    expected_counts = {name: sum(r == code for r in reasons.values()) for code, name in REASONS.items()}
+    assert report.counts == expected_counts
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 3, 8, 65536])
+def test_clean_rows_inplace_compacts_same_buffer(chunk_rows):
+    X, reasons = dirty_matrix(seed=1)
+    mask = np.ones(len(X), dtype=bool)
+    mask[list(reasons)] = False
+    expected = X[mask].copy()
+
+    out, report = validation.clean_rows(X, inplace=True, chunk_rows=chunk_rows)
+
+    # Baris bersih dipadatkan ke depan buffer input, tanpa salinan kedua
+    assert np.shares_memory(out, X)
+    assert out.__array_interface__["data"][0] == X.__array_interface__["data"][0]
+    np.testing.assert_array_equal(out, expected)
+    np.testing.assert_array_equal(X[:report.n_clean], expected)
+
+
+def test_clean_rows_all_clean_and_all_rejected():
+    X = np.random.default_rng(2).lognormal(size=(20, 4))
+    out, report = validation.clean_rows(X.copy(), inplace=True, chunk_rows=6)
+    np.testing.assert_array_equal(out, X)
+    assert report.n_rejected == 0
+    assert len(report.rejected_index) == 0
+
+    out, report = validation.clean_rows(np.zeros((5, 4)))
+    assert len(out) == 0
+    assert report.counts == {REASONS[MISSING]: 0, REASONS[NON_FINITE]: 0, REASONS[ZERO]: 5}
+
+
+def test_report_round_trip():
+    X, _ = dirty_matrix()
+    _, report = validation.clean_rows(X)
+    restored = validation.ValidationReport.from_dict(report.to_dict())
+
+    assert restored.counts == report.counts
+    np.testing.assert_array_equal(restored.rejected_index, report.rejected_index)
+    np.testing.assert_array_equal(restored.rejected_reason, report.rejected_reason)
+    assert list(restored.rejected_frame()["alasan"]) == list(report.rejected_frame()["alasan"])
+
+
+def test_validate_and_clean_rejects_missing_values():
+    X, _ = dirty_matrix()
+    df = pd.DataFrame(X, columns=FEATURE_COLS)
+    with pytest.raises(validation.ValidationError, match="missing value"):
+        validation.validate_and_clean(df)
+
+    data = validation.validate_and_clean(df, allow_missing=True)
+    assert len(data) == data.report.n_clean